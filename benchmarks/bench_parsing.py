@@ -0,0 +1,97 @@
+"""
+Benchmark do parse das páginas de produto.
+
+Compara o caminho antigo (html.parser com a página inteira) com o lxml, com o
+SoupStrainer e com o parse direcionado (lxml + XPath) usado pelo scraper, conferindo
+que os dados extraídos são iguais.
+
+USO:
+    python benchmarks/bench_parsing.py                 # páginas sintéticas
+    python benchmarks/bench_parsing.py --cache dados/cache_http   # páginas reais do cache
+    python benchmarks/bench_parsing.py --arquivo dados/arquivo_html   # páginas arquivadas
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from benchmarks.sample_pages import product_page
+from config.page_archive import PageArchive
+from config.parsing import HAS_LXML, PRODUCT_PARSER, parse_product_page
+from config.scraper import VitaoFatSecretScraper
+
+def load_pages(cache_dir, archive_dir, count):
+    """Carrega páginas do arquivo de páginas, do cache HTTP em disco ou gera páginas sintéticas"""
+    if archive_dir:
+        archive = PageArchive(archive_dir)
+        return [archive.read(entry['sha256']) for entry in archive.entries()[:count]]
+    if cache_dir:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(cache_dir, "*.html")))[:count]:
+            with open(path, 'r', encoding='utf-8') as htmlfile:
+                pages.append(htmlfile.read())
+        return pages
+    return [product_page(i) for i in range(count)]
+
+def extract(scraper, soup):
+    data = {
+        'nome_produto': scraper.extract_product_name(soup),
+        'porcao': scraper.extract_portion(soup),
+    }
+    data.update(scraper.extract_nutritional_data(soup))
+    return data
+
+def run_strategy(scraper, pages, make_soup, repeat):
+    """Retorna o melhor tempo por página (ms) e os dados extraídos"""
+    best = float('inf')
+    results = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [extract(scraper, make_soup(page)) for page in pages]
+        best = min(best, time.perf_counter() - start)
+    return best / len(pages) * 1000, results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do parse de páginas de produto")
+    parser.add_argument("--cache", help="Diretório do cache HTTP com páginas reais (*.html)")
+    parser.add_argument("--arquivo", help="Diretório do arquivo de páginas (dados/arquivo_html)")
+    parser.add_argument("--paginas", type=int, default=200, help="Número de páginas")
+    parser.add_argument("--repeticoes", type=int, default=3, help="Repetições (usa o melhor tempo)")
+    args = parser.parse_args()
+
+    pages = load_pages(args.cache, args.arquivo, args.paginas)
+    if not pages:
+        print("❌ Nenhuma página encontrada")
+        return
+    size = sum(len(page) for page in pages) / len(pages) / 1024
+    print(f"📄 {len(pages)} páginas, {size:.0f} KB em média\n")
+
+    scraper = VitaoFatSecretScraper(use_cache=False, use_archive=False)
+    strategies = [
+        ("html.parser + SoupStrainer",
+         lambda page: BeautifulSoup(page, 'html.parser', parse_only=PRODUCT_PARSER.strainer)),
+    ]
+    if HAS_LXML:
+        strategies += [
+            ("lxml (página inteira)", lambda page: BeautifulSoup(page, 'lxml')),
+            ("lxml + SoupStrainer", lambda page: BeautifulSoup(page, 'lxml', parse_only=PRODUCT_PARSER.strainer)),
+        ]
+    strategies.append(("parse direcionado (scraper)", parse_product_page))
+
+    baseline_name = "html.parser (página inteira)"
+    baseline_ms, baseline = run_strategy(scraper, pages, lambda page: BeautifulSoup(page, 'html.parser'),
+                                         args.repeticoes)
+    print(f"{baseline_name:32s} {baseline_ms:8.2f} ms/página    1.0x")
+    for name, make_soup in strategies:
+        ms, results = run_strategy(scraper, pages, make_soup, args.repeticoes)
+        status = "ok" if results == baseline else "DIVERGENTE"
+        print(f"{name:32s} {ms:8.2f} ms/página  {baseline_ms / ms:5.1f}x  [{status}]")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Benchmark de ponta a ponta: coleta de URLs + scraping contra o FatSecret falso local.
+
+Sobe benchmarks/fake_fatsecret.py em outro processo (latência, erros 5xx e limite de
+requisições configuráveis), executa o VitaoUrlCollector e o VitaoFatSecretScraper em um
+diretório temporário e mede páginas/s, CPU por página e pico de memória (RSS) do processo
+do scraper. Com --comparar, falha (código 1) se o resultado piorou além da tolerância em
+relação a um relatório salvo com --saida.
+
+USO:
+    python benchmarks/bench_scraper.py
+    python benchmarks/bench_scraper.py --produtos 500 --latencia 0.05 --erros 0.02 --limite-rps 40
+    python benchmarks/bench_scraper.py --saida base.json
+    python benchmarks/bench_scraper.py --cobertura-busca 0.8 --fontes marca,busca
+    python benchmarks/bench_scraper.py --comparar base.json --tolerancia 0.15
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_fatsecret import FakeFatSecret
+from config.brands import brand_search_url
+from config.discovery import build_sources
+from config.http_session import HttpSession
+from config.pipeline import CollectionPipeline
+from config.async_scraper import AsyncVitaoFatSecretScraper
+from config.scraper import VitaoFatSecretScraper
+from config.url_collector import VitaoUrlCollector
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+def cpu_seconds():
+    """CPU (usuário + sistema) deste processo e dos processos filhos já encerrados"""
+    if resource is None:
+        return time.process_time()
+    usage = [resource.getrusage(who) for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)]
+    return sum(u.ru_utime + u.ru_stime for u in usage)
+
+def peak_rss_mb():
+    """Pico de memória residente do processo (MB)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def point_at(collector, scraper, base_url, workdir):
+    """Aponta coletor e scraper para o site falso e para o diretório temporário"""
+    collector.base_url = base_url
+    collector.search_url = brand_search_url(collector.brand, base_url)
+    collector.output_file = os.path.join(workdir, "urls.json")
+    scraper.urls_file = collector.output_file
+    scraper.output_file = os.path.join(workdir, "nutricional.csv")
+    scraper.metrics_file = os.path.join(workdir, "metricas.json")
+    scraper.changes_file = os.path.join(workdir, "mudancas.jsonl")
+    scraper.servings_file = os.path.join(workdir, "porcoes.csv")
+
+def run_benchmark(args, base_url, workdir):
+    """Executa uma coleta completa e devolve (tempos das etapas, produtos gravados, relatório de tempos)"""
+    session = HttpSession(pool_size=max(16, args.workers))
+    options = dict(max_workers=args.workers, requests_per_second=args.rps, session=session,
+                   use_cache=False, use_archive=False, parse_processes=args.processos)
+    sources = build_sources(args.fontes.split(','))
+
+    output = contextlib.nullcontext() if args.detalhes else contextlib.redirect_stdout(io.StringIO())
+    with output:
+        if args.encadeado:
+            pipeline = CollectionPipeline("Vitao", prefetch_window=args.janela, max_concurrency=args.assincrono,
+                                          sources=sources, **options)
+            point_at(pipeline.collector, pipeline.scraper, base_url, workdir)
+            start = time.perf_counter()
+            written = pipeline.run()
+            stages = {'total_s': time.perf_counter() - start}
+            metrics = pipeline.metrics
+        else:
+            if args.assincrono:
+                scraper = AsyncVitaoFatSecretScraper(max_concurrency=args.assincrono, **options)
+            else:
+                scraper = VitaoFatSecretScraper(**options)
+            collector = VitaoUrlCollector(session=session, use_cache=False, prefetch_window=args.janela,
+                                          rate_limiter=scraper.rate_limiter, metrics=scraper.metrics,
+                                          sources=sources)
+            point_at(collector, scraper, base_url, workdir)
+            start = time.perf_counter()
+            collector.run()
+            collected = time.perf_counter()
+            written = scraper.run()
+            end = time.perf_counter()
+            stages = {'coleta_urls_s': collected - start, 'scraping_s': end - collected, 'total_s': end - start}
+            metrics = scraper.metrics
+    session.close()
+    return stages, written, metrics.report()
+
+def summarize(args, stages, written, timings, cpu, server_status):
+    requests = timings['requisicoes']['total']
+    # Páginas efetivamente recebidas (sem contar 429/5xx e novas tentativas)
+    status = timings['requisicoes']['status']
+    pages = status.get('200', 0) + status.get('304', 0)
+    return {
+        'config': {
+            'produtos': args.produtos, 'latencia_s': args.latencia, 'erros': args.erros,
+            'limite_rps': args.limite_rps, 'workers': args.workers, 'rps_inicial': args.rps,
+            'processos': args.processos, 'janela': args.janela, 'encadeado': args.encadeado,
+            'assincrono': args.assincrono, 'fontes': args.fontes, 'cobertura_busca': args.cobertura_busca,
+        },
+        'etapas': {name: round(value, 3) for name, value in stages.items()},
+        'produtos_gravados': written,
+        'requisicoes': requests,
+        'paginas': pages,
+        'paginas_por_s': round(pages / stages['total_s'], 2),
+        'produtos_por_s': round(written / stages['total_s'], 2),
+        'cpu_s': round(cpu, 3),
+        'cpu_ms_por_pagina': round(cpu / max(1, pages) * 1000, 3),
+        'pico_rss_mb': round(peak_rss_mb(), 1) if resource else None,
+        'respostas_servidor': server_status,
+        'tempos': timings,
+    }
+
+def compare(result, baseline, tolerance):
+    """Lista as métricas que pioraram além da tolerância"""
+    checks = [
+        ('paginas_por_s', True),
+        ('cpu_ms_por_pagina', False),
+        ('pico_rss_mb', False),
+    ]
+    regressions = []
+    for key, higher_is_better in checks:
+        old, new = baseline.get(key), result.get(key)
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        if (-change if higher_is_better else change) > tolerance:
+            regressions.append(f"{key}: {old} -> {new} ({change:+.0%})")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de ponta a ponta contra um FatSecret falso local")
+    parser.add_argument("--produtos", type=int, default=200, help="Produtos no site falso")
+    parser.add_argument("--latencia", type=float, default=0.02, help="Latência por resposta (s)")
+    parser.add_argument("--variacao", type=float, default=0.0, help="Variação aleatória da latência (± s)")
+    parser.add_argument("--erros", type=float, default=0.0, help="Fração de respostas 503")
+    parser.add_argument("--limite-rps", type=float, help="Limite do servidor (acima dele: 429)")
+    parser.add_argument("--gravadas", help="Serve páginas reais do arquivo de páginas (dados/arquivo_html)")
+    parser.add_argument("--workers", type=int, default=8, help="Downloads simultâneos")
+    parser.add_argument("--rps", type=float, default=20.0, help="Requisições por segundo iniciais do scraper")
+    parser.add_argument("--processos", type=int, default=0, help="Processos de parse (modo pipeline)")
+    parser.add_argument("--janela", type=int, default=4, help="Páginas de busca baixadas em paralelo")
+    parser.add_argument("--encadeado", action="store_true", help="Coleta encadeada (CollectionPipeline)")
+    parser.add_argument("--assincrono", type=int, default=0, metavar="CONCORRENCIA",
+                        help="Baixa os produtos em asyncio com até N requisições em voo (requer aiohttp)")
+    parser.add_argument("--fontes", default="busca", help="Fontes de URLs do coletor (busca, marca, sitemap)")
+    parser.add_argument("--cobertura-busca", type=float, default=1.0,
+                        help="Fração dos produtos que a busca do site falso encontra")
+    parser.add_argument("--semente", type=int, default=0, help="Semente dos erros/latência do servidor")
+    parser.add_argument("--saida", help="Grava o resultado em JSON")
+    parser.add_argument("--comparar", help="Resultado JSON de referência para detectar regressões")
+    parser.add_argument("--tolerancia", type=float, default=0.10, help="Piora máxima aceita (fração)")
+    parser.add_argument("--detalhes", action="store_true", help="Mostra a saída do coletor e do scraper")
+    args = parser.parse_args()
+
+    server = FakeFatSecret(products=args.produtos, latency=args.latencia, jitter=args.variacao,
+                           error_rate=args.erros, max_rps=args.limite_rps, archive_dir=args.gravadas,
+                           seed=args.semente, search_coverage=args.cobertura_busca)
+    with server, tempfile.TemporaryDirectory() as workdir:
+        print(f"🌐 FatSecret falso em {server.base_url}")
+        cpu_start = cpu_seconds()
+        stages, written, timings = run_benchmark(args, server.base_url, workdir)
+        cpu = cpu_seconds() - cpu_start
+        result = summarize(args, stages, written, timings, cpu, server.stats())
+
+    print(f"📊 {written} produtos, {result['paginas']} páginas ({result['requisicoes']} requisições) "
+          f"em {stages['total_s']:.2f}s")
+    for name, value in result['etapas'].items():
+        print(f"   {name:<14} {value:8.2f}")
+    print(f"⚡ {result['paginas_por_s']:.1f} páginas/s ({result['produtos_por_s']:.1f} produtos/s)")
+    print(f"🧠 CPU: {result['cpu_ms_por_pagina']:.2f} ms/página ({result['cpu_s']:.2f}s no total)")
+    if result['pico_rss_mb'] is not None:
+        print(f"💾 Pico de memória: {result['pico_rss_mb']:.1f} MB")
+    print(f"🌐 Respostas do servidor: {result['respostas_servidor']}")
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as outfile:
+            json.dump(result, outfile, indent=2, ensure_ascii=False)
+        print(f"💾 Resultado salvo em: {args.saida}")
+
+    if args.comparar:
+        with open(args.comparar, 'r', encoding='utf-8') as basefile:
+            baseline = json.load(basefile)
+        if baseline.get('config') != result['config']:
+            print("⚠️  A referência foi gerada com outra configuração; a comparação pode não ser justa")
+        regressions = compare(result, baseline, args.tolerancia)
+        if regressions:
+            print("❌ Regressões em relação a " + args.comparar + ":")
+            for regression in regressions:
+                print(f"   {regression}")
+            sys.exit(1)
+        print(f"✅ Sem regressões além de {args.tolerancia:.0%} em relação a {args.comparar}")
+
+if __name__ == "__main__":
+    main()
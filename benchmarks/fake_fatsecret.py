@@ -0,0 +1,237 @@
+"""
+Servidor HTTP local que imita o FatSecret Brasil, usado pelos benchmarks.
+
+Serve a busca paginada (a.prominent / div.searchNoResult), a listagem da marca, o
+sitemap e as páginas de produto (nutrition_facts / serving_size_value) geradas por
+sample_pages.py, ou páginas reais gravadas no arquivo de páginas (dados/arquivo_html).
+A busca pode deixar de fora uma fração dos produtos (--cobertura-busca). Latência, taxa de erros 5xx e
+limite de requisições por segundo (429 + Retry-After) são configuráveis.
+
+O servidor roda em um processo separado, para que o CPU e a memória medidos pelo
+benchmark sejam só os do scraper.
+
+USO:
+    python benchmarks/fake_fatsecret.py --produtos 500 --latencia 0.05 --erros 0.02 --limite-rps 30
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.sample_pages import PRODUCT_PATH, brand_page, product_page, search_page, sitemap_xml
+from config.brands import NUTRITION_PATH, brand_slug
+from config.page_archive import PageArchive
+
+STATS_PATH = "/__stats"
+
+class FakeSite:
+    """Conteúdo e comportamento do site falso (compartilhado pelas threads do servidor)"""
+
+    def __init__(self, products=200, brand="Vitao", latency=0.02, jitter=0.0, error_rate=0.0,
+                 max_rps=None, archive_dir=None, seed=0, search_coverage=1.0):
+        self.brand = brand
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.max_rps = max_rps
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._recent = deque()
+        self.status = Counter()
+
+        # Páginas gravadas: caminho da URL original -> HTML; senão, produtos sintéticos
+        self.recorded = {}
+        if archive_dir:
+            archive = PageArchive(archive_dir)
+            for entry in archive.entries()[:products]:
+                self.recorded[urlsplit(entry['url']).path] = archive.read(entry['sha256'])
+            self.product_paths = list(self.recorded)
+        else:
+            self.product_paths = [PRODUCT_PATH.format(brand=brand.lower(), index=i) for i in range(products)]
+        # Produtos que a busca encontra (os demais só aparecem na listagem da marca e no sitemap)
+        self.search_found = [i for i in range(len(self.product_paths)) if self._rng.random() < search_coverage]
+
+    def search(self, page, per_page=10):
+        """Página de busca listando os caminhos de produto disponíveis"""
+        if not self.recorded:
+            return search_page(page, len(self.product_paths), brand=self.brand, per_page=per_page,
+                               found=self.search_found)
+        paths = [self.product_paths[i] for i in self.search_found[page * per_page:(page + 1) * per_page]]
+        if not paths:
+            return '<html><body><div class="searchNoResult">Nenhum resultado</div></body></html>'
+        links = "".join(f'<a class="prominent" href="{path}">Produto</a>' for path in paths)
+        return f"<html><body>{links}</body></html>"
+
+    def listing(self, page, per_page=50):
+        """Listagem de todos os produtos da marca"""
+        if not self.recorded:
+            return brand_page(page, len(self.product_paths), brand=self.brand, per_page=per_page)
+        paths = self.product_paths[page * per_page:(page + 1) * per_page]
+        links = "".join(f'<li><a href="{path}">Produto</a></li>' for path in paths)
+        return f"<html><body><ul>{links}</ul></body></html>"
+
+    def sitemap(self, base_url):
+        return sitemap_xml(base_url + path for path in self.product_paths)
+
+    def product(self, path):
+        """HTML do produto (gravado ou sintético), ou None se o caminho não existe"""
+        if self.recorded:
+            return self.recorded.get(path)
+        try:
+            index = int(unquote(path).split("produto-")[1].split("/")[0])
+        except (IndexError, ValueError):
+            return None
+        if index >= len(self.product_paths):
+            return None
+        return product_page(index, brand=self.brand, serving=path.rstrip("/").rsplit("/", 1)[-1])
+
+    def admit(self):
+        """Decide o status antes de responder: 429 acima do limite, 503 aleatório ou 200"""
+        with self._lock:
+            now = time.monotonic()
+            self._recent.append(now)
+            while self._recent and now - self._recent[0] > 1.0:
+                self._recent.popleft()
+            if self.max_rps and len(self._recent) > self.max_rps:
+                return 429
+            if self.error_rate and self._rng.random() < self.error_rate:
+                return 503
+            return 200
+
+    def record(self, status):
+        with self._lock:
+            self.status[status] += 1
+
+    def delay(self):
+        with self._lock:
+            return max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+
+class FakeHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def send_body(self, status, body=b"", content_type="text/html; charset=utf-8", headers=None):
+        self.server.site.record(status)
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        site = self.server.site
+        url = urlsplit(self.path)
+        if url.path == STATS_PATH:
+            with site._lock:
+                body = json.dumps({str(status): count for status, count in site.status.items()}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        time.sleep(site.delay())
+        status = site.admit()
+        if status == 429:
+            self.send_body(429, headers={'Retry-After': '1'})
+            return
+        if status == 503:
+            self.send_body(503)
+            return
+
+        if url.path == f"{NUTRITION_PATH}/search":
+            page = int(parse_qs(url.query).get('pg', ['0'])[0])
+            html = site.search(page)
+        elif url.path == f"{NUTRITION_PATH}/{brand_slug(site.brand)}":
+            html = site.listing(int(parse_qs(url.query).get('pg', ['0'])[0]))
+        elif url.path == "/sitemap.xml":
+            self.send_body(200, site.sitemap(f"http://{self.headers['Host']}").encode('utf-8'),
+                           content_type="application/xml; charset=utf-8")
+            return
+        else:
+            html = site.product(url.path)
+        if html is None:
+            self.send_body(404)
+            return
+        self.send_body(200, html.encode('utf-8'))
+
+def serve(port_queue, options):
+    """Processo do servidor: informa a porta escolhida e atende até ser encerrado"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeHandler)
+    server.daemon_threads = True
+    server.site = FakeSite(**options)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+class FakeFatSecret:
+    """Sobe o site falso em outro processo (use como context manager)"""
+
+    def __init__(self, **options):
+        self.options = options
+        self.process = None
+        self.base_url = None
+
+    def start(self):
+        context = multiprocessing.get_context('spawn')
+        port_queue = context.Queue()
+        self.process = context.Process(target=serve, args=(port_queue, self.options), daemon=True)
+        self.process.start()
+        self.base_url = f"http://127.0.0.1:{port_queue.get(timeout=30)}"
+        return self.base_url
+
+    def stats(self):
+        """Contagem de respostas por status enviadas pelo servidor"""
+        return requests.get(self.base_url + STATS_PATH, timeout=5).json()
+
+    def stop(self):
+        if self.process:
+            self.process.terminate()
+            self.process.join()
+            self.process = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="FatSecret falso para benchmarks")
+    parser.add_argument("--produtos", type=int, default=200, help="Número de produtos")
+    parser.add_argument("--latencia", type=float, default=0.02, help="Latência por resposta (s)")
+    parser.add_argument("--variacao", type=float, default=0.0, help="Variação aleatória da latência (± s)")
+    parser.add_argument("--erros", type=float, default=0.0, help="Fração de respostas 503")
+    parser.add_argument("--limite-rps", type=float, help="Acima disso responde 429 + Retry-After")
+    parser.add_argument("--gravadas", help="Serve as páginas do arquivo de páginas (dados/arquivo_html)")
+    parser.add_argument("--cobertura-busca", type=float, default=1.0,
+                        help="Fração dos produtos que a busca encontra (padrão: 1.0)")
+    parser.add_argument("--porta", type=int, default=8765)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', args.porta), FakeHandler)
+    server.site = FakeSite(products=args.produtos, latency=args.latencia, jitter=args.variacao,
+                           error_rate=args.erros, max_rps=args.limite_rps, archive_dir=args.gravadas,
+                           search_coverage=args.cobertura_busca)
+    print(f"🌐 FatSecret falso em http://127.0.0.1:{args.porta} ({len(server.site.product_paths)} produtos)")
+    server.serve_forever()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Páginas sintéticas no formato do FatSecret Brasil, usadas pelos benchmarks.
+
+Reproduzem a marcação lida pelos extratores (h2.manufacturer, h1, div.nutrition_facts,
+div.serving_size_value, a.prominent, div.searchNoResult) cercada de navegação, scripts
+e rodapé, para que o custo de parse fique próximo ao de uma página real.
+"""
+
+import random
+
+PRODUCT_PATH = "/calorias-nutri%C3%A7%C3%A3o/{brand}/produto-{index}/1-por%C3%A7%C3%A3o"
+# Porções listadas em "Tamanhos de Porções Comuns": (slug, texto do link, gramas; None = porção base)
+SERVING_OPTIONS = [
+    ("1-por%C3%A7%C3%A3o", "1 porção", None),
+    ("100-g", "100 g", 100),
+    ("1-colher-de-sopa", "1 colher de sopa", 15),
+    ("1-unidade", "1 unidade", 35),
+]
+
+def _page_chrome(seed, blocks=60):
+    """Menus, scripts e blocos de conteúdo irrelevantes para a extração"""
+    rng = random.Random(seed)
+    menu = "".join(f'<li><a href="/categoria/{i}">Categoria {i}</a></li>' for i in range(40))
+    scripts = "".join(f'<script>var cfg{i} = {{"id": {rng.randint(1, 10**6)}, "ads": true}};</script>'
+                      for i in range(15))
+    blocks_html = "".join(
+        f'<div class="block"><p>Texto {i} {"lorem ipsum " * rng.randint(5, 20)}</p>'
+        f'<table><tr><td>{rng.random():.3f}</td><td>{rng.random():.3f}</td></tr></table></div>'
+        for i in range(blocks)
+    )
+    return f'<div id="header"><ul class="menu">{menu}</ul></div>{scripts}', blocks_html
+
+def _fmt(value):
+    return f"{value:.1f}".replace('.', ',')
+
+def product_page(index, brand="Vitao", serving=None):
+    """Página de produto com a tabela nutricional no formato do FatSecret (serving: slug de outra porção)"""
+    rng = random.Random(index)
+    header, filler = _page_chrome(index)
+    base_grams = rng.choice([15, 20, 30, 40, 45, 100, 200])
+    base_kcal = rng.randint(20, 500)
+    options = {slug: (text, grams or base_grams) for slug, text, grams in SERVING_OPTIONS}
+    text, grams = options.get(serving, options[SERVING_OPTIONS[0][0]])
+    serving_text = text if text.endswith(" g") else f"{text} ({grams} g)"
+    # Valores da porção pedida: proporcionais aos da porção base
+    factor = grams / base_grams
+    kcal = round(base_kcal * factor)
+    nutrients = [
+        ("Gorduras", f"{_fmt(rng.uniform(0, 30) * factor)}g", "black"),
+        ("Gordura Saturada", f"{_fmt(rng.uniform(0, 10) * factor)}g", "sub"),
+        ("Carboidratos", f"{_fmt(rng.uniform(0, 80) * factor)}g", "black"),
+        ("Açúcar", f"{_fmt(rng.uniform(0, 40) * factor)}g", "sub"),
+        ("Fibras", f"{_fmt(rng.uniform(0, 10) * factor)}g", "sub"),
+        ("Proteínas", f"{_fmt(rng.uniform(0, 30) * factor)}g", "black"),
+        ("Sódio", f"{round(rng.randint(0, 900) * factor)}mg", "black"),
+    ]
+    rows = "".join(
+        f'<div class="nutrient {weight} left">{label}</div>'
+        f'<div class="nutrient {weight} right tRight">{value}</div>'
+        for label, value, weight in nutrients
+    )
+    product_dir = PRODUCT_PATH.format(brand=brand.lower(), index=index).rsplit("/", 1)[0]
+    servings = "".join(
+        f'<tr><td><a href="{product_dir}/{slug}">{link_text}</a></td>'
+        f'<td class="right">{round(base_kcal * (option_grams or base_grams) / base_grams)}</td></tr>'
+        for slug, link_text, option_grams in SERVING_OPTIONS
+    )
+    return f"""<!DOCTYPE html>
+<html lang="pt-BR"><head><title>Produto {index} - {brand}</title>
+<meta charset="utf-8"><link rel="stylesheet" href="/static/site.css"></head>
+<body>{header}
+<div id="content"><div class="breadcrumb"><a href="/">Início</a> &gt; <a href="/marcas">{brand}</a></div>
+<h2 class="manufacturer"><a href="/Diary.aspx?brand={brand}">{brand}</a></h2>
+<h1 style="text-transform:none">Produto {index}</h1>
+<div class="nutrition_facts international">
+<div class="serving_size black serving_size_label">Tamanho da porção</div>
+<div class="serving_size black us serving_size_value">{serving_text}</div>
+<div class="hr"></div>
+<div class="nutrient black left">Energia</div><div class="nutrient black right tRight">{round(kcal * 4.184)} kj</div>
+<div class="nutrient left"></div><div class="nutrient black right tRight">{kcal} kcal</div>
+{rows}
+</div>
+<div class="serving_sizes"><h3>Tamanhos de Porções Comuns</h3>
+<table class="generic"><tr><th>Porção</th><th>Calorias</th></tr>{servings}</table></div>
+{filler}
+</div><div id="footer">{"<p>Rodapé</p>" * 30}</div></body></html>"""
+
+def search_page(page, total_products, brand="Vitao", per_page=10, found=None):
+    """Página de resultados de busca (ou a página de 'sem resultados' após o fim)"""
+    header, filler = _page_chrome(10**6 + page, blocks=20)
+    # found: índices que a busca encontra (padrão: todos os produtos)
+    found = range(total_products) if found is None else found
+    indexes = found[page * per_page:(page + 1) * per_page]
+    if not indexes:
+        results = '<div class="searchNoResult">Nenhum resultado encontrado</div>'
+    else:
+        slug = brand.lower()
+        results = "".join(
+            f'<tr><td><a class="prominent" href="{PRODUCT_PATH.format(brand=slug, index=i)}">'
+            f'Produto {i}</a><div class="smallText">1 porção - Calorias: {i} kcal</div></td></tr>'
+            for i in indexes
+        )
+        results = f'<table class="generic searchResult">{results}</table>'
+    return f"""<!DOCTYPE html>
+<html lang="pt-BR"><head><title>Busca {brand}</title></head>
+<body>{header}<div id="content">{results}{filler}</div></body></html>"""
+
+def brand_page(page, total_products, brand="Vitao", per_page=50):
+    """Listagem de produtos da marca (links simples, paginada com ?pg=N); vazia após o fim"""
+    header, filler = _page_chrome(2 * 10**6 + page, blocks=20)
+    slug = brand.lower()
+    indexes = range(page * per_page, min(total_products, (page + 1) * per_page))
+    items = "".join(f'<li><a href="{PRODUCT_PATH.format(brand=slug, index=i)}">Produto {i}</a></li>' for i in indexes)
+    return f"""<!DOCTYPE html>
+<html lang="pt-BR"><head><title>{brand}</title></head>
+<body>{header}<div id="content"><ul class="brandProducts">{items}</ul>{filler}</div></body></html>"""
+
+def sitemap_xml(urls):
+    """Sitemap (urlset) com as URLs informadas"""
+    entries = "".join(f"<url><loc>{url}</loc></url>" for url in urls)
+    return f'''<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</urlset>'''
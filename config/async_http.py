@@ -0,0 +1,165 @@
+import asyncio
+import time
+
+from requests.utils import get_encoding_from_headers
+
+from config.http_session import CONNECT_TIMEOUT, READ_TIMEOUT
+from config.rate_limiter import RETRY_STATUS, retry_delay
+
+# aiohttp é opcional: sem ele só o scraper com threads está disponível
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+class AsyncHttpSession:
+    """Sessão aiohttp com limite de conexões (total e por host) e as mesmas regras do HttpSession"""
+
+    def __init__(self, limit=100, limit_per_host=32, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.requests = 0
+        self.fresh_connections = 0
+        self.retries = 0
+        self._session = None
+
+    async def __aenter__(self):
+        # Tempos de DNS e de conexão de cada requisição (via trace_request_ctx)
+        trace = aiohttp.TraceConfig()
+        trace.on_dns_resolvehost_start.append(self._on_start('dns'))
+        trace.on_dns_resolvehost_end.append(self._on_end('dns'))
+        trace.on_connection_create_start.append(self._on_start('conexao'))
+        trace.on_connection_create_end.append(self._on_end('conexao'))
+
+        connect, read = self.timeout
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host,
+                                           ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(sock_connect=connect, sock_read=read),
+            trace_configs=[trace],
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._session.close()
+
+    @staticmethod
+    def _on_start(phase):
+        async def on_start(session, context, params):
+            context.trace_request_ctx[f'{phase}_inicio'] = time.perf_counter()
+        return on_start
+
+    @staticmethod
+    def _on_end(phase):
+        async def on_end(session, context, params):
+            timings = context.trace_request_ctx
+            timings[phase] = time.perf_counter() - timings.pop(f'{phase}_inicio')
+            if phase == 'conexao':
+                # A criação da conexão inclui a resolução de DNS
+                timings['conexao'] = max(0.0, timings['conexao'] - timings.get('dns', 0.0))
+                timings['conexao_nova'] = True
+        return on_end
+
+    async def get(self, url, headers=None):
+        """GET que lê o corpo inteiro; devolve (status, cabeçalhos, corpo, tempos)"""
+        timings = {'conexao_nova': False, 'dns': 0.0, 'conexao': 0.0}
+        start = time.perf_counter()
+        async with self._session.get(url, headers=headers, trace_request_ctx=timings) as response:
+            headers_at = time.perf_counter()
+            body = await response.read()
+            end = time.perf_counter()
+
+        # Mesmas fases do HttpSession (TTFB sem contar DNS/conexão)
+        timings.update({
+            'ttfb': max(0.0, headers_at - start - timings['dns'] - timings['conexao']),
+            'download': end - headers_at,
+            'total': end - start,
+            'bytes': response.content_length or len(body),
+        })
+        self.requests += 1
+        self.fresh_connections += timings['conexao_nova']
+        return response, body, timings
+
+    async def get_text(self, url, headers=None, cache=None, rate_limiter=None, max_retries=3, metrics=None):
+        """Retorna o HTML da URL, usando o cache em disco e GET condicional quando disponível"""
+        entry = cache.get(url) if cache else None
+        if entry and cache.is_fresh(entry):
+            cache.record('hits')
+            return entry['body']
+
+        request_headers = dict(headers or {})
+        if entry:
+            request_headers.update(cache.conditional_headers(entry))
+
+        for attempt in range(max_retries + 1):
+            # Só consome o orçamento de requisições quando vai de fato à rede
+            if rate_limiter:
+                await asyncio.sleep(rate_limiter.reserve())
+            start = time.perf_counter()
+            try:
+                response, body, timings = await self.get(url, headers=request_headers)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if metrics:
+                    metrics.on_request({'url': url, 'status': None, 'tentativa': attempt,
+                                        'erro': type(e).__name__, 'total': time.perf_counter() - start})
+                if attempt == max_retries:
+                    raise
+                await self._back_off(rate_limiter, attempt)
+                continue
+
+            if metrics:
+                metrics.on_request({'url': url, 'status': response.status, 'tentativa': attempt, **timings})
+
+            if response.status in RETRY_STATUS and attempt < max_retries:
+                await self._back_off(rate_limiter, attempt, response)
+                continue
+            break
+
+        if entry and response.status == 304:
+            if rate_limiter:
+                rate_limiter.on_success(timings['total'])
+            cache.refresh(url)
+            cache.record('revalidados')
+            return entry['body']
+
+        response.raise_for_status()
+        if rate_limiter:
+            rate_limiter.on_success(timings['total'])
+        # Mesma decodificação do requests (charset do Content-Type)
+        text = body.decode(get_encoding_from_headers(response.headers) or 'utf-8', errors='replace')
+        if cache:
+            cache.put(url, text,
+                      etag=response.headers.get('ETag'),
+                      last_modified=response.headers.get('Last-Modified'))
+            cache.record('misses')
+        return text
+
+    async def _back_off(self, rate_limiter, attempt, response=None):
+        """Espera antes de uma nova tentativa (sem response: timeout/erro de conexão)"""
+        self.retries += 1
+        if response is None:
+            delay = retry_delay(rate_limiter, attempt)
+        else:
+            delay = retry_delay(rate_limiter, attempt, response.status, response.headers.get('Retry-After'))
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def get_stats(self):
+        """Resume o reuso de conexões das requisições feitas até agora"""
+        reused = self.requests - self.fresh_connections
+        return {
+            'requisicoes': self.requests,
+            'conexoes_reutilizadas': reused,
+            'conexoes_novas': self.fresh_connections,
+            'taxa_reuso': reused / self.requests if self.requests else 0.0,
+            'novas_tentativas': self.retries,
+        }
+
+    def print_stats(self):
+        """Exibe as estatísticas de reuso de conexões"""
+        stats = self.get_stats()
+        print(f"🔌 {stats['requisicoes']} requisições (asyncio), {stats['conexoes_novas']} conexões novas, "
+              f"{stats['conexoes_reutilizadas']} reutilizadas ({stats['taxa_reuso']:.0%}), "
+              f"{stats['novas_tentativas']} novas tentativas")
@@ -0,0 +1,235 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Permite executar como script (python config/async_scraper.py) ou importar como módulo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.async_http import HAS_AIOHTTP, AsyncHttpSession
+from config.scraper import BrandFatSecretScraper, add_scraper_arguments, timed_parse_product_task
+from config.store import ProductStore
+
+if HAS_AIOHTTP:
+    import aiohttp
+
+# Marca o fim das URLs / dos resultados
+_DONE = object()
+# asyncio.TaskGroup (cancelamento estruturado) existe a partir do Python 3.11
+HAS_TASKGROUP = hasattr(asyncio, 'TaskGroup')
+
+class AsyncBrandScraper(BrandFatSecretScraper):
+    """Scraper com downloads em asyncio (aiohttp): centenas de requisições em voo com poucas threads"""
+
+    def __init__(self, brand, max_concurrency=100, per_host_limit=32, **kwargs):
+        super().__init__(brand, **kwargs)
+        # Requisições em voo (semáforo) e conexões simultâneas por host (pool do aiohttp)
+        self.max_concurrency = max(1, max_concurrency)
+        self.per_host_limit = max(1, per_host_limit)
+        # Produtos entre a leitura da URL e a gravação: precisa comportar todas as requisições em voo
+        self.window = max(self.pipeline_window, 2 * self.max_concurrency)
+        self.http = None
+
+    async def get_page_content_async(self, url):
+        """Faz a requisição HTTP e retorna o conteúdo da página"""
+        try:
+            return await self.http.get_text(url, headers=self.headers, cache=self.cache,
+                                            rate_limiter=self.rate_limiter, metrics=self.metrics)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Erro ao acessar {url}: {e}")
+            return None
+
+    def prepare_extraction(self, url, content):
+        """Arquiva a página e devolve a impressão digital anterior (executado nas threads de trabalho)"""
+        self.handle_page(url, content)
+        return self.previous_fingerprint(url)
+
+    def process_page(self, url, content):
+        """Arquiva e extrai os dados da página (executado nas threads de trabalho)"""
+        self.handle_page(url, content)
+        return self.extract_product(url, content)
+
+    async def scrape_product_async(self, url, semaphore, workers, parsers):
+        """Baixa (dentro do limite de concorrência) e extrai os dados de um produto"""
+        async with semaphore:
+            print(f"Fazendo scraping de: {url}")
+            content = await self.get_page_content_async(url)
+        if not content:
+            return None
+
+        # Disco e CPU ficam fora do event loop: threads de trabalho e, opcionalmente, processos de parse
+        loop = asyncio.get_running_loop()
+        if parsers is None:
+            return await loop.run_in_executor(workers, self.process_page, url, content)
+        previous_fingerprint = await loop.run_in_executor(workers, self.prepare_extraction, url, content)
+        result = await loop.run_in_executor(
+            parsers, timed_parse_product_task, url, content, self.brand, previous_fingerprint,
+            self.wants_serving_links(url))
+        return await loop.run_in_executor(workers, self.complete_parse, url, result)
+
+    async def crawl(self, urls, results, slots, stop):
+        """Baixa as URLs e entrega (url, dados) em results na ordem de chegada das URLs"""
+        loop = asyncio.get_running_loop()
+        inbox = asyncio.Queue()
+
+        def feed():
+            # As URLs podem vir de um iterável bloqueante (coleta encadeada): lidas em uma thread própria
+            try:
+                for url in urls:
+                    slots.acquire()
+                    if stop.is_set():
+                        return
+                    loop.call_soon_threadsafe(inbox.put_nowait, url)
+                item = _DONE
+            except Exception as e:
+                item = e
+            if not stop.is_set():
+                loop.call_soon_threadsafe(inbox.put_nowait, item)
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        workers = ThreadPoolExecutor(max_workers=self.max_workers)
+        # 'spawn' evita fazer fork de um processo que já tem threads ativas
+        parsers = (ProcessPoolExecutor(max_workers=self.parse_processes,
+                                       mp_context=multiprocessing.get_context('spawn'))
+                   if self.parse_processes else None)
+        threading.Thread(target=feed, name="urls-async", daemon=True).start()
+        try:
+            async with AsyncHttpSession(limit=self.max_concurrency, limit_per_host=self.per_host_limit) as http:
+                self.http = http
+                # TaskGroup: um erro inesperado ou o cancelamento (Ctrl-C) encerra todas as tarefas juntas
+                async with asyncio.TaskGroup() as group:
+                    pending = asyncio.Queue()
+
+                    async def deliver():
+                        while True:
+                            url, task = await pending.get()
+                            if task is None:
+                                return
+                            results.put((url, await task))
+
+                    group.create_task(deliver())
+                    while True:
+                        url = await inbox.get()
+                        if isinstance(url, Exception):
+                            raise url
+                        if url is _DONE:
+                            break
+                        task = group.create_task(self.scrape_product_async(url, semaphore, workers, parsers))
+                        pending.put_nowait((url, task))
+                    pending.put_nowait((None, None))
+        finally:
+            workers.shutdown(wait=False, cancel_futures=True)
+            if parsers is not None:
+                parsers.shutdown(wait=False, cancel_futures=True)
+
+    def iter_results(self, urls):
+        """Gera (url, dados do produto) na mesma ordem das URLs; o event loop roda em uma thread própria"""
+        if not (HAS_AIOHTTP and HAS_TASKGROUP):
+            print("⚠️  Modo asyncio requer aiohttp e Python 3.11+: usando downloads em threads")
+            yield from super().iter_results(urls)
+            return
+
+        results = queue.Queue()
+        # Limita os produtos entre a leitura da URL e a gravação (memória constante)
+        slots = threading.Semaphore(self.window)
+        stop = threading.Event()
+        ready = threading.Event()
+        state = {}
+
+        def run_loop():
+            async def main():
+                state['loop'] = asyncio.get_running_loop()
+                state['task'] = asyncio.current_task()
+                ready.set()
+                await self.crawl(urls, results, slots, stop)
+
+            try:
+                asyncio.run(main())
+                results.put(_DONE)
+            except asyncio.CancelledError:
+                results.put(_DONE)
+            except BaseException as e:
+                # O TaskGroup agrupa o erro original em um ExceptionGroup
+                while isinstance(e, BaseExceptionGroup) and len(e.exceptions) == 1:
+                    e = e.exceptions[0]
+                results.put(e)
+            finally:
+                ready.set()
+
+        thread = threading.Thread(target=run_loop, name="event-loop", daemon=True)
+        thread.start()
+        ready.wait()
+        print(f"⚡ Modo asyncio: até {self.max_concurrency} requisições em voo, "
+              f"{self.per_host_limit} conexões por host")
+        try:
+            while True:
+                item = results.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                slots.release()
+                yield item
+        finally:
+            # Interrupção (Ctrl-C) ou fim antecipado: cancela as requisições em voo e libera a leitura de URLs
+            stop.set()
+            slots.release()
+            loop, task = state.get('loop'), state.get('task')
+            if thread.is_alive() and loop is not None:
+                loop.call_soon_threadsafe(task.cancel)
+            thread.join()
+
+    def print_stats(self):
+        """Exibe também as conexões da sessão asyncio"""
+        if self.http is not None:
+            self.http.print_stats()
+        super().print_stats()
+
+class AsyncVitaoFatSecretScraper(AsyncBrandScraper):
+    """Scraper assíncrono dos dados nutricionais dos produtos da Vitao"""
+
+    def __init__(self, **kwargs):
+        super().__init__("Vitao", **kwargs)
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Scraper de dados nutricionais com downloads em asyncio")
+    parser.add_argument("--marca", default="Vitao", help="Marca a coletar (padrão: Vitao)")
+    parser.add_argument("--concorrencia", type=int, default=100, help="Requisições em voo ao mesmo tempo")
+    parser.add_argument("--por-host", type=int, default=32, help="Conexões simultâneas por host")
+    parser.add_argument("--workers", type=int, default=8, help="Threads de gravação/extração das páginas")
+    parser.add_argument("--rps", type=float, default=4.0, help="Requisições por segundo iniciais (global, ajustada conforme as respostas)")
+    parser.add_argument("--sem-cache", action="store_true", help="Ignora o cache em disco das páginas")
+    parser.add_argument("--processos", type=int, default=0,
+                        help="Processos de parse (0 = parse nas threads de trabalho)")
+    parser.add_argument("--sem-arquivo", action="store_true",
+                        help="Não guarda o HTML bruto das páginas em dados/arquivo_html/")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Coleta apenas URLs novas, com falha ou desatualizadas e mescla no CSV")
+    parser.add_argument("--max-idade-dias", type=float, default=7,
+                        help="Idade máxima (em dias) de um produto no modo incremental")
+    add_scraper_arguments(parser)
+    args = parser.parse_args()
+
+    if not (HAS_AIOHTTP and HAS_TASKGROUP):
+        print("❌ O modo asyncio requer aiohttp (pip install aiohttp) e Python 3.11+")
+        sys.exit(1)
+
+    store = ProductStore(args.sqlite) if args.sqlite else None
+    scraper = AsyncBrandScraper(args.marca, max_concurrency=args.concorrencia, per_host_limit=args.por_host,
+                                max_workers=args.workers, requests_per_second=args.rps,
+                                use_cache=not args.sem_cache, parse_processes=args.processos,
+                                use_archive=not args.sem_arquivo, parquet_dir=args.parquet, store=store,
+                                expand_servings=args.variantes)
+    try:
+        scraper.run(incremental=args.incremental, max_age_days=args.max_idade_dias)
+    finally:
+        if store is not None:
+            store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import re
+import unicodedata
+from urllib.parse import quote, quote_plus
+
+FATSECRET_URL = "https://www.fatsecret.com.br"
+NUTRITION_PATH = "/calorias-nutri%C3%A7%C3%A3o"
+
+def brand_slug(brand):
+    """Segmento da marca nas URLs de produto do FatSecret (ex: "Mãe Terra" -> "m%C3%A3e-terra")"""
+    return quote(brand.strip().lower().replace(' ', '-'))
+
+def brand_file_prefix(brand):
+    """Prefixo ASCII dos arquivos de saída da marca (ex: "Mãe Terra" -> "mae_terra")"""
+    ascii_name = unicodedata.normalize('NFKD', brand).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '_', ascii_name.lower()).strip('_') or "marca"
+
+def brand_search_url(brand, base_url=FATSECRET_URL):
+    """URL da busca de produtos da marca"""
+    return f"{base_url}{NUTRITION_PATH}/search?q={quote_plus(brand)}"
+
+def brand_product_prefix(brand):
+    """Trecho do caminho que identifica os links de produtos da marca"""
+    return f"{NUTRITION_PATH}/{brand_slug(brand)}/"
+
+def brand_listing_url(brand, base_url=FATSECRET_URL):
+    """URL da listagem de produtos da marca (o diretório dos links de produto)"""
+    return f"{base_url}{NUTRITION_PATH}/{brand_slug(brand)}"
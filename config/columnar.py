@@ -0,0 +1,140 @@
+import argparse
+import csv
+import glob
+import importlib.util
+import os
+import sys
+import uuid
+from datetime import datetime
+
+# Permite executar como script (python config/columnar.py) ou importar como módulo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.nutrients import NUTRIENT_TABLE
+
+# pyarrow é opcional (sem ele a saída continua só em CSV) e pesado: só é importado
+# quando o Parquet é de fato gravado ou lido
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+def _arrow():
+    import pyarrow
+    import pyarrow.dataset
+    import pyarrow.parquet
+    return pyarrow
+
+PARQUET_DIR = "dados/parquet"
+# Coluna de partição (diretórios dia_coleta=AAAA-MM-DD/ no formato hive)
+PARTITION_COLUMN = 'dia_coleta'
+NUMERIC_FIELDS = ['porcao'] + [spec.field for spec in NUTRIENT_TABLE.values()]
+
+def nutrition_schema():
+    """Schema tipado das linhas nutricionais (nutrientes em float32, textos repetidos como dicionário)"""
+    pa = _arrow()
+    fields = [
+        pa.field('nome_produto', pa.string()),
+        pa.field('url', pa.string()),
+        pa.field('categoria', pa.dictionary(pa.int32(), pa.string())),
+        pa.field('marca', pa.dictionary(pa.int32(), pa.string())),
+    ]
+    fields += [pa.field(name, pa.float32()) for name in NUMERIC_FIELDS]
+    fields += [
+        pa.field('unidade_porcao', pa.dictionary(pa.int32(), pa.string())),
+        pa.field('data_coleta', pa.timestamp('s')),
+        pa.field(PARTITION_COLUMN, pa.string()),
+    ]
+    return pa.schema(fields)
+
+def _to_float(value):
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def _to_datetime(value):
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+def rows_to_table(rows):
+    """Converte linhas do scraper (dicts tipados ou lidos do CSV) em uma tabela Arrow com o schema fixo"""
+    pa = _arrow()
+    columns = {field: [] for field in nutrition_schema().names}
+    for row in rows:
+        collected_at = _to_datetime(row.get('data_coleta'))
+        columns['nome_produto'].append(row.get('nome_produto'))
+        columns['url'].append(row.get('url'))
+        columns['categoria'].append(row.get('categoria') or None)
+        columns['marca'].append(row.get('marca') or None)
+        for name in NUMERIC_FIELDS:
+            columns[name].append(_to_float(row.get(name)))
+        columns['unidade_porcao'].append(row.get('unidade_porcao') or None)
+        columns['data_coleta'].append(collected_at)
+        columns[PARTITION_COLUMN].append(collected_at.date().isoformat() if collected_at else 'sem-data')
+    return pa.Table.from_pydict(columns, schema=nutrition_schema())
+
+def write_parquet(rows, root_dir=PARQUET_DIR, prefix="coleta"):
+    """Acrescenta as linhas ao dataset particionado por dia de coleta (um arquivo novo por execução)"""
+    table = rows_to_table(rows)
+    if table.num_rows == 0:
+        return 0
+    # Nome único por execução: nada é reescrito, as execuções só acrescentam arquivos
+    basename = f"{prefix}-{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+    _arrow().parquet.write_to_dataset(table, root_dir, partition_cols=[PARTITION_COLUMN],
+                                      basename_template=f"{basename}-{{i}}.parquet",
+                                      existing_data_behavior='overwrite_or_ignore')
+    return table.num_rows
+
+def load_parquet(root_dir=PARQUET_DIR, brands=None, since=None, latest=True):
+    """Carrega o dataset em um DataFrame (categorias como Categorical); latest mantém a coleta mais recente de cada URL"""
+    pa = _arrow()
+    ds = pa.dataset
+    # Schema explícito: arquivos gravados antes de uma coluna nova a leem como nula
+    dataset = ds.dataset(root_dir, format='parquet', schema=nutrition_schema(),
+                         partitioning=ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.string())]), flavor='hive'))
+    condition = None
+    if brands:
+        condition = ds.field('marca').isin(list(brands))
+    if since:
+        # Filtra pelas partições: diretórios de dias anteriores nem são abertos
+        day_filter = ds.field(PARTITION_COLUMN) >= str(since)
+        condition = day_filter if condition is None else condition & day_filter
+
+    table = dataset.to_table(filter=condition).unify_dictionaries()
+    frame = table.to_pandas()
+    if latest and not frame.empty:
+        frame = (frame.sort_values('data_coleta', kind='stable')
+                      .drop_duplicates('url', keep='last')
+                      .reset_index(drop=True))
+    return frame
+
+def add_parquet_argument(parser, help="Também grava as linhas em Parquet particionado por dia"):
+    """Opção --parquet [DIR] (sem valor: o dataset padrão), com o texto de ajuda da linha de comando"""
+    parser.add_argument("--parquet", nargs="?", const=PARQUET_DIR, help=f"{help} (padrão: {PARQUET_DIR})")
+
+def csv_rows(paths):
+    for path in paths:
+        with open(path, 'r', newline='', encoding='utf-8') as csvfile:
+            yield from csv.DictReader(csvfile)
+
+def main():
+    """Converte CSVs nutricionais existentes para o dataset Parquet"""
+    parser = argparse.ArgumentParser(description="Converte CSVs nutricionais para Parquet particionado por dia")
+    parser.add_argument("csv", nargs="*", help="CSVs de entrada (padrão: dados/*_nutricional.csv)")
+    parser.add_argument("--saida", default=PARQUET_DIR, help="Diretório do dataset Parquet")
+    args = parser.parse_args()
+
+    if not HAS_PYARROW:
+        print("❌ pyarrow não está instalado (pip install pyarrow)")
+        sys.exit(1)
+
+    paths = args.csv or sorted(glob.glob("dados/*_nutricional.csv"))
+    total = write_parquet(csv_rows(paths), args.saida, prefix="importacao")
+    print(f"💾 {total} linhas de {len(paths)} CSVs gravadas em: {args.saida}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+import csv
+import io
+import os
+import threading
+
+class StreamingCsvWriter:
+    """Grava as linhas do CSV à medida que ficam prontas, com fsync periódico e journal de checkpoint"""
+
+    def __init__(self, output_file, fieldnames, fsync_every=10):
+        self.output_file = output_file
+        self.fieldnames = fieldnames
+        self.fsync_every = max(1, fsync_every)
+        # Arquivo parcial e journal das URLs concluídas, usados para retomar execuções interrompidas
+        self.partial_file = f"{output_file}.parcial"
+        self.journal_file = f"{output_file}.checkpoint"
+        self._csvfile = None
+        self._journal = None
+        self._writer = None
+        self._pending = 0
+        self.rows_written = 0
+
+    def open(self):
+        """Abre o arquivo parcial e retorna as URLs já concluídas numa execução anterior"""
+        os.makedirs(os.path.dirname(self.output_file) or ".", exist_ok=True)
+        completed = self._load_checkpoint()
+
+        if completed:
+            # Reescreve o parcial só com as linhas confirmadas no journal (descarta escritas pela metade)
+            self._rewrite_partial(completed)
+            self._csvfile = open(self.partial_file, 'a', newline='', encoding='utf-8')
+            self._writer = csv.DictWriter(self._csvfile, fieldnames=self.fieldnames, extrasaction='ignore')
+        else:
+            self._csvfile = open(self.partial_file, 'w', newline='', encoding='utf-8')
+            self._writer = csv.DictWriter(self._csvfile, fieldnames=self.fieldnames, extrasaction='ignore')
+            self._writer.writeheader()
+
+        self._journal = open(self.journal_file, 'a' if completed else 'w', encoding='utf-8')
+        self.rows_written = len(completed)
+        return completed
+
+    def _load_checkpoint(self):
+        if not (os.path.exists(self.journal_file) and os.path.exists(self.partial_file)):
+            return set()
+        with open(self.journal_file, 'r', encoding='utf-8') as journal:
+            return {line.rstrip('\n') for line in journal if line.endswith('\n')}
+
+    def _rewrite_partial(self, completed):
+        tmp_file = f"{self.partial_file}.tmp"
+        seen = set()
+        with open(self.partial_file, 'r', newline='', encoding='utf-8') as source, \
+                open(tmp_file, 'w', newline='', encoding='utf-8') as target:
+            writer = csv.DictWriter(target, fieldnames=self.fieldnames, extrasaction='ignore')
+            writer.writeheader()
+            for row in csv.DictReader(source):
+                if row.get('url') in completed and row['url'] not in seen:
+                    seen.add(row['url'])
+                    writer.writerow(row)
+        os.replace(tmp_file, self.partial_file)
+
+    def write(self, row):
+        """Grava uma linha e registra a URL no journal"""
+        self._writer.writerow(row)
+        self._csvfile.flush()
+        # O journal só é atualizado depois que a linha foi escrita no CSV
+        self._journal.write(f"{row['url']}\n")
+        self._journal.flush()
+        self.rows_written += 1
+        self._pending += 1
+        if self._pending >= self.fsync_every:
+            self.sync()
+
+    def sync(self):
+        """Força a gravação em disco do CSV parcial e do journal"""
+        for handle in (self._csvfile, self._journal):
+            if handle and not handle.closed:
+                handle.flush()
+                os.fsync(handle.fileno())
+        self._pending = 0
+
+    def close(self):
+        """Fecha os arquivos mantendo o checkpoint (permite retomar depois)"""
+        self.sync()
+        for handle in (self._csvfile, self._journal):
+            if handle and not handle.closed:
+                handle.close()
+
+    def read_rows(self):
+        """Lê de volta as linhas gravadas no arquivo parcial"""
+        with open(self.partial_file, 'r', newline='', encoding='utf-8') as csvfile:
+            yield from csv.DictReader(csvfile)
+
+    def commit(self, replace_output=True):
+        """Conclui a execução: publica o parcial como arquivo final e remove o checkpoint"""
+        self.close()
+        if replace_output:
+            os.replace(self.partial_file, self.output_file)
+        else:
+            os.remove(self.partial_file)
+        os.remove(self.journal_file)
+
+
+def _read_record(handle):
+    """Bytes de um registro CSV (campos entre aspas podem conter quebras de linha)"""
+    lines = []
+    quotes = 0
+    while True:
+        line = handle.readline()
+        if not line:
+            break
+        lines.append(line)
+        quotes += line.count(b'"')
+        # Aspas balanceadas: o registro terminou nesta linha
+        if quotes % 2 == 0:
+            break
+    return b"".join(lines)
+
+def _parse_record(record):
+    return next(csv.reader(io.StringIO(record.decode('utf-8'), newline='')), [])
+
+class CsvRowIndex:
+    """Índice de um CSV já gravado: chave -> (posição no arquivo, valor resumido); as linhas completas
+    são lidas do disco só quando pedidas, sem manter o arquivo inteiro em memória"""
+
+    def __init__(self, path=None, key='url', value=None):
+        self.path = path
+        self.key = key
+        self.fieldnames = []
+        self._entries = {}
+        self._file = None
+        self._lock = threading.Lock()
+        if path:
+            self._build(value or (lambda row: None))
+
+    def _build(self, value):
+        try:
+            handle = open(self.path, 'rb')
+        except FileNotFoundError:
+            return
+        with handle:
+            self.fieldnames = _parse_record(_read_record(handle))
+            while True:
+                offset = handle.tell()
+                record = _read_record(handle)
+                if not record:
+                    break
+                row = dict(zip(self.fieldnames, _parse_record(record)))
+                if row.get(self.key):
+                    # Chave repetida: vale a última linha, como no csv.DictReader indexado
+                    self._entries[row[self.key]] = (offset, value(row))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def value(self, key):
+        """Valor resumido guardado em memória para a chave (None se ausente)"""
+        entry = self._entries.get(key)
+        return entry[1] if entry else None
+
+    def get(self, key, default=None):
+        """Linha completa da chave, lida do disco (default se ausente)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'rb')
+            self._file.seek(entry[0])
+            record = _read_record(self._file)
+        return dict(zip(self.fieldnames, _parse_record(record)))
+
+    def close(self):
+        """Fecha o arquivo (antes de substituí-lo); o índice fica vazio"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._entries.clear()
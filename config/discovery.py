@@ -0,0 +1,116 @@
+import html
+import re
+from urllib.parse import urljoin
+
+from config.brands import brand_listing_url
+from config.frontier import canonicalize_url
+from config.parsing import page_links
+
+# Entradas <loc> de um sitemap (urlset) ou de um índice de sitemaps (sitemapindex)
+LOC_RE = re.compile(r'<loc>\s*([^<]+?)\s*</loc>', re.IGNORECASE)
+SITEMAP_INDEX_RE = re.compile(r'<sitemapindex[\s>]', re.IGNORECASE)
+
+class DiscoverySource:
+    """Fonte de URLs de produto de uma marca; gera (página, URLs encontradas) por página baixada"""
+
+    name = "fonte"
+
+    def iter_pages(self, collector):
+        """Gera (número da página, URLs canônicas de produto) usando a sessão e o limite do coletor"""
+        raise NotImplementedError
+
+class SearchSource(DiscoverySource):
+    """Paginação da busca do FatSecret (search?q=<marca>, links a.prominent, ~10 produtos por página)"""
+
+    name = "busca"
+
+    def iter_pages(self, collector):
+        yield from collector.iter_paginated(collector.get_page_url, collector.process_search_page)
+
+class BrandListingSource(DiscoverySource):
+    """Listagem da marca (/calorias-nutrição/<marca>?pg=N): todos os produtos, sem o ranking da busca"""
+
+    name = "marca"
+
+    def __init__(self, listing_url=None):
+        self.listing_url = listing_url
+        self.previous = None
+
+    def page_url(self, collector, page):
+        url = self.listing_url or brand_listing_url(collector.brand, collector.base_url)
+        return url if page == 0 else f"{url}?pg={page}"
+
+    def iter_pages(self, collector):
+        self.previous = None
+
+        def process(page, content):
+            urls = product_links(content, collector)
+            # Fim da listagem: página sem produtos ou repetindo a anterior (pg além do fim)
+            if not urls or urls == self.previous:
+                print(f"🏁 Listagem da marca encerrada na página {page + 1}")
+                return None
+            self.previous = urls
+            return urls
+
+        yield from collector.iter_paginated(lambda page: self.page_url(collector, page), process)
+
+class SitemapSource(DiscoverySource):
+    """Sitemap XML (urlset ou índice de sitemaps): milhares de URLs por requisição, filtradas pela marca"""
+
+    name = "sitemap"
+
+    def __init__(self, sitemap_url=None, only_matching=None):
+        self.sitemap_url = sitemap_url
+        # Em um índice, só segue os sitemaps cuja URL contém este trecho (None = todos)
+        self.only_matching = only_matching
+
+    def iter_pages(self, collector):
+        pending = [self.sitemap_url or urljoin(collector.base_url, "/sitemap.xml")]
+        visited = set()
+        page = 0
+        while pending:
+            url = pending.pop(0)
+            if url in visited:
+                continue
+            visited.add(url)
+            content = collector.get_page_content(url)
+            if not content:
+                collector.discovery_failed(url)
+                continue
+            locations = [html.unescape(location) for location in LOC_RE.findall(content)]
+            if SITEMAP_INDEX_RE.search(content):
+                pending.extend(location for location in locations
+                               if self.only_matching is None or self.only_matching in location)
+                continue
+            urls = [canonical for canonical in map(canonicalize_url, locations)
+                    if collector.product_prefix in canonical]
+            print(f"🗺️  Sitemap {url}: {len(urls)} produtos da marca em {len(locations)} URLs")
+            yield page, urls
+            page += 1
+
+# Fontes disponíveis pela linha de comando (--fontes)
+DISCOVERY_SOURCES = {
+    SearchSource.name: SearchSource,
+    BrandListingSource.name: BrandListingSource,
+    SitemapSource.name: SitemapSource,
+}
+
+def product_links(content, collector):
+    """URLs canônicas de produto da marca entre todos os links da página, sem repetir"""
+    urls = []
+    for _, href in page_links(content):
+        if not href:
+            continue
+        url = canonicalize_url(urljoin(collector.base_url, href))
+        if collector.product_prefix in url:
+            urls.append(url)
+    return list(dict.fromkeys(urls))
+
+def build_sources(names, sitemap_url=None):
+    """Instancia as fontes pelos nomes (ex: ["marca", "busca"]); ValueError se algum não existe"""
+    sources = []
+    for name in names:
+        if name not in DISCOVERY_SOURCES:
+            raise ValueError(f"Fonte de URLs desconhecida: {name} (opções: {', '.join(DISCOVERY_SOURCES)})")
+        sources.append(SitemapSource(sitemap_url) if name == SitemapSource.name else DISCOVERY_SOURCES[name]())
+    return sources
@@ -0,0 +1,141 @@
+import hashlib
+import math
+import os
+from urllib.parse import quote, unquote, urlsplit, urlunsplit
+
+# Mesma codificação de brand_slug (quote padrão): só letras, dígitos, "/" e "-._~" ficam literais
+PATH_SAFE = "/"
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+def canonicalize_url(url):
+    """Forma canônica da URL: "ç" e "%c3%a7" viram "%C3%A7", sem barra final, fragmento ou porta padrão"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = quote(unquote(parts.path), safe=PATH_SAFE) or '/'
+    if len(path) > 1:
+        path = path.rstrip('/') or '/'
+    return urlunsplit((scheme, host, path, parts.query, ''))
+
+def url_digest(url):
+    """Hash de 8 bytes da URL (um int Python ocupa bem menos que a string)"""
+    return int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'big')
+
+class BloomFilter:
+    """Filtro de Bloom: memória fixa, sem falsos negativos e com taxa de falsos positivos configurável"""
+
+    def __init__(self, capacity, error_rate=0.001):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, url):
+        # Double hashing: k posições a partir de dois hashes de 64 bits
+        digest = hashlib.blake2b(url.encode('utf-8'), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'big'), int.from_bytes(digest[8:], 'big') | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, url):
+        """Adiciona a URL; devolve False se ela (provavelmente) já estava no filtro"""
+        new = False
+        for position in self._positions(url):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not self.bits[byte] & mask:
+                self.bits[byte] |= mask
+                new = True
+        return new
+
+    def __contains__(self, url):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(url))
+
+class UrlFrontier:
+    """Fronteira de URLs: canonicaliza, descarta repetidas na inserção, preserva a ordem e persiste em disco"""
+
+    def __init__(self, path=None, bloom_capacity=0, error_rate=0.001):
+        self.path = path
+        # Conjunto de hashes de 8 bytes ou, para crawls muito grandes, um filtro de Bloom de tamanho fixo
+        self.seen = BloomFilter(bloom_capacity, error_rate) if bloom_capacity else set()
+        self.count = 0
+        self.duplicates = 0
+        # URLs que vieram do arquivo de uma execução anterior (as primeiras da fronteira)
+        self.resumed = 0
+        # Com arquivo, a ordem fica só no disco (uma URL por linha); sem ele, em memória
+        self.urls = None if path else []
+        self._file = None
+        if path:
+            self._load()
+            self._file = open(path, 'a', encoding='utf-8')
+
+    def _load(self):
+        """Retoma uma coleta anterior: as URLs já registradas não entram de novo"""
+        if not os.path.exists(self.path):
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            return
+        with open(self.path, 'r', encoding='utf-8') as frontier_file:
+            for line in frontier_file:
+                url = line.rstrip('\n')
+                if not url:
+                    continue
+                self.resumed += 1
+                if self._remember(url):
+                    self.count += 1
+
+    def _remember(self, url):
+        if isinstance(self.seen, BloomFilter):
+            return self.seen.add(url)
+        digest = url_digest(url)
+        if digest in self.seen:
+            return False
+        self.seen.add(digest)
+        return True
+
+    def add(self, url):
+        """URL canônica se ela é nova, None se já estava na fronteira"""
+        url = canonicalize_url(url)
+        if not self._remember(url):
+            self.duplicates += 1
+            return None
+        self.count += 1
+        if self._file is not None:
+            self._file.write(url + '\n')
+        else:
+            self.urls.append(url)
+        return url
+
+    def add_many(self, urls):
+        """Adiciona as URLs e devolve só as novas (canônicas), na ordem recebida"""
+        new_urls = [url for url in map(self.add, urls) if url]
+        self.flush()
+        return new_urls
+
+    def __contains__(self, url):
+        url = canonicalize_url(url)
+        if isinstance(self.seen, BloomFilter):
+            return url in self.seen
+        return url_digest(url) in self.seen
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        """URLs na ordem de descoberta (lidas do disco quando a fronteira é persistida)"""
+        if self.path is None:
+            yield from self.urls
+            return
+        self.flush()
+        with open(self.path, 'r', encoding='utf-8') as frontier_file:
+            for line in frontier_file:
+                if line.strip():
+                    yield line.rstrip('\n')
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
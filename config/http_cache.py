@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+class HttpCache:
+    """Cache em disco das páginas baixadas, com revalidação condicional e limite de tamanho (LRU)"""
+
+    def __init__(self, cache_dir="dados/cache_http", ttl_seconds=6 * 3600, max_bytes=200 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Entradas em ordem de acesso: a primeira é a menos usada recentemente
+        self._index = OrderedDict()
+        self._total_bytes = 0
+        self.stats = {'hits': 0, 'revalidados': 0, 'misses': 0, 'removidos': 0}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _key(self, url):
+        """Chave do cache: hash SHA-256 da URL"""
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _paths(self, key):
+        base = os.path.join(self.cache_dir, key)
+        return base + ".html", base + ".json"
+
+    def _load_index(self):
+        """Carrega os metadados das entradas já gravadas em disco"""
+        entries = []
+        for filename in os.listdir(self.cache_dir):
+            if not filename.endswith(".json"):
+                continue
+            key = filename[:-5]
+            body_path, meta_path = self._paths(key)
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as metafile:
+                    meta = json.load(metafile)
+                # O mtime do corpo marca o último acesso (ordem LRU)
+                accessed_at = os.path.getmtime(body_path)
+            except (OSError, ValueError):
+                continue
+            entries.append((accessed_at, key, meta))
+
+        for _, key, meta in sorted(entries):
+            self._index[key] = meta
+            self._total_bytes += meta['size']
+
+    def _write_atomic(self, path, data):
+        tmp_path = f"{path}.tmp{threading.get_ident()}"
+        with open(tmp_path, 'wb') as tmpfile:
+            tmpfile.write(data)
+        os.replace(tmp_path, path)
+
+    def get(self, url):
+        """Retorna a entrada (metadados + corpo) da URL, ou None se não estiver no cache"""
+        key = self._key(url)
+        with self._lock:
+            meta = self._index.get(key)
+        if meta is None:
+            return None
+
+        body_path, _ = self._paths(key)
+        try:
+            with open(body_path, 'r', encoding='utf-8') as bodyfile:
+                body = bodyfile.read()
+            os.utime(body_path)
+        except OSError:
+            self._remove(key)
+            return None
+
+        with self._lock:
+            if key in self._index:
+                self._index.move_to_end(key)
+        return dict(meta, body=body)
+
+    def is_fresh(self, entry):
+        """Indica se a entrada ainda está dentro do TTL (dispensa a rede)"""
+        return time.time() - entry['stored_at'] < self.ttl_seconds
+
+    def conditional_headers(self, entry):
+        """Cabeçalhos para um GET condicional a partir dos validadores guardados"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def put(self, url, body, etag=None, last_modified=None):
+        """Grava (ou substitui) a resposta da URL e aplica o limite de tamanho"""
+        key = self._key(url)
+        body_path, meta_path = self._paths(key)
+        data = body.encode('utf-8')
+        meta = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': time.time(),
+            'size': len(data),
+        }
+
+        self._write_atomic(body_path, data)
+        self._write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+
+        with self._lock:
+            previous = self._index.pop(key, None)
+            if previous:
+                self._total_bytes -= previous['size']
+            self._index[key] = meta
+            self._total_bytes += meta['size']
+        self._evict()
+
+    def refresh(self, url):
+        """Renova o TTL de uma entrada revalidada pelo servidor (304)"""
+        key = self._key(url)
+        with self._lock:
+            meta = self._index.get(key)
+            if meta is None:
+                return
+            meta['stored_at'] = time.time()
+            stored = dict(meta)
+        _, meta_path = self._paths(key)
+        self._write_atomic(meta_path, json.dumps(stored).encode('utf-8'))
+
+    def _remove(self, key):
+        with self._lock:
+            meta = self._index.pop(key, None)
+            if meta:
+                self._total_bytes -= meta['size']
+                self.stats['removidos'] += 1
+        for path in self._paths(key):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _evict(self):
+        """Remove as entradas menos usadas recentemente até caber no limite"""
+        victims = []
+        with self._lock:
+            excess = self._total_bytes - self.max_bytes
+            for key, meta in self._index.items():
+                if excess <= 0:
+                    break
+                victims.append(key)
+                excess -= meta['size']
+        for key in victims:
+            self._remove(key)
+
+    def record(self, outcome):
+        """Contabiliza o resultado de uma consulta (hits, revalidados ou misses)"""
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def print_stats(self):
+        """Exibe as estatísticas de uso do cache"""
+        print(f"🗄️  Cache: {self.stats['hits']} hits, {self.stats['revalidados']} revalidados (304), "
+              f"{self.stats['misses']} downloads, {len(self._index)} páginas "
+              f"({self._total_bytes / 1024 / 1024:.1f} MB)")
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+def get_shared_cache():
+    """Retorna o cache em disco compartilhado pelos coletores (criado na primeira chamada)"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = HttpCache()
+        return _shared_cache
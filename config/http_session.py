@@ -0,0 +1,242 @@
+import socket
+import threading
+import time
+from collections import deque
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError
+# Inclui "br" (e "zstd") automaticamente quando os decodificadores estão instalados
+from urllib3.util.request import ACCEPT_ENCODING
+
+from config.metrics import percentiles
+from config.rate_limiter import RETRY_STATUS, retry_delay
+
+# Timeouts padrão (segundos): abrir a conexão / esperar cada leitura do socket
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 30
+# Latências mais recentes guardadas para os percentis de get_stats (memória fixa em coletas longas)
+LATENCY_SAMPLE_SIZE = 1024
+
+class TimedConnectionMixin:
+    """Marca quando um novo socket foi aberto e mede o DNS e a conexão (TCP + TLS)"""
+
+    def _new_conn(self):
+        host = self._dns_host
+        start = time.perf_counter()
+        try:
+            addresses = list(dict.fromkeys(info[4][0] for info in
+                                           socket.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)))
+        except socket.gaierror:
+            # Deixa o urllib3 gerar o NameResolutionError de sempre
+            return super()._new_conn()
+        self.dns_time = time.perf_counter() - start
+
+        # Conecta já no IP resolvido (sem uma segunda consulta), tentando os endereços em ordem
+        error = None
+        try:
+            for address in addresses:
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except ConnectTimeoutError as e:
+                    error = e
+            raise error
+        finally:
+            self._dns_host = host
+
+    def connect(self):
+        self.dns_time = 0.0
+        start = time.perf_counter()
+        super().connect()
+        self.connect_time = time.perf_counter() - start - self.dns_time
+        self.fresh = True
+
+class TrackedHTTPConnection(TimedConnectionMixin, HTTPConnection):
+    """Conexão HTTP com medição de DNS/conexão"""
+
+class TrackedHTTPSConnection(TimedConnectionMixin, HTTPSConnection):
+    """Conexão HTTPS com medição de DNS/conexão (incluindo o handshake TLS)"""
+
+class TrackedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TrackedHTTPConnection
+
+class TrackedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TrackedHTTPSConnection
+
+class PooledAdapter(HTTPAdapter):
+    """Adapter do requests que usa os pools com rastreamento de conexões"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TrackedHTTPConnectionPool,
+            'https': TrackedHTTPSConnectionPool,
+        }
+
+class HttpSession:
+    """Sessão HTTP com pool de conexões, keep-alive e estatísticas de reuso"""
+
+    def __init__(self, pool_size=16, pool_connections=4, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)):
+        self.pool_size = pool_size
+        # (conexão, leitura): um socket travado não pode segurar a coleta indefinidamente
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = PooledAdapter(pool_connections=pool_connections, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Accept-Encoding': ACCEPT_ENCODING,
+            'Connection': 'keep-alive',
+        })
+        self._lock = threading.Lock()
+        # Só contadores e uma amostra limitada: nada cresce com o número de requisições
+        self.requests = 0
+        self.reused_connections = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLE_SIZE)
+        self.retries = 0
+
+    def get(self, url, headers=None, **kwargs):
+        """Faz um GET reaproveitando conexões do pool e registra se houve reuso"""
+        kwargs.setdefault('timeout', self.timeout)
+        start = time.perf_counter()
+        response = self.session.get(url, headers=headers, stream=True, **kwargs)
+        headers_at = time.perf_counter()
+
+        # A conexão só fica acessível enquanto o corpo não foi lido
+        connection = response.raw.connection
+        reused = not getattr(connection, 'fresh', False)
+        dns = connect = 0.0
+        if connection is not None:
+            if not reused:
+                dns = getattr(connection, 'dns_time', 0.0)
+                connect = getattr(connection, 'connect_time', 0.0)
+            connection.fresh = False
+
+        # Lê o corpo inteiro e devolve a conexão ao pool
+        response.content
+        end = time.perf_counter()
+
+        # Tempos de cada fase (TTFB: do envio até os cabeçalhos, sem contar DNS/conexão)
+        response.timings = {
+            'conexao_nova': not reused,
+            'dns': dns,
+            'conexao': connect,
+            'ttfb': max(0.0, headers_at - start - dns - connect),
+            'download': end - headers_at,
+            'total': end - start,
+            # Bytes recebidos pela rede (antes da descompressão)
+            'bytes': response.raw.tell() or len(response.content),
+        }
+
+        with self._lock:
+            self.requests += 1
+            self.reused_connections += reused
+            self.latencies.append(response.timings['total'])
+        return response
+
+    def get_text(self, url, headers=None, cache=None, rate_limiter=None, max_retries=3, metrics=None):
+        """Retorna o HTML da URL, usando o cache em disco e GET condicional quando disponível"""
+        entry = cache.get(url) if cache else None
+        if entry and cache.is_fresh(entry):
+            cache.record('hits')
+            return entry['body']
+
+        request_headers = dict(headers or {})
+        if entry:
+            request_headers.update(cache.conditional_headers(entry))
+
+        for attempt in range(max_retries + 1):
+            # Só consome o orçamento de requisições quando vai de fato à rede
+            if rate_limiter:
+                rate_limiter.wait()
+            start = time.perf_counter()
+            try:
+                response = self.get(url, headers=request_headers)
+            except (requests.Timeout, requests.ConnectionError) as e:
+                if metrics:
+                    metrics.on_request({'url': url, 'status': None, 'tentativa': attempt,
+                                        'erro': type(e).__name__, 'total': time.perf_counter() - start})
+                if attempt == max_retries:
+                    raise
+                self._back_off(rate_limiter, attempt)
+                continue
+
+            if metrics:
+                metrics.on_request({'url': url, 'status': response.status_code, 'tentativa': attempt,
+                                    **response.timings})
+
+            if response.status_code in RETRY_STATUS and attempt < max_retries:
+                self._back_off(rate_limiter, attempt, response)
+                continue
+            break
+
+        if entry and response.status_code == 304:
+            if rate_limiter:
+                rate_limiter.on_success(response.elapsed.total_seconds())
+            cache.refresh(url)
+            cache.record('revalidados')
+            return entry['body']
+
+        response.raise_for_status()
+        if rate_limiter:
+            rate_limiter.on_success(response.elapsed.total_seconds())
+        if cache:
+            cache.put(url, response.text,
+                      etag=response.headers.get('ETag'),
+                      last_modified=response.headers.get('Last-Modified'))
+            cache.record('misses')
+        return response.text
+
+    def _back_off(self, rate_limiter, attempt, response=None):
+        """Espera antes de uma nova tentativa (sem response: timeout/erro de conexão)"""
+        with self._lock:
+            self.retries += 1
+        if response is None:
+            delay = retry_delay(rate_limiter, attempt)
+        else:
+            delay = retry_delay(rate_limiter, attempt, response.status_code, response.headers.get('Retry-After'))
+        if delay > 0:
+            time.sleep(delay)
+
+    def get_stats(self):
+        """Resume o reuso de conexões das requisições feitas até agora"""
+        with self._lock:
+            total = self.requests
+            reused = self.reused_connections
+            latencies = list(self.latencies)
+        return {
+            'requisicoes': total,
+            'conexoes_reutilizadas': reused,
+            'conexoes_novas': total - reused,
+            'taxa_reuso': reused / total if total else 0.0,
+            'novas_tentativas': self.retries,
+            # Percentis das últimas LATENCY_SAMPLE_SIZE requisições
+            'latencia': percentiles(latencies),
+        }
+
+    def print_stats(self):
+        """Exibe as estatísticas de reuso de conexões"""
+        stats = self.get_stats()
+        print(f"🔌 {stats['requisicoes']} requisições, {stats['conexoes_novas']} conexões novas, "
+              f"{stats['conexoes_reutilizadas']} reutilizadas ({stats['taxa_reuso']:.0%}), "
+              f"{stats['novas_tentativas']} novas tentativas")
+        latency = stats['latencia']
+        if latency['n']:
+            print(f"   Latência (últimas {latency['n']}): p50 {latency['p50_ms']:.0f} ms, p95 {latency['p95_ms']:.0f} ms")
+
+    def close(self):
+        """Fecha todas as conexões do pool"""
+        self.session.close()
+
+_shared_session = None
+_shared_lock = threading.Lock()
+
+def get_shared_session(pool_size=16):
+    """Retorna a sessão HTTP compartilhada pelos coletores (criada na primeira chamada)"""
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is None:
+            _shared_session = HttpSession(pool_size=pool_size)
+        return _shared_session
@@ -0,0 +1,98 @@
+import json
+import os
+import threading
+from collections import Counter
+from datetime import datetime
+
+# Fases medidas em cada requisição (segundos no registro, milissegundos no relatório)
+REQUEST_PHASES = ('dns', 'conexao', 'ttfb', 'download', 'total')
+
+def percentiles(values):
+    """p50/p95/p99 (nearest-rank), média e máximo de uma lista de durações em segundos, em ms"""
+    if not values:
+        return {'n': 0}
+    ordered = sorted(values)
+    n = len(ordered)
+
+    def rank(p):
+        return ordered[min(n - 1, max(0, -(-p * n // 100) - 1))] * 1000
+
+    return {
+        'n': n,
+        'p50_ms': round(rank(50), 3),
+        'p95_ms': round(rank(95), 3),
+        'p99_ms': round(rank(99), 3),
+        'media_ms': round(sum(ordered) / n * 1000, 3),
+        'max_ms': round(ordered[-1] * 1000, 3),
+    }
+
+class RunMetrics:
+    """Registra os tempos de cada requisição e de cada parse e gera o relatório de percentis"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = []
+        self.parses = []
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+
+    def on_request(self, record):
+        """Uma tentativa de requisição: url, status, tentativa, bytes, erro e a duração de cada fase"""
+        with self._lock:
+            self.requests.append(record)
+
+    def on_parse(self, url, seconds):
+        """Parse + extração de uma página de produto"""
+        with self._lock:
+            self.parses.append(seconds)
+
+    def report(self):
+        """Resumo em formato serializável (JSON)"""
+        with self._lock:
+            requests = list(self.requests)
+            parses = list(self.parses)
+
+        # Só conexões novas têm DNS/conexão; as reaproveitadas do pool entram apenas nas outras fases
+        fresh = [record for record in requests if record.get('conexao_nova')]
+        phases = {}
+        for phase in REQUEST_PHASES:
+            source = fresh if phase in ('dns', 'conexao') else requests
+            phases[phase] = percentiles([record[phase] for record in source if record.get(phase) is not None])
+
+        return {
+            'inicio': self.started_at,
+            'fim': datetime.now().isoformat(timespec='seconds'),
+            'requisicoes': {
+                'total': len(requests),
+                'status': {str(status): count for status, count in
+                           Counter(record.get('status') for record in requests).most_common()},
+                'erros': dict(Counter(record['erro'] for record in requests if record.get('erro'))),
+                'novas_tentativas': sum(1 for record in requests if record.get('tentativa', 0) > 0),
+                'bytes': sum(record.get('bytes') or 0 for record in requests),
+                'conexoes_novas': len(fresh),
+                'fases': phases,
+            },
+            'parse': percentiles(parses),
+        }
+
+    def write_report(self, path):
+        """Grava o relatório JSON e o devolve"""
+        report = self.report()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as reportfile:
+            json.dump(report, reportfile, indent=2, ensure_ascii=False)
+        return report
+
+    def print_summary(self, report=None):
+        """Exibe os principais percentis"""
+        report = report or self.report()
+        phases = report['requisicoes']['fases']
+        print("⏱️  Tempos (p50 / p95 / p99, ms):")
+        for phase in REQUEST_PHASES:
+            stats = phases[phase]
+            if stats['n']:
+                print(f"   {phase:<9} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f}"
+                      f"  ({stats['n']} medições)")
+        parse = report['parse']
+        if parse['n']:
+            print(f"   {'parse':<9} {parse['p50_ms']:>9.1f} {parse['p95_ms']:>9.1f} {parse['p99_ms']:>9.1f}"
+                  f"  ({parse['n']} páginas)")
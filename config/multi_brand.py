@@ -0,0 +1,118 @@
+import argparse
+import csv
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Permite executar como script (python config/multi_brand.py) ou importar como módulo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.brands import brand_file_prefix
+from config.http_cache import get_shared_cache
+from config.http_session import get_shared_session
+from config.page_archive import PageArchive
+from config.pipeline import CollectionPipeline
+from config.rate_limiter import AdaptiveRateLimiter
+from config.scraper import BrandFatSecretScraper, add_scraper_arguments
+from config.store import ProductStore
+
+def run_brand(brand, session, rate_limiter, cache, archive, max_workers=8, prefetch_window=1,
+              incremental=False, max_age_days=7, parquet_dir=None, store=None, max_concurrency=0):
+    """Descoberta de URLs + scraping de uma marca, usando os recursos compartilhados"""
+    pipeline = CollectionPipeline(brand, max_workers=max_workers, prefetch_window=prefetch_window,
+                                  use_cache=cache is not None, session=session, cache=cache,
+                                  rate_limiter=rate_limiter, archive=archive, parquet_dir=parquet_dir,
+                                  store=store, max_concurrency=max_concurrency)
+    pipeline.run(incremental=incremental, max_age_days=max_age_days)
+    return pipeline.scraper.output_file
+
+def combine_csv(input_files, output_file):
+    """Junta os CSVs das marcas em um único arquivo (a coluna 'marca' identifica a origem)"""
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    total = 0
+    tmp_file = f"{output_file}.tmp"
+    with open(tmp_file, 'w', newline='', encoding='utf-8') as outfile:
+        writer = csv.DictWriter(outfile, fieldnames=BrandFatSecretScraper.FIELDNAMES, extrasaction='ignore')
+        writer.writeheader()
+        for input_file in input_files:
+            if not os.path.exists(input_file):
+                continue
+            with open(input_file, 'r', newline='', encoding='utf-8') as infile:
+                for row in csv.DictReader(infile):
+                    writer.writerow(row)
+                    total += 1
+    os.replace(tmp_file, output_file)
+    print(f"💾 {total} produtos de {len(input_files)} marcas salvos em: {output_file}")
+    return total
+
+def collect_brands(brands, max_workers=8, requests_per_second=4.0, prefetch_window=1,
+                   combined_output=None, use_cache=True, incremental=False, max_age_days=7, parquet_dir=None,
+                   store_file=None, max_concurrency=0):
+    """Coleta várias marcas em paralelo, com uma única sessão HTTP e um único orçamento de requisições"""
+    # Marcas que gerariam os mesmos arquivos de saída (ex: "Vitao" e "vitao") são coletadas uma vez
+    unique = {}
+    for brand in brands:
+        unique.setdefault(brand_file_prefix(brand), brand)
+    brands = list(unique.values())
+
+    print(f"🌐 Coletando {len(brands)} marcas: {', '.join(brands)}")
+    print(f"⚙️  {max_workers} workers por marca, {requests_per_second} requisições/s iniciais no total")
+
+    # Recursos compartilhados: o limite de requisições vale para todas as marcas somadas
+    rate_limiter = AdaptiveRateLimiter(requests_per_second)
+    session = get_shared_session(pool_size=max(16, max_workers * len(brands)))
+    cache = get_shared_cache() if use_cache else None
+    archive = PageArchive()
+    # Um único banco para todas as marcas (a coluna marca separa os produtos)
+    store = ProductStore(store_file) if store_file else None
+
+    outputs = {}
+    with ThreadPoolExecutor(max_workers=len(brands)) as executor:
+        futures = {
+            executor.submit(run_brand, brand, session, rate_limiter, cache, archive, max_workers,
+                            prefetch_window, incremental, max_age_days, parquet_dir, store, max_concurrency): brand
+            for brand in brands
+        }
+        for future in as_completed(futures):
+            brand = futures[future]
+            try:
+                outputs[brand] = future.result()
+                print(f"✅ Marca {brand} concluída: {outputs[brand]}")
+            except Exception as e:
+                print(f"❌ Erro ao coletar a marca {brand}: {e}")
+
+    if combined_output:
+        combine_csv([outputs[brand] for brand in brands if brand in outputs], combined_output)
+
+    if store is not None:
+        store.close()
+    session.print_stats()
+    rate_limiter.print_stats()
+    return outputs
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Coleta de várias marcas do FatSecret em um único processo")
+    parser.add_argument("marcas", nargs="+", help="Marcas a coletar (ex: Vitao \"Mãe Terra\")")
+    parser.add_argument("--workers", type=int, default=8, help="Downloads simultâneos por marca")
+    parser.add_argument("--rps", type=float, default=4.0, help="Requisições por segundo iniciais (todas as marcas, ajustada conforme as respostas)")
+    parser.add_argument("--janela", type=int, default=1, help="Páginas de busca baixadas em paralelo por vez")
+    parser.add_argument("--combinado", help="CSV único com todas as marcas (ex: dados/marcas_nutricional.csv)")
+    parser.add_argument("--sem-cache", action="store_true", help="Ignora o cache em disco das páginas")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Coleta apenas URLs novas, com falha ou desatualizadas")
+    parser.add_argument("--max-idade-dias", type=float, default=7,
+                        help="Idade máxima (em dias) de um produto no modo incremental")
+    add_scraper_arguments(parser, variants=False)
+    parser.add_argument("--assincrono", type=int, nargs="?", const=100, default=0, metavar="CONCORRENCIA",
+                        help="Baixa os produtos em asyncio com até N requisições em voo por marca (requer aiohttp)")
+    args = parser.parse_args()
+
+    collect_brands(args.marcas, max_workers=args.workers, requests_per_second=args.rps,
+                   prefetch_window=args.janela, combined_output=args.combinado,
+                   use_cache=not args.sem_cache, incremental=args.incremental,
+                   max_age_days=args.max_idade_dias, parquet_dir=args.parquet,
+                   store_file=args.sqlite, max_concurrency=args.assincrono)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import argparse
+import glob
+import os
+import sys
+from urllib.parse import unquote
+
+import numpy as np
+import pandas as pd
+
+# Permite executar como script (python config/normalize.py) ou importar como módulo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.columnar import HAS_PYARROW, add_parquet_argument, load_parquet
+from config.nutrients import NUTRIENT_TABLE
+from config.servings import SLUG_PATTERN, resolve_measure
+
+NORMALIZED_FILE = "dados/nutricao_normalizada.parquet"
+NUTRIENT_FIELDS = [spec.field for spec in NUTRIENT_TABLE.values()]
+# Colunas textuais com poucos valores distintos (guardadas como Categorical)
+CATEGORY_FIELDS = ['categoria', 'marca', 'medida', 'unidade_base']
+
+def parse_slugs(slugs):
+    """Quantidade, medida e equivalente em g/ml de cada slug de porção (ex: "1-1-2-colher-de-sopa")"""
+    parts = slugs.map(unquote).str.extract(SLUG_PATTERN)
+    whole = pd.to_numeric(parts['inteiro'], errors='coerce').fillna(0.0)
+    numerator = pd.to_numeric(parts['numerador'].str.replace(',', '.', regex=False), errors='coerce')
+    denominator = pd.to_numeric(parts['denominador'], errors='coerce').fillna(1.0)
+    measure_text = parts['medida'].str.replace('-', ' ', regex=False).str.strip().str.lower()
+
+    # Mesma tabela de medidas do parser de porções (config/servings.py)
+    measures = pd.DataFrame([resolve_measure(text) for text in measure_text.fillna('')],
+                            columns=['medida', 'equivalente', 'unidade_base', 'exata'], index=slugs.index)
+    return pd.DataFrame({
+        'quantidade': whole + numerator / denominator,
+        'medida': measures['medida'].where(measure_text.notna()),
+        'equivalente': pd.to_numeric(measures['equivalente']),
+        'unidade_base': measures['unidade_base'].replace('', 'g'),
+        'exata': measures['exata'],
+    }, index=slugs.index)
+
+def serving_slugs(urls):
+    """Medida e quantidade da porção a partir do último segmento das URLs"""
+    if HAS_PYARROW:
+        # Strings no Arrow: a extração do slug roda em C++ e não em um laço Python por linha
+        urls = urls.astype('string[pyarrow]')
+    slugs = urls.str.replace(r'^.*/', '', regex=True)
+    # Poucos slugs distintos (dezenas) para centenas de milhares de URLs: o parse é feito só nos
+    # distintos e espalhado pelas linhas com take
+    codes, uniques = pd.factorize(slugs)
+    parsed = parse_slugs(pd.Series(np.asarray(uniques, dtype=object)))
+    # Código -1 (URL ausente) cai na linha extra, toda vazia
+    parsed = pd.concat([parsed, parsed.iloc[:0].reindex([len(parsed)])])
+    codes = np.where(codes < 0, len(uniques), codes)
+    result = parsed.iloc[codes].reset_index(drop=True)
+    result.index = urls.index
+    return result
+
+def normalize(frame):
+    """Acrescenta colunas por 100 g/ml e razões derivadas (operações vetorizadas por coluna)"""
+    frame = frame.copy()
+    for name in ['porcao'] + NUTRIENT_FIELDS:
+        frame[name] = pd.to_numeric(frame[name], errors='coerce').astype('float64')
+
+    servings = serving_slugs(frame['url'].astype('string'))
+    # Unidade lida da página pelo parser de porções (CSVs antigos não têm a coluna)
+    page_unit = frame['unidade_porcao'] if 'unidade_porcao' in frame else pd.Series(np.nan, index=frame.index)
+    known_unit = page_unit.isin(['g', 'ml']).to_numpy()
+    portion = frame['porcao'].to_numpy()
+    quantity = servings['quantidade'].to_numpy()
+    equivalent = servings['equivalente'].to_numpy()
+    # Sem o equivalente em g/ml na página, "porcao" guarda só a quantidade (ex: "1 colher de sopa" -> 1):
+    # nesse caso a base vem da medida caseira
+    from_measure = (~known_unit & ~np.isnan(equivalent) & ~np.isnan(quantity)
+                    & ((portion <= quantity) | np.isnan(portion)))
+    base = np.where(from_measure, quantity * equivalent, portion)
+    # Sem a unidade da página, "porcao" é o número em g lido do texto ("1/2 xícara (45 g)" -> 45): só é ml
+    # quando o slug diz ml/l ("200-ml") ou quando a base veio da própria medida caseira ("1 xícara" -> 240 ml)
+    slug_unit = (servings['exata'].eq(True).to_numpy() & servings['unidade_base'].eq('ml').to_numpy()) | from_measure
+    inferred_unit = servings['unidade_base'].where(slug_unit, 'g')
+    servings['unidade_base'] = page_unit.where(known_unit, inferred_unit)
+    base = np.where(base > 0, base, np.nan)
+
+    frame['medida'] = servings['medida']
+    frame['quantidade_medida'] = servings['quantidade']
+    frame['unidade_base'] = servings['unidade_base']
+    frame['porcao_base'] = base
+    factor = 100.0 / base
+    for name in NUTRIENT_FIELDS:
+        frame[f'{name}_100'] = frame[name].to_numpy() * factor
+
+    calories = frame['calorias'].to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        frame['kcal_por_grama'] = calories / base
+        # Gramas de proteína a cada 100 kcal (densidade proteica)
+        frame['proteina_por_100kcal'] = np.where(calories > 0, frame['proteinas'].to_numpy() * 100.0 / calories,
+                                                 np.nan)
+        # Fração das calorias que vem da proteína (4 kcal/g)
+        frame['fracao_kcal_proteina'] = np.where(calories > 0, frame['proteinas'].to_numpy() * 4.0 / calories,
+                                                 np.nan)
+    for name in CATEGORY_FIELDS:
+        if name in frame:
+            frame[name] = frame[name].astype('category')
+    return frame
+
+def load_rows(paths=None, parquet_dir=None):
+    """Tabela de produtos a partir dos CSVs do scraper ou do dataset Parquet (coleta mais recente de cada URL)"""
+    if parquet_dir:
+        return load_parquet(parquet_dir)
+    paths = paths or sorted(glob.glob("dados/*_nutricional.csv"))
+    frames = [pd.read_csv(path, dtype={'url': 'string', 'nome_produto': 'string'}) for path in paths]
+    if not frames:
+        return pd.DataFrame(columns=['nome_produto', 'url', 'porcao'] + NUTRIENT_FIELDS)
+    frame = pd.concat(frames, ignore_index=True)
+    # A mesma URL pode estar em mais de um CSV (ex: combinado de várias marcas): fica a coleta mais recente
+    if 'data_coleta' in frame:
+        frame = frame.sort_values('data_coleta', kind='stable')
+    return frame.drop_duplicates('url', keep='last').reset_index(drop=True)
+
+def save_normalized(frame, path=NORMALIZED_FILE):
+    """Grava a tabela normalizada em Parquet (tipos preservados) ou CSV, conforme a extensão"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if path.endswith('.parquet'):
+        if not HAS_PYARROW:
+            raise RuntimeError("pyarrow não está instalado (pip install pyarrow)")
+        frame.to_parquet(path, index=False)
+    else:
+        frame.to_csv(path, index=False)
+    return path
+
+def load_normalized(path=NORMALIZED_FILE):
+    """Lê a tabela normalizada de volta com os mesmos tipos"""
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    frame = pd.read_csv(path, dtype={'url': 'string', 'nome_produto': 'string'})
+    for name in CATEGORY_FIELDS:
+        if name in frame:
+            frame[name] = frame[name].astype('category')
+    return frame
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Normaliza os dados nutricionais por 100 g/ml")
+    parser.add_argument("csv", nargs="*", help="CSVs de entrada (padrão: dados/*_nutricional.csv)")
+    add_parquet_argument(parser, help="Lê do dataset Parquet em vez dos CSVs")
+    parser.add_argument("--saida", default=NORMALIZED_FILE,
+                        help=f"Arquivo de saída, .parquet ou .csv (padrão: {NORMALIZED_FILE})")
+    args = parser.parse_args()
+
+    if args.saida.endswith('.parquet') and not HAS_PYARROW:
+        print("❌ pyarrow não está instalado (pip install pyarrow); use --saida com extensão .csv")
+        sys.exit(1)
+
+    frame = normalize(load_rows(args.csv, args.parquet))
+    save_normalized(frame, args.saida)
+    missing = int(frame['porcao_base'].isna().sum())
+    print(f"💾 {len(frame)} produtos normalizados salvos em: {args.saida}")
+    if missing:
+        print(f"⚠️  {missing} produtos sem porção em g/ml (colunas por 100 ficam vazias)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import re
+
+# Regexes pré-compiladas usadas pelos parsers de valores
+INTEGER_RE = re.compile(r'\d+')
+DECIMAL_RE = re.compile(r'[\d,]+')
+
+def parse_int(text):
+    """Primeiro número inteiro do texto (ex: "57 kcal" -> 57)"""
+    match = INTEGER_RE.search(text)
+    return int(match.group()) if match else None
+
+def parse_decimal(text):
+    """Primeiro número decimal com vírgula do texto (ex: "1,8g" -> 1.8)"""
+    match = DECIMAL_RE.search(text)
+    if not match:
+        return None
+    try:
+        return float(match.group().replace(',', '.'))
+    except ValueError:
+        return None
+
+class NutrientField:
+    """Como extrair um campo a partir do rótulo da tabela nutricional"""
+
+    def __init__(self, field, parser, default, lookahead=1, unit=None):
+        self.field = field
+        self.parser = parser
+        self.default = default
+        # Quantas linhas após o rótulo podem conter o valor
+        self.lookahead = lookahead
+        # Texto que a linha do valor precisa conter (ex: "kcal" na linha de Energia)
+        self.unit = unit
+
+# Rótulo do FatSecret -> campo do CSV. Para incluir um nutriente basta adicionar
+# uma entrada aqui (e a coluna correspondente em BrandFatSecretScraper.FIELDNAMES)
+NUTRIENT_TABLE = {
+    "Energia": NutrientField('calorias', parse_int, 0, lookahead=3, unit="kcal"),
+    "Carboidratos": NutrientField('carboidratos', parse_decimal, 0.0),
+    "Proteínas": NutrientField('proteinas', parse_decimal, 0.0),
+    "Gorduras": NutrientField('gorduras_totais', parse_decimal, 0.0),
+    "Gordura Saturada": NutrientField('gorduras_saturadas', parse_decimal, 0.0),
+    "Fibras": NutrientField('fibras', parse_decimal, 0.0),
+    "Açúcar": NutrientField('acucares', parse_decimal, 0.0),
+    "Sódio": NutrientField('sodio', parse_int, 0),
+}
+
+def default_values():
+    """Valores padrão (nutriente ausente = 0)"""
+    return {spec.field: spec.default for spec in NUTRIENT_TABLE.values()}
+
+def extract_nutrients(texts):
+    """Extrai os nutrientes em uma única passada pelos textos das linhas da tabela"""
+    data = default_values()
+    for i, text in enumerate(texts):
+        spec = NUTRIENT_TABLE.get(text)
+        if spec is None:
+            continue
+        for value_text in texts[i + 1:i + 1 + spec.lookahead]:
+            if spec.unit and spec.unit not in value_text:
+                continue
+            value = spec.parser(value_text)
+            if value is not None:
+                data[spec.field] = value
+                break
+    return data
@@ -0,0 +1,82 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+def blob_path(archive_dir, sha256):
+    """Caminho do blob gzip de um conteúdo (subpastas pelos 2 primeiros caracteres do hash)"""
+    return os.path.join(archive_dir, "blobs", sha256[:2], f"{sha256}.html.gz")
+
+def read_blob(archive_dir, sha256):
+    """Lê o HTML de um blob (função de módulo para uso em outros processos)"""
+    with gzip.open(blob_path(archive_dir, sha256), 'rb') as blob:
+        return blob.read().decode('utf-8')
+
+class PageArchive:
+    """Arquivo permanente das páginas de produto: blobs gzip endereçados por conteúdo + índice JSONL"""
+
+    def __init__(self, archive_dir="dados/arquivo_html"):
+        self.archive_dir = archive_dir
+        self.blobs_dir = os.path.join(archive_dir, "blobs")
+        self.index_file = os.path.join(archive_dir, "index.jsonl")
+        self._lock = threading.Lock()
+        # Última versão arquivada de cada URL (em ordem da primeira vez em que foi vista)
+        self._latest = {}
+        os.makedirs(self.blobs_dir, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        if not os.path.exists(self.index_file):
+            return
+        with open(self.index_file, 'r', encoding='utf-8') as indexfile:
+            for line in indexfile:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Última linha escrita pela metade numa execução interrompida
+                    continue
+                self._latest[entry['url']] = entry
+
+    def add(self, url, content, fetched_at=None, brand=None):
+        """Arquiva a página; conteúdos idênticos são gravados uma única vez"""
+        data = content.encode('utf-8')
+        sha256 = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            previous = self._latest.get(url)
+            if previous and previous['sha256'] == sha256:
+                return previous
+
+        path = blob_path(self.archive_dir, sha256)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp{threading.get_ident()}"
+            with gzip.open(tmp_path, 'wb', compresslevel=6) as blob:
+                blob.write(data)
+            os.replace(tmp_path, path)
+
+        entry = {
+            'url': url,
+            'sha256': sha256,
+            'bytes': len(data),
+            'data_coleta': fetched_at or datetime.now().isoformat(timespec='seconds'),
+            'marca': brand,
+        }
+        with self._lock:
+            with open(self.index_file, 'a', encoding='utf-8') as indexfile:
+                indexfile.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._latest[url] = entry
+        return entry
+
+    def read(self, sha256):
+        """Lê o HTML de um blob"""
+        return read_blob(self.archive_dir, sha256)
+
+    def entries(self):
+        """Entradas do índice com a versão mais recente de cada URL"""
+        with self._lock:
+            return list(self._latest.values())
+
+    def __len__(self):
+        return len(self._latest)
@@ -0,0 +1,149 @@
+import hashlib
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# O lxml (em requirements.txt) faz o parse em C; sem ele cai para o parser nativo + SoupStrainer
+try:
+    import lxml.html
+    from lxml import etree
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+class TargetStrainer(SoupStrainer):
+    """SoupStrainer que só constrói as subárvores (tag, classe) usadas pelos extratores"""
+
+    def __init__(self, targets):
+        # As regras de nome fazem o BeautifulSoup descartar o texto fora das subárvores
+        super().__init__(name=sorted({tag for tag, _ in targets}))
+        self.targets = targets
+
+    def is_target(self, name, attrs):
+        """Indica se a tag é a raiz de uma subárvore de interesse"""
+        classes = (attrs or {}).get('class') or []
+        if isinstance(classes, str):
+            classes = classes.split()
+        return any(name == tag and (css_class is None or css_class in classes)
+                   for tag, css_class in self.targets)
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        # beautifulsoup4 >= 4.13
+        return self.is_target(name, attrs)
+
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        # beautifulsoup4 < 4.13
+        if isinstance(markup_name, str) and self.is_target(markup_name, markup_attrs):
+            return markup_name
+        return None
+
+def parse_document(content):
+    """Árvore lxml da página inteira, para ser compartilhada entre parsers (None sem lxml ou se falhar)"""
+    if not HAS_LXML:
+        return None
+    try:
+        return lxml.html.document_fromstring(content)
+    except (etree.ParserError, ValueError):
+        return None
+
+class TargetParser:
+    """Faz o parse apenas das subárvores (tag, classe) lidas pelos extratores"""
+
+    def __init__(self, targets):
+        self.targets = targets
+        self.strainer = TargetStrainer(targets)
+        if HAS_LXML:
+            self.xpath = etree.XPath(" | ".join(self._target_xpath(tag, css_class)
+                                                 for tag, css_class in targets))
+
+    def _target_xpath(self, tag, css_class):
+        if css_class is None:
+            return f"//{tag}"
+        return f"//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {css_class} ')]"
+
+    def select(self, content, root=None):
+        """Elementos lxml das subárvores de interesse (ou None se o lxml não puder ser usado)"""
+        if root is None:
+            root = parse_document(content)
+            if root is None:
+                return None
+
+        selected = self.xpath(root)
+        selected_set = set(selected)
+        # Mantém só as subárvores mais externas (ex.: serving_size_value dentro de nutrition_facts)
+        return [element for element in selected
+                if not any(ancestor in selected_set for ancestor in element.iterancestors())]
+
+    def parse(self, content, root=None):
+        """Retorna um BeautifulSoup contendo só as subárvores de interesse (root: árvore lxml já montada)"""
+        # O lxml monta a árvore inteira em C e o XPath localiza os alvos; o BeautifulSoup
+        # só constrói objetos Python para o fragmento selecionado
+        selected = self.select(content, root)
+        if selected is None:
+            return BeautifulSoup(content, 'html.parser', parse_only=self.strainer)
+        fragment = "".join(etree.tostring(element, encoding='unicode', with_tail=False) for element in selected)
+        return BeautifulSoup(fragment, 'html.parser')
+
+    def texts(self, content, root=None):
+        """Textos das subárvores de interesse, na ordem do documento e sem espaços extras"""
+        selected = self.select(content, root)
+        if selected is None:
+            strings = self.parse(content).find_all(string=True)
+        else:
+            # with_tail=False: o texto depois da subárvore não faz parte dela
+            strings = [text for element in selected
+                       for text in element.itertext(with_tail=False)]
+        return [text for text in (" ".join(string.split()) for string in strings) if text]
+
+# Elementos lidos por extract_product_name, extract_portion e extract_nutritional_data
+PRODUCT_TARGETS = [
+    ('h2', 'manufacturer'),
+    ('h1', None),
+    ('div', 'serving_size_value'),
+    ('div', 'nutrition_facts'),
+]
+
+# Elementos lidos por extract_urls_from_page e check_no_results
+SEARCH_TARGETS = [
+    ('a', 'prominent'),
+    ('div', 'searchNoResult'),
+]
+
+# Elementos cobertos pela impressão digital (tabela nutricional + porção)
+FINGERPRINT_TARGETS = [
+    ('div', 'serving_size_value'),
+    ('div', 'nutrition_facts'),
+]
+
+# Versão dos extratores: incrementada quando a mesma página passa a gerar valores diferentes
+# (ex: porção com decimais), para que as linhas antigas não sejam reaproveitadas
+EXTRACTOR_VERSION = 2
+
+PRODUCT_PARSER = TargetParser(PRODUCT_TARGETS)
+SEARCH_PARSER = TargetParser(SEARCH_TARGETS)
+FINGERPRINT_PARSER = TargetParser(FINGERPRINT_TARGETS)
+# Todos os links da página (porções do produto, listagens da marca)
+LINK_PARSER = TargetParser([('a', None)])
+
+def parse_product_page(content, root=None):
+    """Faz o parse apenas das partes da página de produto usadas pelos extratores"""
+    return PRODUCT_PARSER.parse(content, root)
+
+def parse_search_page(content):
+    """Faz o parse apenas dos links de produto e do aviso de 'sem resultados' da busca"""
+    return SEARCH_PARSER.parse(content)
+
+def page_links(content, root=None):
+    """[(texto, href)] de todos os links da página, na ordem do documento"""
+    elements = LINK_PARSER.select(content, root)
+    if elements is None:
+        return [(a.get_text(" ", strip=True), a.get('href')) for a in LINK_PARSER.parse(content).find_all('a')]
+    return [(" ".join(a.text_content().split()), a.get('href')) for a in elements]
+
+def nutrition_fingerprint(content, root=None):
+    """Hash estável dos textos da tabela nutricional + porção; '' se a página não tem tabela"""
+    # Só o texto entra no hash: atributos e espaços do HTML mudam sem que os valores mudem
+    texts = FINGERPRINT_PARSER.texts(content, root)
+    if not texts:
+        return ''
+    texts.insert(0, f"v{EXTRACTOR_VERSION}")
+    return hashlib.blake2b("\x1f".join(texts).encode('utf-8'), digest_size=16).hexdigest()
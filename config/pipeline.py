@@ -0,0 +1,138 @@
+import argparse
+import os
+import queue
+import sys
+import threading
+
+# Permite executar como script (python config/pipeline.py) ou importar como módulo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.async_scraper import AsyncBrandScraper
+from config.http_cache import get_shared_cache
+from config.http_session import get_shared_session
+from config.metrics import RunMetrics
+from config.rate_limiter import AdaptiveRateLimiter
+from config.scraper import BrandFatSecretScraper, add_scraper_arguments
+from config.store import ProductStore
+from config.url_collector import BrandUrlCollector, add_discovery_arguments, frontier_from_args, sources_from_args
+
+# Marca o fim da fila de URLs
+_DONE = object()
+
+class CollectionPipeline:
+    """Coleta de URLs e scraping encadeados no mesmo processo, com sessão e limite de requisições comuns"""
+
+    def __init__(self, brand="Vitao", max_workers=8, requests_per_second=4.0, prefetch_window=1,
+                 use_cache=True, parse_processes=0, use_archive=True, session=None, cache=None,
+                 rate_limiter=None, archive=None, parquet_dir=None, store=None,
+                 max_concurrency=0, expand_servings=False, frontier=None, sources=None):
+        self.brand = brand
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter(requests_per_second)
+        self.session = session or get_shared_session(pool_size=max(16, max_workers))
+        self.cache = (cache or get_shared_cache()) if use_cache else None
+        # Um único registro de tempos: o relatório final inclui as páginas de busca e as de produto
+        self.metrics = RunMetrics()
+        self.collector = BrandUrlCollector(brand, session=self.session, cache=self.cache,
+                                           use_cache=use_cache, prefetch_window=prefetch_window,
+                                           rate_limiter=self.rate_limiter, metrics=self.metrics, store=store,
+                                           frontier=frontier, sources=sources)
+        options = dict(max_workers=max_workers, rate_limiter=self.rate_limiter, session=self.session,
+                       cache=self.cache, use_cache=use_cache, parse_processes=parse_processes, archive=archive,
+                       use_archive=use_archive, metrics=self.metrics, parquet_dir=parquet_dir, store=store,
+                       expand_servings=expand_servings)
+        # max_concurrency > 0: páginas de produto baixadas em asyncio (requer aiohttp)
+        if max_concurrency:
+            self.scraper = AsyncBrandScraper(brand, max_concurrency=max_concurrency, **options)
+        else:
+            self.scraper = BrandFatSecretScraper(brand, **options)
+        self.scraper.urls_file = self.collector.output_file
+
+    def collect_urls(self):
+        """Somente a coleta de URLs (grava o JSON de URLs)"""
+        return self.collector.run()
+
+    def scrape(self, incremental=False, max_age_days=7):
+        """Somente o scraping, a partir do JSON de URLs já coletado"""
+        return self.scraper.run(incremental=incremental, max_age_days=max_age_days)
+
+    def stream_urls(self):
+        """URLs entregues ao scraper à medida que a paginação da busca as encontra"""
+        urls = queue.Queue()
+        stop = threading.Event()
+        errors = []
+
+        def produce():
+            # A paginação roda em uma thread própria para não bloquear a gravação dos produtos
+            try:
+                for url in self.collector.iter_urls():
+                    if stop.is_set():
+                        break
+                    urls.put(url)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                urls.put(_DONE)
+
+        producer = threading.Thread(target=produce, name="coleta-urls", daemon=True)
+        producer.start()
+        try:
+            while True:
+                url = urls.get()
+                if url is _DONE:
+                    break
+                yield url
+        finally:
+            stop.set()
+
+        producer.join()
+        if errors:
+            raise errors[0]
+        if self.collector.urls_found:
+            self.collector.save_urls_to_json()
+
+    def run(self, incremental=False, max_age_days=7):
+        """Coleta completa: o scraping começa enquanto a busca ainda está paginando"""
+        print(f"⚡ Coleta encadeada da {self.brand}: URLs seguem direto para o scraper")
+        return self.scraper.run(incremental=incremental, max_age_days=max_age_days, urls=self.stream_urls(),
+                                urls_complete=lambda: self.collector.complete)
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Coleta de URLs + dados nutricionais em um único processo")
+    parser.add_argument("--marca", default="Vitao", help="Marca a coletar (padrão: Vitao)")
+    parser.add_argument("--workers", type=int, default=8, help="Número de downloads simultâneos")
+    parser.add_argument("--rps", type=float, default=4.0, help="Requisições por segundo iniciais (global, ajustada conforme as respostas)")
+    parser.add_argument("--janela", type=int, default=1, help="Páginas de busca baixadas em paralelo por vez")
+    parser.add_argument("--sem-cache", action="store_true", help="Ignora o cache em disco das páginas")
+    parser.add_argument("--processos", type=int, default=0,
+                        help="Processos dedicados ao parse (0 = parse nas threads de download)")
+    parser.add_argument("--sem-arquivo", action="store_true",
+                        help="Não guarda o HTML bruto em dados/arquivo_html/")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Coleta apenas URLs novas, com falha ou desatualizadas")
+    parser.add_argument("--max-idade-dias", type=float, default=7,
+                        help="Idade máxima (em dias) de um produto no modo incremental")
+    parser.add_argument("--assincrono", type=int, nargs="?", const=100, default=0, metavar="CONCORRENCIA",
+                        help="Baixa os produtos em asyncio com até N requisições em voo (padrão: 100; requer aiohttp)")
+    add_scraper_arguments(parser)
+    add_discovery_arguments(parser)
+    args = parser.parse_args()
+
+    sources = sources_from_args(parser, args)
+    store = ProductStore(args.sqlite) if args.sqlite else None
+    frontier = frontier_from_args(args)
+    pipeline = CollectionPipeline(args.marca, max_workers=args.workers, requests_per_second=args.rps,
+                                  prefetch_window=args.janela, use_cache=not args.sem_cache,
+                                  parse_processes=args.processos, use_archive=not args.sem_arquivo,
+                                  parquet_dir=args.parquet, store=store, max_concurrency=args.assincrono,
+                                  expand_servings=args.variantes, frontier=frontier,
+                                  sources=sources)
+    try:
+        pipeline.run(incremental=args.incremental, max_age_days=args.max_idade_dias)
+    finally:
+        frontier.close()
+        if store is not None:
+            store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# Respostas que indicam sobrecarga/bloqueio do servidor: recuar e tentar de novo
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+def parse_retry_after(value, max_delay=300.0):
+    """Segundos indicados pelo cabeçalho Retry-After (número de segundos ou data HTTP)"""
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            delay = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(max(delay, 0.0), max_delay)
+
+def backoff_delay(attempt, base=1.0, cap=60.0):
+    """Espera exponencial com jitter para a tentativa N (1, 2, 4, 8... segundos, até cap)"""
+    delay = min(cap, base * 2 ** attempt)
+    # Jitter: metade fixa + metade aleatória, para as threads não voltarem todas juntas
+    return delay / 2 + random.uniform(0, delay / 2)
+
+def retry_delay(rate_limiter, attempt, status=None, retry_after=None):
+    """Registra a falha no limitador e devolve quanto só esta requisição deve esperar (sem status: timeout)"""
+    retry_after = parse_retry_after(retry_after)
+    throttled = status is not None and (status == 429 or retry_after is not None)
+
+    if throttled and rate_limiter:
+        # Bloqueio explícito: a pausa vale para todas as threads que usam o limitador
+        rate_limiter.on_throttle(retry_after if retry_after is not None else backoff_delay(attempt))
+        return 0.0
+    if rate_limiter:
+        rate_limiter.on_error()
+    # Erro esporádico: só esta requisição recua (exponencial com jitter)
+    return retry_after if retry_after is not None else backoff_delay(attempt)
+
+class RateLimiter:
+    """Limita a taxa global de requisições, compartilhada entre todas as threads"""
+
+    def __init__(self, requests_per_second=4.0):
+        self.requests_per_second = requests_per_second
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+        self.throttles = 0
+        self.errors = 0
+
+    def reserve(self):
+        """Reserva o próximo horário livre e devolve quantos segundos faltam até ele"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        return slot - now
+
+    def wait(self):
+        """Bloqueia até o próximo horário livre do orçamento de requisições"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def on_success(self, elapsed):
+        """Resposta 2xx/304 recebida em elapsed segundos (a taxa fixa não muda)"""
+
+    def on_throttle(self, delay):
+        """429/Retry-After: nenhuma thread faz requisições pelos próximos delay segundos"""
+        with self._lock:
+            self.throttles += 1
+            self._next_slot = max(self._next_slot, time.monotonic() + delay)
+
+    def on_error(self):
+        """5xx/timeout (a thread que falhou faz o próprio backoff)"""
+        with self._lock:
+            self.errors += 1
+
+    def get_stats(self):
+        """Taxa atual e quantas vezes o servidor pediu para desacelerar"""
+        return {
+            'requisicoes_por_segundo': self.requests_per_second,
+            'bloqueios': self.throttles,
+            'erros': self.errors,
+        }
+
+    def print_stats(self):
+        """Exibe a taxa final e quantas vezes houve recuo"""
+        stats = self.get_stats()
+        print(f"🚦 Taxa final: {stats['requisicoes_por_segundo']:.2f} requisições/s, "
+              f"{stats['bloqueios']} bloqueios (429), {stats['erros']} erros (5xx/timeout)")
+
+class AdaptiveRateLimiter(RateLimiter):
+    """Token bucket com taxa adaptativa: acelera enquanto o site responde bem, recua ao ser limitado"""
+
+    def __init__(self, requests_per_second=4.0, min_requests_per_second=None, max_requests_per_second=None,
+                 burst=2.0, increase_step=0.5, decrease_factor=0.5, error_factor=0.9, slow_response=2.0):
+        super().__init__(requests_per_second)
+        self.min_requests_per_second = min_requests_per_second or max(0.1, requests_per_second / 8)
+        self.max_requests_per_second = max_requests_per_second or requests_per_second * 4
+        # Quantas requisições podem sair de uma vez após um período ocioso
+        self.burst = max(1.0, burst)
+        # Aumento aditivo (requisições/s ganhas por segundo sem erros); redução multiplicativa por bloqueio (AIMD)
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        # Erros esporádicos (5xx/timeout) reduzem a taxa de leve; bloqueios explícitos, pela metade
+        self.error_factor = error_factor
+        # Respostas mais lentas que isso não aumentam a taxa
+        self.slow_response = slow_response
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._last_decrease = float('-inf')
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.requests_per_second)
+            self._updated = now
+
+    def _set_rate(self, requests_per_second):
+        self.requests_per_second = min(self.max_requests_per_second,
+                                       max(self.min_requests_per_second, requests_per_second))
+        self.interval = 1.0 / self.requests_per_second
+
+    def reserve(self):
+        """Reserva uma ficha do balde e devolve quantos segundos faltam até ela estar disponível"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            # _updated fica no futuro enquanto o site pede pausa (Retry-After/backoff)
+            return max(0.0, self._updated - now) + max(0.0, -self._tokens) / self.requests_per_second
+
+    def on_success(self, elapsed):
+        """Resposta rápida: aumenta a taxa um pouco"""
+        if elapsed >= self.slow_response:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            # increase_step / taxa por resposta = increase_step por segundo de tráfego saudável
+            self._set_rate(self.requests_per_second + self.increase_step / self.requests_per_second)
+
+    def _decrease(self, now, factor, window):
+        # Várias falhas da mesma rajada de requisições contam como uma única redução
+        if now - self._last_decrease >= window:
+            self._set_rate(self.requests_per_second * factor)
+            self._last_decrease = now
+
+    def on_throttle(self, delay):
+        """429/Retry-After: pausa todas as threads por delay segundos e reduz a taxa pela metade"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.throttles += 1
+            self._decrease(now, self.decrease_factor, max(delay, self.interval))
+            # Nenhuma ficha acumula durante a pausa: a retomada não vira uma rajada
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = max(self._updated, now + delay)
+
+    def on_error(self):
+        """5xx/timeout: reduz a taxa levemente"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.errors += 1
+            self._decrease(now, self.error_factor, 1.0)
@@ -0,0 +1,95 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Permite executar como script (python config/reparse.py) ou importar como módulo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.brands import brand_file_prefix
+from config.page_archive import PageArchive, read_blob
+from config.parsing import nutrition_fingerprint, parse_document
+from config.scraper import BrandFatSecretScraper, parse_product_task
+
+def reparse_task(archive_dir, entry):
+    """Lê o blob e reaplica os extratores (executado nos processos do pool)"""
+    content = read_blob(archive_dir, entry['sha256'])
+    root = parse_document(content)
+    row = parse_product_task(entry['url'], content, entry.get('data_coleta'), entry_brand(entry), root)
+    row['impressao_digital'] = nutrition_fingerprint(content, root)
+    return row
+
+def entry_brand(entry):
+    """Marca da página arquivada (entradas anteriores às várias marcas são todas da Vitao)"""
+    return entry.get('marca') or "Vitao"
+
+def load_url_order(urls_file):
+    """Posição de cada URL na lista coletada (mantém a ordem do CSV original)"""
+    try:
+        with open(urls_file, 'r', encoding='utf-8') as jsonfile:
+            return {url: i for i, url in enumerate(json.load(jsonfile))}
+    except (OSError, ValueError):
+        return {}
+
+def reparse_archive(archive, output_file, processes=0, chunksize=32, urls_file=None, brand=None):
+    """Reaplica os extratores atuais sobre as páginas arquivadas (só as da marca, se informada), sem acesso à rede"""
+    entries = archive.entries()
+    if brand is not None:
+        # O arquivo é compartilhado pelas marcas: cada uma vai para o próprio CSV
+        prefix = brand_file_prefix(brand)
+        entries = [entry for entry in entries if brand_file_prefix(entry_brand(entry)) == prefix]
+    if not entries:
+        print(f"❌ Nenhuma página arquivada em {archive.archive_dir}" + (f" da marca {brand}" if brand else ""))
+        return 0
+
+    # Ordena pela lista de URLs; páginas fora dela ficam no fim, na ordem do arquivo
+    order = load_url_order(urls_file) if urls_file else {}
+    entries.sort(key=lambda entry: order.get(entry['url'], len(order)))
+
+    print(f"♻️  Reprocessando {len(entries)} páginas de {archive.archive_dir}...")
+    start = time.perf_counter()
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    tmp_file = f"{output_file}.tmp"
+
+    with open(tmp_file, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=BrandFatSecretScraper.FIELDNAMES, extrasaction='ignore')
+        writer.writeheader()
+        archive_dirs = [archive.archive_dir] * len(entries)
+
+        if processes:
+            # Cada processo lê o próprio blob do disco: só a URL e o hash trafegam entre processos
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                rows = executor.map(reparse_task, archive_dirs, entries, chunksize=chunksize)
+                writer.writerows(rows)
+        else:
+            writer.writerows(map(reparse_task, archive_dirs, entries))
+
+    os.replace(tmp_file, output_file)
+    elapsed = time.perf_counter() - start
+    print(f"💾 Dados salvos em: {output_file}")
+    print(f"🎉 {len(entries)} páginas reprocessadas em {elapsed:.1f}s "
+          f"({len(entries) / elapsed:.0f} páginas/s)")
+    return len(entries)
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Reprocessa as páginas arquivadas sem acessar o FatSecret")
+    parser.add_argument("--arquivo", default="dados/arquivo_html", help="Diretório do arquivo de páginas")
+    parser.add_argument("--marca", default="Vitao", help="Marca a reprocessar (padrão: Vitao)")
+    parser.add_argument("--urls", help="Lista de URLs que define a ordem do CSV (padrão: dados/<marca>_urls.json)")
+    parser.add_argument("--saida", help="CSV de saída (padrão: dados/<marca>_nutricional.csv)")
+    parser.add_argument("--processos", type=int, default=os.cpu_count() or 1,
+                        help="Processos de parse (0 = no processo principal)")
+    args = parser.parse_args()
+
+    prefix = brand_file_prefix(args.marca)
+    urls_file = args.urls or f"dados/{prefix}_urls.json"
+    output_file = args.saida or f"dados/{prefix}_nutricional.csv"
+    reparse_archive(PageArchive(args.arquivo), output_file, processes=args.processos, urls_file=urls_file,
+                    brand=args.marca)
+
+if __name__ == "__main__":
+    main()
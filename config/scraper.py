@@ -1,27 +1,100 @@
 import requests
-from bs4 import BeautifulSoup
+import argparse
 import csv
-import re
 import os
+import sys
 import json
+import multiprocessing
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from itertools import islice
 from urllib.parse import urljoin
 import time
 
-class VitaoFatSecretScraper:
-    def __init__(self):
-        self.base_url = "https://www.fatsecret.com.br"
+# Permite executar como script (python config/scraper.py) ou importar como módulo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.brands import FATSECRET_URL, brand_file_prefix
+from config.columnar import HAS_PYARROW, add_parquet_argument, write_parquet
+from config.csv_stream import CsvRowIndex, StreamingCsvWriter
+from config.frontier import url_digest
+from config.http_cache import get_shared_cache
+from config.http_session import get_shared_session
+from config.metrics import RunMetrics
+from config.nutrients import default_values, extract_nutrients
+from config.page_archive import PageArchive
+from config.parsing import nutrition_fingerprint, parse_document, parse_product_page
+from config.rate_limiter import AdaptiveRateLimiter
+from config.servings import Serving, parse_serving, portion_value
+from config.variants import derive_variant, serving_links, variant_serving
+from config.store import ProductStore, add_store_argument
+from config.url_collector import load_urls_complete
+
+class BrandFatSecretScraper:
+    """Scraper dos dados nutricionais dos produtos de uma marca no FatSecret"""
+    
+    # Colunas do CSV de saída
+    FIELDNAMES = [
+        'nome_produto', 'url', 'categoria', 'marca', 'porcao',
+        'calorias', 'carboidratos', 'proteinas', 'gorduras_totais',
+        'gorduras_saturadas', 'fibras', 'acucares', 'sodio', 'data_coleta', 'impressao_digital', 'unidade_porcao'
+    ]
+    NUTRIENT_FIELDS = list(default_values())
+    # Campos comparados para o feed de mudanças
+    COMPARED_FIELDS = ['nome_produto', 'categoria', 'porcao'] + NUTRIENT_FIELDS
+    # Colunas do CSV de porções (modo --variantes): porção base, derivadas e baixadas
+    SERVING_FIELDNAMES = FIELDNAMES + ['url_base', 'origem']
+    
+    def __init__(self, brand, max_workers=8, requests_per_second=4.0, rate_limiter=None, session=None,
+                 cache=None, use_cache=True, fsync_every=10, parse_processes=0, pipeline_window=64,
+                 archive=None, use_archive=True, metrics=None, parquet_dir=None, store=None,
+                 expand_servings=False):
+        self.brand = brand
+        self.base_url = FATSECRET_URL
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        self.output_file = "dados/vitao_nutricional.csv"
-        self.urls_file = "dados/vitao_urls.json"
+        self.output_file = f"dados/{brand_file_prefix(brand)}_nutricional.csv"
+        self.urls_file = f"dados/{brand_file_prefix(brand)}_urls.json"
+        self.metrics_file = f"dados/{brand_file_prefix(brand)}_metricas.json"
+        self.changes_file = f"dados/{brand_file_prefix(brand)}_mudancas.jsonl"
+        self.servings_file = f"dados/{brand_file_prefix(brand)}_porcoes.csv"
+        # Número de downloads simultâneos e orçamento global de requisições por segundo (adaptativo)
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter(requests_per_second)
+        # Sessão com pool de conexões (keep-alive) compartilhada com o coletor de URLs
+        self.session = session or get_shared_session(pool_size=max(16, self.max_workers))
+        # Cache em disco das páginas (revalidado com ETag/Last-Modified)
+        self.cache = (cache or get_shared_cache()) if use_cache else None
+        # A cada quantos produtos o CSV parcial é sincronizado em disco (fsync)
+        self.fsync_every = fsync_every
+        # Modo pipeline: processos dedicados ao parse; limite de páginas em voo (em ambos os modos)
+        self.parse_processes = parse_processes
+        self.pipeline_window = max(1, pipeline_window)
+        # Arquivo permanente do HTML bruto, usado para reprocessar sem acessar o site
+        self.archive = (archive if archive is not None else PageArchive()) if use_archive else None
+        # Tempos por requisição (DNS, conexão, TTFB, download) e por parse, resumidos ao final
+        self.metrics = metrics or RunMetrics()
+        # Dataset Parquet (tipado, particionado por dia) que recebe as linhas de cada execução
+        self.parquet_dir = parquet_dir
+        # Banco SQLite opcional (URLs, metadados das páginas e histórico nutricional)
+        self.store = store
+        # Coleta anterior (CSV), usada pela impressão digital e pelo feed de mudanças: só url -> impressão
+        # digital fica em memória, as linhas são lidas do disco quando necessário
+        self.previous_rows = CsvRowIndex()
+        # Modo variantes: links para as outras porções de cada produto, lidos das páginas já baixadas
+        self.expand_servings = expand_servings
+        self.serving_links = {}
+        # Páginas de porção baixadas pelo modo variantes: não são produtos (ficam fora do arquivo e do banco)
+        self.variant_urls = set()
         
     def get_page_content(self, url):
         """Faz a requisição HTTP e retorna o conteúdo da página"""
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            return response.text
+            # Usa o cache em disco e respeita o limite global de requisições entre as threads
+            return self.session.get_text(url, headers=self.headers, cache=self.cache,
+                                         rate_limiter=self.rate_limiter, metrics=self.metrics)
         except requests.RequestException as e:
             print(f"Erro ao acessar {url}: {e}")
             return None
@@ -52,35 +125,26 @@ class VitaoFatSecretScraper:
         """Extrai a categoria do produto (pode ser expandido no futuro)"""
         # Por enquanto, vamos usar uma categoria genérica
         # Pode ser melhorado para extrair de breadcrumbs ou outros elementos
-        return "Produto Vitao"
+        return f"Produto {self.brand}"
     
-    def extract_portion(self, soup):
-        """Extrai a porção do produto"""
+    def extract_serving(self, soup):
+        """Extrai a porção estruturada (quantidade, medida, equivalente em g/ml e unidade)"""
         try:
             serving_size_element = soup.find('div', class_='serving_size_value')
             if serving_size_element:
-                portion_text = serving_size_element.get_text(strip=True)
-                # Extrai números da string (ex: "1 porção (700 ml)" -> 700)
-                numbers = re.findall(r'\d+', portion_text)
-                if numbers:
-                    return int(numbers[-1])  # Pega o último número (700)
-            return 0
+                # Ex: "1 porção (700 ml)" -> 1 porção, 700 ml (textos repetidos vêm do cache)
+                return parse_serving(serving_size_element.get_text(" ", strip=True))
         except Exception as e:
             print(f"Erro ao extrair porção: {e}")
-            return 0
+        return Serving(None, '', None, '')
+    
+    def extract_portion(self, soup):
+        """Extrai a porção do produto (equivalente em g/ml, ou a quantidade da medida)"""
+        return portion_value(self.extract_serving(soup))
     
     def extract_nutritional_data(self, soup):
         """Extrai todos os dados nutricionais da tabela"""
-        nutritional_data = {
-            'calorias': 0,
-            'carboidratos': 0.0,
-            'proteinas': 0.0,
-            'gorduras_totais': 0.0,
-            'gorduras_saturadas': 0.0,
-            'fibras': 0.0,
-            'acucares': 0.0,
-            'sodio': 0
-        }
+        nutritional_data = default_values()
         
         try:
             nutrition_table = soup.find('div', class_='nutrition_facts')
@@ -88,79 +152,10 @@ class VitaoFatSecretScraper:
                 print("Tabela nutricional não encontrada")
                 return nutritional_data
             
-            # Busca por todos os nutrientes
+            # Texto de cada linha extraído uma única vez; os campos vêm da tabela NUTRIENT_TABLE
             nutrients = nutrition_table.find_all('div', class_='nutrient')
-            
-            for i in range(len(nutrients)):
-                nutrient_text = nutrients[i].get_text(strip=True)
-                
-                # Energia (kcal) - procura em múltiplas linhas
-                if nutrient_text == "Energia":
-                    # Procura nas próximas linhas por kcal
-                    for j in range(1, 4):  # Verifica até 3 linhas à frente
-                        if i + j < len(nutrients):
-                            kcal_text = nutrients[i + j].get_text(strip=True)
-                            if "kcal" in kcal_text:
-                                kcal_value = re.findall(r'\d+', kcal_text)
-                                if kcal_value:
-                                    nutritional_data['calorias'] = int(kcal_value[0])
-                                    break
-                
-                # Carboidratos
-                elif nutrient_text == "Carboidratos":
-                    if i + 1 < len(nutrients):
-                        carbs_text = nutrients[i + 1].get_text(strip=True)
-                        carbs_value = re.findall(r'[\d,]+', carbs_text)
-                        if carbs_value:
-                            nutritional_data['carboidratos'] = float(carbs_value[0].replace(',', '.'))
-                
-                # Açúcar (subnutriente de carboidratos)
-                elif nutrient_text == "Açúcar":
-                    if i + 1 < len(nutrients):
-                        sugar_text = nutrients[i + 1].get_text(strip=True)
-                        sugar_value = re.findall(r'[\d,]+', sugar_text)
-                        if sugar_value:
-                            nutritional_data['acucares'] = float(sugar_value[0].replace(',', '.'))
-                
-                # Proteínas
-                elif nutrient_text == "Proteínas":
-                    if i + 1 < len(nutrients):
-                        protein_text = nutrients[i + 1].get_text(strip=True)
-                        protein_value = re.findall(r'[\d,]+', protein_text)
-                        if protein_value:
-                            nutritional_data['proteinas'] = float(protein_value[0].replace(',', '.'))
-                
-                # Gorduras
-                elif nutrient_text == "Gorduras":
-                    if i + 1 < len(nutrients):
-                        fat_text = nutrients[i + 1].get_text(strip=True)
-                        fat_value = re.findall(r'[\d,]+', fat_text)
-                        if fat_value:
-                            nutritional_data['gorduras_totais'] = float(fat_value[0].replace(',', '.'))
-                
-                # Gordura Saturada
-                elif nutrient_text == "Gordura Saturada":
-                    if i + 1 < len(nutrients):
-                        sat_fat_text = nutrients[i + 1].get_text(strip=True)
-                        sat_fat_value = re.findall(r'[\d,]+', sat_fat_text)
-                        if sat_fat_value:
-                            nutritional_data['gorduras_saturadas'] = float(sat_fat_value[0].replace(',', '.'))
-                
-                # Fibras
-                elif nutrient_text == "Fibras":
-                    if i + 1 < len(nutrients):
-                        fiber_text = nutrients[i + 1].get_text(strip=True)
-                        fiber_value = re.findall(r'[\d,]+', fiber_text)
-                        if fiber_value:
-                            nutritional_data['fibras'] = float(fiber_value[0].replace(',', '.'))
-                
-                # Sódio
-                elif nutrient_text == "Sódio":
-                    if i + 1 < len(nutrients):
-                        sodium_text = nutrients[i + 1].get_text(strip=True)
-                        sodium_value = re.findall(r'\d+', sodium_text)
-                        if sodium_value:
-                            nutritional_data['sodio'] = int(sodium_value[0])
+            texts = [nutrient.get_text(strip=True) for nutrient in nutrients]
+            nutritional_data = extract_nutrients(texts)
         
         except Exception as e:
             print(f"Erro ao extrair dados nutricionais: {e}")
@@ -172,24 +167,105 @@ class VitaoFatSecretScraper:
         print(f"Fazendo scraping de: {url}")
         
         # Obtém o conteúdo da página
-        content = self.get_page_content(url)
+        content = self.fetch_product_page(url)
         if not content:
             return None
+        return self.extract_product(url, content)
+    
+    def extract_product(self, url, content):
+        """Extrai os dados da página baixada, reaproveitando a linha anterior se a tabela não mudou"""
+        # Uma única árvore lxml serve aos links das porções, à impressão digital e à extração
+        root = parse_document(content)
+        if self.wants_serving_links(url):
+            self.serving_links[url] = serving_links(content, url, root)
+        # Tabela nutricional idêntica à da coleta anterior: a extração é dispensada
+        fingerprint = nutrition_fingerprint(content, root)
+        unchanged = self.reuse_unchanged(url, fingerprint)
+        if unchanged:
+            return unchanged
         
-        # Parse do HTML
-        soup = BeautifulSoup(content, 'html.parser')
+        start = time.perf_counter()
+        product_data = self.parse_product(url, content, root=root)
+        product_data['impressao_digital'] = fingerprint
+        self.metrics.on_parse(url, time.perf_counter() - start)
+        return product_data
+    
+    def reuse_unchanged(self, url, fingerprint):
+        """Linha anterior com nova data de coleta, se a impressão digital da tabela nutricional não mudou"""
+        if not fingerprint or self.previous_fingerprint(url) != fingerprint:
+            return None
+        previous = self.known_row(url, self.previous_rows)
+        if not previous or not previous.get('nome_produto'):
+            return None
+        row = {field: previous.get(field) for field in self.FIELDNAMES}
+        row['data_coleta'] = datetime.now().isoformat(timespec='seconds')
+        return row
+    
+    def previous_fingerprint(self, url):
+        """Impressão digital da última coleta utilizável da URL (banco, se houver, senão o CSV anterior)"""
+        row = self.store.get_nutrition(url) if self.store is not None else None
+        if row is None:
+            return self.previous_rows.value(url)
+        return row.get('impressao_digital') if row.get('nome_produto') else ''
+    
+    def load_previous_rows(self):
+        """Índice do CSV da coleta anterior: impressões digitais em memória, linhas lidas sob demanda"""
+        return CsvRowIndex(self.output_file,
+                           value=lambda row: row.get('impressao_digital') if row.get('nome_produto') else '')
+    
+    def wants_serving_links(self, url):
+        """No modo variantes, se os links para as outras porções da página devem ser guardados"""
+        return self.expand_servings and url not in self.variant_urls
+    
+    def complete_parse(self, url, result):
+        """Dados do produto a partir de timed_parse_product_task (tabela inalterada: a linha anterior)"""
+        product_data, fingerprint, parse_time, links = result
+        if links is not None:
+            self.serving_links[url] = links
+        if product_data is None:
+            return self.reuse_unchanged(url, fingerprint)
+        self.metrics.on_parse(url, parse_time)
+        return product_data
+    
+    def fetch_product_page(self, url):
+        """Baixa a página do produto e guarda o HTML bruto no arquivo de páginas"""
+        content = self.get_page_content(url)
+        if content:
+            self.handle_page(url, content)
+        return content
+    
+    def handle_page(self, url, content):
+        """Arquiva a página baixada (as páginas de porção do modo variantes não são arquivadas)"""
+        if url in self.variant_urls:
+            return
+        self.archive_page(url, content)
+    
+    def archive_page(self, url, content):
+        """Guarda o HTML no arquivo de páginas e registra seus metadados no banco"""
+        entry = self.archive.add(url, content, brand=self.brand) if self.archive is not None else None
+        if self.store is not None:
+            self.store.record_page(url, content, sha256=entry['sha256'] if entry else None)
+    
+    def parse_product(self, url, content, collected_at=None, root=None):
+        """Faz o parse da página já baixada e extrai os dados do produto (root: árvore lxml já montada)"""
+        # Parse do HTML (somente os elementos usados na extração)
+        soup = parse_product_page(content, root)
         
         # Extrai os dados
+        serving = self.extract_serving(soup)
         product_data = {
             'nome_produto': self.extract_product_name(soup),
             'url': url,
             'categoria': self.extract_category(soup),
-            'porcao': self.extract_portion(soup)
+            'marca': self.brand,
+            'porcao': portion_value(serving),
+            'unidade_porcao': serving.unidade
         }
         
         # Extrai dados nutricionais
         nutritional_data = self.extract_nutritional_data(soup)
         product_data.update(nutritional_data)
+        product_data['data_coleta'] = collected_at or datetime.now().isoformat(timespec='seconds')
         
         return product_data
     
@@ -198,24 +274,153 @@ class VitaoFatSecretScraper:
         # Cria o diretório se não existir
         os.makedirs(os.path.dirname(self.output_file), exist_ok=True)
         
-        # Define as colunas do CSV
-        fieldnames = [
-            'nome_produto', 'url', 'categoria', 'porcao',
-            'calorias', 'carboidratos', 'proteinas', 'gorduras_totais',
-            'gorduras_saturadas', 'fibras', 'acucares', 'sodio'
-        ]
-        
-        # Salva no arquivo CSV
-        with open(self.output_file, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        # Salva no arquivo CSV (em um temporário, substituído de forma atômica)
+        tmp_file = f"{self.output_file}.tmp"
+        with open(tmp_file, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=self.FIELDNAMES, extrasaction='ignore')
             writer.writeheader()
             writer.writerows(data_list)
+        os.replace(tmp_file, self.output_file)
         
         print(f"💾 Dados salvos em: {self.output_file}")
         print(f"📝 {len(data_list)} produtos processados")
         
         return data_list
     
+    def save_to_parquet(self, rows):
+        """Acrescenta as linhas coletadas nesta execução ao dataset Parquet"""
+        if not HAS_PYARROW:
+            print("⚠️  pyarrow não está instalado: saída Parquet ignorada (pip install pyarrow)")
+            return 0
+        total = write_parquet(rows, self.parquet_dir, prefix=brand_file_prefix(self.brand))
+        print(f"💾 {total} linhas acrescentadas ao dataset Parquet: {self.parquet_dir}")
+        return total
+    
+    def iter_results(self, urls):
+        """Gera (url, dados do produto) na mesma ordem das URLs, baixando em paralelo"""
+        if self.parse_processes:
+            yield from self._iter_pipelined(urls)
+            return
+        
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        # Janela limitada de downloads em voo: as URLs podem chegar aos poucos (coleta encadeada)
+        url_iter = iter(urls)
+        pending = deque((url, executor.submit(self.scrape_product, url))
+                        for url in islice(url_iter, self.pipeline_window))
+        try:
+            while pending:
+                url, future = pending.popleft()
+                for next_url in islice(url_iter, 1):
+                    pending.append((next_url, executor.submit(self.scrape_product, next_url)))
+                yield url, future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _iter_pipelined(self, urls):
+        """Pipeline: threads baixam o HTML, um pool de processos faz o parse e o chamador grava em ordem"""
+        # 'spawn' evita fazer fork de um processo que já tem threads de download ativas
+        parsers = ProcessPoolExecutor(max_workers=self.parse_processes,
+                                      mp_context=multiprocessing.get_context('spawn'))
+        fetchers = ThreadPoolExecutor(max_workers=self.max_workers)
+        
+        def fetch_and_submit(url):
+            print(f"Fazendo scraping de: {url}")
+            content = self.fetch_product_page(url)
+            if not content:
+                return None
+            # O processo calcula a impressão digital na mesma árvore da extração e, se a tabela
+            # nutricional não mudou, dispensa a extração
+            return parsers.submit(timed_parse_product_task, url, content, self.brand,
+                                  self.previous_fingerprint(url), self.wants_serving_links(url))
+        
+        # Janela limitada de páginas em voo (baixando, na fila de parse ou aguardando gravação)
+        url_iter = iter(urls)
+        pending = deque((url, fetchers.submit(fetch_and_submit, url))
+                        for url in islice(url_iter, self.pipeline_window))
+        try:
+            while pending:
+                url, fetch_future = pending.popleft()
+                parse_future = fetch_future.result()
+                for next_url in islice(url_iter, 1):
+                    pending.append((next_url, fetchers.submit(fetch_and_submit, next_url)))
+                if parse_future is None:
+                    yield url, None
+                    continue
+                yield url, self.complete_parse(url, parse_future.result())
+        finally:
+            fetchers.shutdown(wait=False, cancel_futures=True)
+            parsers.shutdown(wait=False, cancel_futures=True)
+    
+    def load_existing_csv(self):
+        """Carrega o CSV atual indexado por URL (usado no modo incremental)"""
+        try:
+            with open(self.output_file, 'r', newline='', encoding='utf-8') as csvfile:
+                rows = {row['url']: row for row in csv.DictReader(csvfile)}
+            print(f"📂 {len(rows)} produtos já existentes em {self.output_file}")
+            return rows
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"⚠️  Erro ao carregar o CSV existente: {e}")
+            return {}
+    
+    def needs_refresh(self, row, max_age_days):
+        """Indica se a URL precisa ser (re)coletada: nova, com falha ou desatualizada"""
+        if row is None or not row.get('nome_produto'):
+            return True
+        
+        # Tabela nutricional não encontrada na última coleta (todos os valores zerados)
+        if all(float(row.get(field) or 0) == 0 for field in self.NUTRIENT_FIELDS):
+            return True
+        
+        # Linhas sem data de coleta vêm de versões antigas do CSV
+        try:
+            collected_at = datetime.fromisoformat(row.get('data_coleta') or '')
+        except ValueError:
+            return True
+        return datetime.now() - collected_at > timedelta(days=max_age_days)
+    
+    def describe_change(self, previous, row):
+        """Entrada do feed para a linha coletada: produto novo, valores alterados ou None se nada mudou"""
+        entry = {'marca': self.brand, 'url': row['url'], 'nome_produto': row['nome_produto'],
+                 'data_coleta': row['data_coleta']}
+        if not previous or not previous.get('nome_produto'):
+            return dict(entry, tipo='adicionado')
+        if previous.get('impressao_digital') and previous.get('impressao_digital') == row.get('impressao_digital'):
+            return None
+        fields = {}
+        for field in self.COMPARED_FIELDS:
+            old, new = previous.get(field), row.get(field)
+            try:
+                same = float(old) == float(new)
+            except (TypeError, ValueError):
+                same = (old or '') == (new or '')
+            if not same:
+                fields[field] = [old, new]
+        return dict(entry, tipo='alterado', campos=fields) if fields else None
+    
+    def removed_rows(self, seen):
+        """Produtos da coleta anterior (CSV ou banco) que não apareceram mais na busca (seen: hashes das URLs)"""
+        previous = dict.fromkeys(self.previous_rows)
+        already_removed = set()
+        if self.store is not None:
+            previous.update(dict.fromkeys(self.store.nutrition_urls(self.brand)))
+            # Remoções já registradas em execuções anteriores não se repetem no feed
+            already_removed.update(self.store.brand_urls(self.brand, status='removida'))
+        # Só as linhas dos removidos são lidas (do banco ou do CSV anterior)
+        rows = (self.known_row(url, self.previous_rows) for url in previous
+                if url_digest(url) not in seen and url not in already_removed)
+        return [row for row in rows if row and (row.get('marca') or self.brand) == self.brand]
+    
+    def write_change_feed(self, changes):
+        """Acrescenta as mudanças desta execução ao feed JSON Lines (uma mudança por linha)"""
+        if not changes:
+            return
+        os.makedirs(os.path.dirname(self.changes_file) or ".", exist_ok=True)
+        with open(self.changes_file, 'a', encoding='utf-8') as feed:
+            for change in changes:
+                feed.write(json.dumps(change, ensure_ascii=False) + "\n")
+    
     def load_urls_from_json(self):
         """Carrega as URLs do arquivo JSON"""
         try:
@@ -230,47 +435,287 @@ class VitaoFatSecretScraper:
             print(f"❌ Erro ao carregar URLs: {e}")
             return []
     
-    def run(self):
-        """Executa o processo completo de scraping"""
-        print("🚀 Iniciando scraping dos dados nutricionais da Vitao...")
+    def known_row(self, url, existing):
+        """Última coleta conhecida da URL: busca indexada no banco, se houver, senão o CSV"""
+        row = self.store.get_nutrition(url) if self.store is not None else None
+        return row or existing.get(url)
+    
+    def filter_urls(self, urls, seen, existing, completed, incremental, max_age_days, order=None):
+        """URLs que precisam ser baixadas, na ordem de chegada (registra o hash de todas as recebidas em seen
+        e, se pedido, a ordem delas em order)"""
+        for url in urls:
+            digest = url_digest(url)
+            if digest in seen:
+                continue
+            seen.add(digest)
+            if order is not None:
+                order.append(url)
+            # No modo incremental, só coleta URLs novas, com falha ou mais antigas que max_age_days
+            if incremental and not self.needs_refresh(self.known_row(url, existing), max_age_days):
+                continue
+            if url not in completed:
+                yield url
+    
+    def expand_serving_variants(self, base_rows, removed_urls=()):
+        """Atualiza as porções dos produtos desta execução: calculadas da porção base quando possível, baixadas
+        senão (as dos demais produtos continuam no arquivo; as dos removidos saem)"""
+        rows, to_fetch = [], {}
+        for url, base_row in base_rows.items():
+            rows.append(dict(base_row, url_base=url, origem='base'))
+            for text, variant_url in self.serving_links.get(url, []):
+                if variant_url in base_rows:
+                    continue
+                derived = derive_variant(base_row, variant_serving(text, variant_url), variant_url)
+                if derived is not None:
+                    rows.append(dict(derived, url_base=url, origem='derivada'))
+                else:
+                    # Equivalente em g/ml desconhecido (ex: "1 unidade"): só a página da porção tem os valores
+                    to_fetch.setdefault(variant_url, url)
+        derived_count = len(rows) - len(base_rows)
         
-        # Carrega as URLs
-        urls = self.load_urls_from_json()
-        if not urls:
-            print("❌ Nenhuma URL encontrada. Execute primeiro o coletor de URLs.")
+        print(f"\n🍽️  Porções: {derived_count} calculadas localmente, {len(to_fetch)} precisam ser baixadas")
+        fetched = 0
+        self.variant_urls.update(to_fetch)
+        try:
+            for variant_url, product_data in self.iter_results(list(to_fetch)):
+                if product_data:
+                    rows.append(dict(product_data, url_base=to_fetch[variant_url], origem='pagina'))
+                    fetched += 1
+                else:
+                    print(f"❌ Falha ao extrair a porção: {variant_url}")
+        finally:
+            self.variant_urls.clear()
+            self.serving_links.clear()
+        
+        # Mescla com o arquivo existente: só os produtos desta execução (e os removidos) são substituídos
+        os.makedirs(os.path.dirname(self.servings_file), exist_ok=True)
+        replaced = set(base_rows).union(removed_urls)
+        kept = 0
+        tmp_file = f"{self.servings_file}.tmp"
+        with open(tmp_file, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=self.SERVING_FIELDNAMES, extrasaction='ignore')
+            writer.writeheader()
+            for row in self.load_serving_rows():
+                if row.get('url_base') not in replaced:
+                    writer.writerow(row)
+                    kept += 1
+            writer.writerows(rows)
+        os.replace(tmp_file, self.servings_file)
+        print(f"💾 {len(rows)} porções de {len(base_rows)} produtos atualizadas em: {self.servings_file} "
+              f"({derived_count + fetched} variantes, {fetched} requisições extras; {kept} porções mantidas)")
+        return rows
+    
+    def load_serving_rows(self):
+        """Porções já gravadas (lidas em sequência, sem carregar o arquivo inteiro)"""
+        try:
+            with open(self.servings_file, 'r', newline='', encoding='utf-8') as csvfile:
+                yield from csv.DictReader(csvfile)
+        except FileNotFoundError:
             return
+    
+    def print_stats(self):
+        """Exibe as estatísticas de conexões, do limitador de requisições e do cache"""
+        self.session.print_stats()
+        self.rate_limiter.print_stats()
+        if self.cache:
+            self.cache.print_stats()
+    
+    def run(self, incremental=False, max_age_days=7, urls=None, urls_complete=False):
+        """Executa o processo completo de scraping (urls: lista ou iterável entregue aos poucos pelo coletor;
+        urls_complete: se a descoberta terminou sem falhas, ou função consultada depois de consumir as URLs)"""
+        print(f"🚀 Iniciando scraping dos dados nutricionais da {self.brand}...")
         
-        # Lista para armazenar os dados
-        all_data = []
+        # Sem URLs informadas, usa o arquivo JSON gerado pelo coletor
+        if urls is None:
+            urls_complete = load_urls_complete(self.urls_file)
+            urls = self.load_urls_from_json()
+            if not urls:
+                print("❌ Nenhuma URL encontrada. Execute primeiro o coletor de URLs.")
+                return 0
         
-        # Processa cada URL
-        for i, url in enumerate(urls, 1):
-            print(f"\n📊 Processando produto {i}/{len(urls)}")
-            
-            # Faz o scraping do produto
-            product_data = self.scrape_product(url)
-            
-            if product_data:
-                all_data.append(product_data)
-                print(f"✅ Dados extraídos: {product_data['nome_produto']}")
-            else:
-                print(f"❌ Falha ao extrair dados da URL: {url}")
-            
-            # Pausa entre requisições para evitar bloqueios
-            if i < len(urls):
-                time.sleep(2)
+        existing = self.load_existing_csv() if incremental else {}
+        # Coleta anterior: impressões digitais (dispensam a extração) e base do feed de mudanças
+        self.previous_rows = self.load_previous_rows()
+        changes = []
+        unchanged = 0
+        base_rows = {}
+        
+        # Grava cada produto assim que fica pronto; o journal permite retomar após uma interrupção
+        writer = StreamingCsvWriter(self.output_file, self.FIELDNAMES, fsync_every=self.fsync_every)
+        completed = writer.open()
+        if completed:
+            print(f"♻️  Retomando execução anterior: {len(completed)} produtos já concluídos")
+        
+        # Hashes de 8 bytes das URLs recebidas (repetidas e remoções); a ordem delas só é guardada no modo
+        # incremental, que já mantém o CSV inteiro em memória para a mescla
+        seen = set()
+        order = [] if incremental else None
+        urls_to_fetch = self.filter_urls(urls, seen, existing, completed, incremental, max_age_days, order)
+        total = ""
+        if isinstance(urls, list):
+            urls_to_fetch = list(urls_to_fetch)
+            total = f"/{len(urls_to_fetch)}"
+            if incremental:
+                print(f"🔁 Modo incremental: {len(urls_to_fetch)} de {len(seen)} URLs precisam ser atualizadas")
+        
+        print(f"⚙️  {self.max_workers} workers, até {self.rate_limiter.requests_per_second} requisições/s")
+        if self.parse_processes:
+            print(f"🧵 Modo pipeline: {self.parse_processes} processos de parse")
+        
+        # Processa as URLs em paralelo, recebendo os resultados na ordem original
+        results = self.iter_results(urls_to_fetch)
+        try:
+            for i, (url, product_data) in enumerate(results, 1):
+                print(f"\n📊 Processando produto {i}{total}")
+                
+                if product_data:
+                    change = self.describe_change(self.known_row(url, self.previous_rows), product_data)
+                    if change:
+                        changes.append(change)
+                    else:
+                        unchanged += 1
+                    writer.write(product_data)
+                    if self.store is not None:
+                        self.store.upsert_nutrition(product_data)
+                    if self.expand_servings:
+                        base_rows[url] = product_data
+                    print(f"✅ Dados extraídos: {product_data['nome_produto']}")
+                else:
+                    if self.store is not None:
+                        self.store.mark_failed(url)
+                    print(f"❌ Falha ao extrair dados da URL: {url}")
+        except BaseException:
+            writer.close()
+            self.previous_rows.close()
+            if self.store is not None:
+                self.store.flush()
+            print(f"\n⏸️  Execução interrompida. {writer.rows_written} produtos salvos em {writer.partial_file}; "
+                  "execute novamente para retomar.")
+            raise
+        finally:
+            results.close()
+        
+        # Só com a descoberta completa o que não apareceu na lista saiu de fato do site; com alguma
+        # página de busca falhando, os produtos seguintes seriam dados como removidos por engano
+        if callable(urls_complete):
+            urls_complete = urls_complete()
+        removed = self.removed_rows(seen) if urls_complete else []
+        if not urls_complete:
+            print("⚠️  Lista de URLs incompleta (falha na descoberta): remoções não foram calculadas")
+        # O CSV anterior pode ser substituído a seguir
+        self.previous_rows.close()
+        changes.extend({'marca': self.brand, 'url': row['url'], 'nome_produto': row.get('nome_produto'),
+                        'data_coleta': datetime.now().isoformat(timespec='seconds'), 'tipo': 'removido'}
+                       for row in removed)
+        self.write_change_feed(changes)
+        kinds = Counter(change['tipo'] for change in changes)
+        print(f"🔄 Mudanças: {kinds['adicionado']} adicionados, {kinds['alterado']} alterados, "
+              f"{kinds['removido']} removidos, {unchanged} sem mudança")
+        if changes:
+            print(f"📰 Feed de mudanças atualizado: {self.changes_file}")
+        
+        if self.store is not None:
+            self.store.mark_removed([row['url'] for row in removed])
+            self.store.flush()
+            print(f"🗄️  Banco atualizado: {self.store.db_file}")
+        
+        # Só as linhas desta execução: o dataset Parquet guarda o histórico das coletas
+        if self.parquet_dir and writer.rows_written:
+            self.save_to_parquet(writer.read_rows())
         
-        # Salva os dados em CSV
-        if all_data:
+        if writer.rows_written == 0 and not existing:
+            writer.commit(replace_output=False)
+            print("❌ Nenhum dado foi extraído.")
+        elif incremental:
+            # Mescla com o CSV existente: dados novos têm prioridade, falhas mantêm a linha anterior
+            scraped = {row['url']: row for row in writer.read_rows()}
+            all_data = [scraped.get(url) or existing[url] for url in order if url in scraped or url in existing]
+            if not urls_complete:
+                # Lista incompleta: os produtos fora dela continuam no CSV (não se sabe se saíram do site);
+                # com a lista completa eles acabaram de ser registrados como removidos e saem
+                all_data.extend(row for url, row in existing.items() if url_digest(url) not in seen)
             self.save_to_csv(all_data)
-            print(f"\n🎉 Scraping concluído! {len(all_data)} produtos processados.")
+            writer.commit(replace_output=False)
+            print(f"\n🎉 Scraping concluído! {len(scraped)} produtos atualizados.")
         else:
-            print("❌ Nenhum dado foi extraído.")
+            writer.commit()
+            print(f"💾 Dados salvos em: {self.output_file}")
+            print(f"\n🎉 Scraping concluído! {writer.rows_written} produtos processados.")
+        
+        if self.expand_servings:
+            self.expand_serving_variants(base_rows, [row['url'] for row in removed])
+        
+        self.print_stats()
+        self.metrics.print_summary(self.metrics.write_report(self.metrics_file))
+        print(f"📈 Relatório de tempos salvo em: {self.metrics_file}")
+        return writer.rows_written
+
+class VitaoFatSecretScraper(BrandFatSecretScraper):
+    """Scraper dos dados nutricionais dos produtos da Vitao"""
+    
+    def __init__(self, **kwargs):
+        super().__init__("Vitao", **kwargs)
+
+# Instâncias usadas pelos processos do modo pipeline (uma por marca em cada processo)
+_process_scrapers = {}
+
+def parse_product_task(url, content, collected_at=None, brand="Vitao", root=None):
+    """Parse e extração de uma página, executado nos processos do modo pipeline"""
+    scraper = _process_scrapers.get(brand)
+    if scraper is None:
+        scraper = _process_scrapers[brand] = BrandFatSecretScraper(brand, use_cache=False, use_archive=False)
+    return scraper.parse_product(url, content, collected_at, root=root)
+
+def timed_parse_product_task(url, content, brand="Vitao", previous_fingerprint='', with_links=False):
+    """Links das porções, impressão digital e extração sobre uma só árvore: (dados ou None se a tabela não
+    mudou, impressão, tempo, links ou None)"""
+    start = time.perf_counter()
+    root = parse_document(content)
+    links = serving_links(content, url, root) if with_links else None
+    fingerprint = nutrition_fingerprint(content, root)
+    if fingerprint and fingerprint == previous_fingerprint:
+        return None, fingerprint, time.perf_counter() - start, links
+    product_data = parse_product_task(url, content, None, brand, root)
+    product_data['impressao_digital'] = fingerprint
+    return product_data, fingerprint, time.perf_counter() - start, links
+
+def add_scraper_arguments(parser, variants=True):
+    """Opções de saída do scraper compartilhadas pelas linhas de comando: Parquet, SQLite e porções"""
+    add_parquet_argument(parser)
+    add_store_argument(parser)
+    if variants:
+        parser.add_argument("--variantes", action="store_true",
+                            help="Também grava todas as porções de cada produto em dados/<marca>_porcoes.csv "
+                                 "(calculadas da página já baixada; só as que não dá para calcular são baixadas)")
 
 def main():
     """Função principal"""
-    scraper = VitaoFatSecretScraper()
-    scraper.run()
+    parser = argparse.ArgumentParser(description="Scraper de dados nutricionais de uma marca")
+    parser.add_argument("--marca", default="Vitao", help="Marca a coletar (padrão: Vitao)")
+    parser.add_argument("--workers", type=int, default=8, help="Número de downloads simultâneos")
+    parser.add_argument("--rps", type=float, default=4.0, help="Requisições por segundo iniciais (global, ajustada conforme as respostas)")
+    parser.add_argument("--sem-cache", action="store_true", help="Ignora o cache em disco das páginas")
+    parser.add_argument("--processos", type=int, default=0,
+                        help="Processos de parse no modo pipeline (0 = parse nas threads de download)")
+    parser.add_argument("--sem-arquivo", action="store_true",
+                        help="Não guarda o HTML bruto das páginas em dados/arquivo_html/")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Coleta apenas URLs novas, com falha ou desatualizadas e mescla no CSV")
+    parser.add_argument("--max-idade-dias", type=float, default=7,
+                        help="Idade máxima (em dias) de um produto no modo incremental")
+    add_scraper_arguments(parser)
+    args = parser.parse_args()
+    
+    store = ProductStore(args.sqlite) if args.sqlite else None
+    scraper = BrandFatSecretScraper(args.marca, max_workers=args.workers, requests_per_second=args.rps,
+                                    use_cache=not args.sem_cache, parse_processes=args.processos,
+                                    use_archive=not args.sem_arquivo, parquet_dir=args.parquet, store=store,
+                                    expand_servings=args.variantes)
+    try:
+        scraper.run(incremental=args.incremental, max_age_days=args.max_idade_dias)
+    finally:
+        if store is not None:
+            store.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,100 @@
+import re
+from collections import namedtuple
+from functools import lru_cache
+from urllib.parse import unquote
+
+# Porção estruturada: quantidade da medida, medida canônica, equivalente em g/ml (quando
+# informado ou dedutível) e a unidade desse equivalente ('g', 'ml' ou '' se desconhecida)
+Serving = namedtuple('Serving', ['quantidade', 'medida', 'equivalente', 'unidade'])
+
+# Medidas reconhecidas: padrão -> (medida canônica, equivalente por unidade, unidade base, exata).
+# Exata: o equivalente é uma conversão de unidade (100 g, 1 l); senão é uma estimativa caseira
+# e a porção só tem equivalente exato quando a página o informa entre parênteses
+HOUSEHOLD_MEASURES = [
+    (r'colher(?:es)?(?: de)? sopa', 'colher de sopa', 15.0, 'g', False),
+    (r'colher(?:es)?(?: de)? ch[aá]', 'colher de chá', 5.0, 'g', False),
+    (r'(?:x|ch)[ií]caras?(?: d[eé] ch[aá])?', 'xícara', 240.0, 'ml', False),
+    (r'copos?', 'copo', 200.0, 'ml', False),
+    (r'ml|mililitros?', 'ml', 1.0, 'ml', True),
+    (r'l|litros?', 'l', 1000.0, 'ml', True),
+    (r'mg|miligramas?', 'mg', 0.001, 'g', True),
+    (r'kg|quilos?|quilogramas?', 'kg', 1000.0, 'g', True),
+    (r'g|gr|gramas?', 'g', 1.0, 'g', True),
+    (r'por[cç](?:[aã]o|[oõ]es)', 'porção', None, 'g', False),
+    (r'unidades?', 'unidade', None, 'g', False),
+]
+MEASURE_PATTERNS = [(re.compile(pattern), name, factor, unit, exact)
+                    for pattern, name, factor, unit, exact in HOUSEHOLD_MEASURES]
+
+# Frações unicode usadas em algumas porções ("½ xícara")
+UNICODE_FRACTIONS = str.maketrans({'½': ' 1/2', '¼': ' 1/4', '¾': ' 3/4', '⅓': ' 1/3', '⅔': ' 2/3'})
+
+_NUMBER = r'\d+(?:[.,]\d+)?'
+# Gramática: [quantidade] [medida] [(equivalente unidade)], ex: "1 1/2 colher de sopa (22,5 g)"
+SERVING_RE = re.compile(
+    rf'^(?:(?:(?P<inteiro>\d+)\s+(?=\d+\s*/))?(?P<numerador>{_NUMBER})(?:\s*/\s*(?P<denominador>\d+))?)?'
+    rf'\s*(?P<medida>[^()\d]*?)\s*'
+    rf'(?:\(\s*(?P<equivalente>{_NUMBER})\s*(?P<unidade>[^\d\s()]+)\s*\))?\s*$'
+)
+# Fallback para textos fora da gramática: o último número do texto (comportamento original)
+NUMBER_RE = re.compile(_NUMBER)
+# Slug da porção na URL: "1-2-xicara" = 1/2 xícara; "1-1-2-colher-de-sopa" = 1 1/2 colher de sopa
+SLUG_PATTERN = (r'^(?:(?P<inteiro>\d+)-(?=\d+-\d+-))?(?P<numerador>\d+(?:[.,]\d+)?)'
+                r'(?:-(?P<denominador>\d+))?-(?P<medida>.+)$')
+SLUG_RE = re.compile(SLUG_PATTERN)
+
+def _number(text):
+    return float(text.replace(',', '.'))
+
+def resolve_measure(text):
+    """(medida canônica, equivalente por unidade, unidade base, exata) do texto da medida"""
+    text = " ".join((text or '').lower().split())
+    for pattern, name, factor, unit, exact in MEASURE_PATTERNS:
+        if pattern.fullmatch(text):
+            return name, factor, unit, exact
+    return text, None, '', False
+
+@lru_cache(maxsize=4096)
+def parse_serving(text):
+    """Porção estruturada a partir do texto do FatSecret (memoizada: os mesmos textos se repetem)"""
+    text = (text or '').translate(UNICODE_FRACTIONS).strip()
+    match = SERVING_RE.match(text)
+    if not match:
+        numbers = NUMBER_RE.findall(text)
+        return Serving(None, text.lower(), _number(numbers[-1]) if numbers else None, '')
+
+    quantity = None
+    if match['numerador']:
+        quantity = _number(match['numerador']) / (int(match['denominador']) if match['denominador'] else 1)
+        quantity += int(match['inteiro'] or 0)
+    measure, factor, unit, exact = resolve_measure(match['medida'])
+
+    if match['equivalente']:
+        # "(700 ml)": equivalente informado pela página, convertido para g ou ml
+        _, equivalent_factor, equivalent_unit, equivalent_exact = resolve_measure(match['unidade'])
+        if equivalent_exact:
+            return Serving(quantity, measure, _number(match['equivalente']) * equivalent_factor, equivalent_unit)
+        return Serving(quantity, measure, _number(match['equivalente']), '')
+    if exact and quantity is not None:
+        # "100 g", "1 l": a própria medida já é massa/volume
+        return Serving(quantity, measure, quantity * factor, unit)
+    return Serving(quantity, measure, None, '')
+
+@lru_cache(maxsize=4096)
+def parse_serving_slug(slug):
+    """Porção a partir do último segmento da URL (ex: "100-g" -> 100 g), ou None se fora do formato"""
+    match = SLUG_RE.match(unquote(slug or ''))
+    if not match:
+        return None
+    quantity = match['numerador'] + (f"/{match['denominador']}" if match['denominador'] else '')
+    if match['inteiro']:
+        quantity = f"{match['inteiro']} {quantity}"
+    return parse_serving(f"{quantity} {match['medida'].replace('-', ' ')}")
+
+def portion_value(serving):
+    """Valor da coluna porcao: equivalente em g/ml ou, sem ele, a quantidade da medida"""
+    value = serving.equivalente if serving.equivalente is not None else serving.quantidade
+    if value is None:
+        return 0
+    value = round(value, 3)
+    return int(value) if value.is_integer() else value
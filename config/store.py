@@ -0,0 +1,324 @@
+import argparse
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime, timedelta
+
+# Permite executar como script (python config/store.py) ou importar como módulo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.nutrients import NUTRIENT_TABLE
+
+STORE_FILE = "dados/fatsecret.db"
+# Colunas de uma linha nutricional (as mesmas do CSV, sem url/data_coleta)
+NUMERIC_FIELDS = ['porcao'] + [spec.field for spec in NUTRIENT_TABLE.values()]
+VALUE_FIELDS = ['nome_produto', 'categoria', 'marca', 'porcao', 'unidade_porcao'] + NUMERIC_FIELDS[1:]
+# Máximo de parâmetros por consulta IN (...) (limite antigo do SQLite: 999)
+IN_CHUNK = 500
+
+# NUMERIC: valores inteiros voltam como int e os demais como float
+VALUE_COLUMNS = ', '.join(f'{field} {"NUMERIC" if field in NUMERIC_FIELDS else "TEXT"}' for field in VALUE_FIELDS)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    marca TEXT,
+    primeira_vez TEXT NOT NULL,
+    ultima_vez TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'descoberta',
+    ultima_coleta TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_urls_marca ON urls (marca, status);
+
+CREATE TABLE IF NOT EXISTS paginas (
+    url TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    primeira_vez TEXT NOT NULL,
+    ultima_vez TEXT NOT NULL,
+    PRIMARY KEY (url, sha256)
+);
+
+CREATE TABLE IF NOT EXISTS nutricao (
+    url TEXT PRIMARY KEY,
+    {VALUE_COLUMNS},
+    impressao_digital TEXT,
+    data_coleta TEXT NOT NULL,
+    alterado_em TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_nutricao_marca ON nutricao (marca);
+CREATE INDEX IF NOT EXISTS idx_nutricao_alterado ON nutricao (alterado_em);
+
+CREATE TABLE IF NOT EXISTS nutricao_historico (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    {VALUE_COLUMNS},
+    impressao_digital TEXT,
+    data_coleta TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_historico_url ON nutricao_historico (url, data_coleta);
+CREATE INDEX IF NOT EXISTS idx_historico_data ON nutricao_historico (data_coleta);
+"""
+
+# Colunas acrescentadas depois da criação do schema (bancos antigos recebem via ALTER TABLE)
+ADDED_COLUMNS = {
+    'nutricao': [('impressao_digital', 'TEXT'), ('unidade_porcao', 'TEXT')],
+    'nutricao_historico': [('impressao_digital', 'TEXT'), ('unidade_porcao', 'TEXT')],
+}
+
+def _now():
+    return datetime.now().isoformat(timespec='seconds')
+
+def _values(row):
+    """Valores comparáveis de uma linha (números como float, vindos do scraper, do CSV ou do banco)"""
+    values = []
+    for field in VALUE_FIELDS:
+        value = row.get(field) if isinstance(row, dict) else row[field]
+        if field in NUMERIC_FIELDS:
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                value = None
+        values.append(value)
+    return tuple(values)
+
+def _chunks(items, size=IN_CHUNK):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+class ProductStore:
+    """Banco SQLite com as URLs descobertas, os metadados das páginas e a nutrição com histórico"""
+
+    def __init__(self, db_file=STORE_FILE, batch_size=200):
+        self.db_file = db_file
+        self.batch_size = max(1, batch_size)
+        os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+        # Usado pelas threads de download e pela thread de gravação: acesso serializado pelo lock
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+        self._lock = threading.RLock()
+        self._pending_urls = []
+        self._pending_pages = []
+        self._pending_rows = []
+        self._pending_status = []
+
+    def _migrate(self):
+        with self._conn:
+            for table, columns in ADDED_COLUMNS.items():
+                existing = {row['name'] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+                for name, column_type in columns:
+                    if name not in existing:
+                        self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+
+    # Escritas (acumuladas e gravadas em lotes, cada lote em uma transação)
+
+    def add_urls(self, urls, brand=None, seen_at=None):
+        """URLs encontradas na busca (novas entram como 'descoberta'; as demais só têm ultima_vez atualizada)"""
+        seen_at = seen_at or _now()
+        with self._lock:
+            self._pending_urls.extend((url, brand, seen_at, seen_at) for url in urls)
+            self._maybe_flush(self._pending_urls)
+
+    def record_page(self, url, content, fetched_at=None, sha256=None):
+        """Metadados do HTML baixado (o conteúdo em si fica no arquivo de páginas)"""
+        data = content.encode('utf-8')
+        sha256 = sha256 or hashlib.sha256(data).hexdigest()
+        fetched_at = fetched_at or _now()
+        with self._lock:
+            self._pending_pages.append((url, sha256, len(data), fetched_at, fetched_at))
+            self._maybe_flush(self._pending_pages)
+
+    def upsert_nutrition(self, row):
+        """Linha nutricional coletada: atualiza a versão atual e registra no histórico se algo mudou"""
+        with self._lock:
+            self._pending_rows.append(dict(row))
+            self._maybe_flush(self._pending_rows)
+
+    def mark_failed(self, url):
+        """Coleta da URL falhou nesta execução"""
+        with self._lock:
+            self._pending_status.append(('falha', None, url))
+            self._maybe_flush(self._pending_status)
+
+    def mark_removed(self, urls):
+        """URLs que deixaram de aparecer na busca da marca"""
+        with self._lock:
+            self._pending_status.extend(('removida', None, url) for url in urls)
+            self._maybe_flush(self._pending_status)
+
+    def _maybe_flush(self, pending):
+        if len(pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Grava tudo o que está pendente em uma única transação"""
+        with self._lock:
+            if not (self._pending_urls or self._pending_pages or self._pending_rows or self._pending_status):
+                return
+            with self._conn:
+                if self._pending_urls:
+                    self._conn.executemany(
+                        "INSERT INTO urls (url, marca, primeira_vez, ultima_vez) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT(url) DO UPDATE SET ultima_vez = excluded.ultima_vez, "
+                        "marca = COALESCE(excluded.marca, urls.marca)",
+                        self._pending_urls)
+                if self._pending_pages:
+                    self._conn.executemany(
+                        "INSERT INTO paginas (url, sha256, bytes, primeira_vez, ultima_vez) VALUES (?, ?, ?, ?, ?) "
+                        "ON CONFLICT(url, sha256) DO UPDATE SET ultima_vez = excluded.ultima_vez",
+                        self._pending_pages)
+                if self._pending_rows:
+                    self._write_rows(self._pending_rows)
+                if self._pending_status:
+                    self._conn.executemany("UPDATE urls SET status = ?, ultima_coleta = COALESCE(?, ultima_coleta) "
+                                           "WHERE url = ?", self._pending_status)
+            self._pending_urls = []
+            self._pending_pages = []
+            self._pending_rows = []
+            self._pending_status = []
+
+    def _write_rows(self, rows):
+        # Versões atuais no banco; atualizadas em ordem para que cada mudança do lote entre no histórico
+        current = self._current_values(list({row['url'] for row in rows}))
+
+        columns = ', '.join(VALUE_FIELDS)
+        placeholders = ', '.join('?' for _ in VALUE_FIELDS)
+        history, upserts, seen = [], [], []
+        for row in rows:
+            url = row['url']
+            collected_at = row.get('data_coleta') or _now()
+            values = _values(row)
+            fingerprint = row.get('impressao_digital') or None
+            changed = current.get(url) != values
+            if changed:
+                current[url] = values
+                history.append((url, *values, fingerprint, collected_at))
+            upserts.append((url, *values, fingerprint, collected_at, collected_at, changed))
+            seen.append((url, row.get('marca'), collected_at, collected_at, collected_at))
+
+        self._conn.executemany(
+            f"INSERT INTO nutricao_historico (url, {columns}, impressao_digital, data_coleta) "
+            f"VALUES (?, {placeholders}, ?, ?)", history)
+        updates = ', '.join(f"{field} = excluded.{field}" for field in VALUE_FIELDS)
+        self._conn.executemany(
+            f"INSERT INTO nutricao (url, {columns}, impressao_digital, data_coleta, alterado_em) "
+            f"VALUES (?, {placeholders}, ?, ?, ?) "
+            f"ON CONFLICT(url) DO UPDATE SET {updates}, impressao_digital = excluded.impressao_digital, "
+            f"data_coleta = excluded.data_coleta, "
+            f"alterado_em = CASE WHEN ? THEN excluded.alterado_em ELSE nutricao.alterado_em END",
+            upserts)
+        self._conn.executemany(
+            "INSERT INTO urls (url, marca, primeira_vez, ultima_vez, status, ultima_coleta) "
+            "VALUES (?, ?, ?, ?, 'coletada', ?) "
+            "ON CONFLICT(url) DO UPDATE SET status = 'coletada', ultima_coleta = excluded.ultima_coleta",
+            seen)
+
+    def _current_values(self, urls):
+        current = {}
+        for chunk in _chunks(urls):
+            query = (f"SELECT url, {', '.join(VALUE_FIELDS)} FROM nutricao "
+                     f"WHERE url IN ({', '.join('?' for _ in chunk)})")
+            for row in self._conn.execute(query, chunk):
+                current[row['url']] = _values(row)
+        return current
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    # Consultas (buscas indexadas por URL, marca e data)
+
+    def get_nutrition(self, url):
+        """Versão atual da linha nutricional da URL (dict) ou None"""
+        with self._lock:
+            # Linhas ainda no lote pendente valem como gravadas (sem forçar uma transação por consulta)
+            for row in reversed(self._pending_rows):
+                if row['url'] == url:
+                    return dict(row)
+            row = self._conn.execute("SELECT * FROM nutricao WHERE url = ?", (url,)).fetchone()
+        return dict(row) if row else None
+
+    def nutrition_rows(self, brand=None):
+        """Versões atuais de todas as linhas (opcionalmente de uma marca)"""
+        self.flush()
+        with self._lock:
+            if brand:
+                rows = self._conn.execute("SELECT * FROM nutricao WHERE marca = ? ORDER BY url", (brand,))
+            else:
+                rows = self._conn.execute("SELECT * FROM nutricao ORDER BY marca, url")
+            return [dict(row) for row in rows]
+
+    def nutrition_urls(self, brand=None):
+        """URLs com linha nutricional (opcionalmente de uma marca), sem carregar as linhas"""
+        self.flush()
+        with self._lock:
+            if brand:
+                rows = self._conn.execute("SELECT url FROM nutricao WHERE marca = ? ORDER BY url", (brand,))
+            else:
+                rows = self._conn.execute("SELECT url FROM nutricao ORDER BY marca, url")
+            return [row['url'] for row in rows]
+
+    def brand_urls(self, brand, status=None):
+        """URLs descobertas de uma marca (opcionalmente só as de um status)"""
+        self.flush()
+        query = "SELECT url FROM urls WHERE marca = ?" + (" AND status = ?" if status else "") + " ORDER BY primeira_vez, url"
+        with self._lock:
+            return [row['url'] for row in self._conn.execute(query, (brand, status) if status else (brand,))]
+
+    def changes_since(self, since, brand=None):
+        """Versões registradas desde a data (inclui produtos novos), com a versão anterior de cada uma"""
+        self.flush()
+        query = (
+            "SELECT h.*, (SELECT COUNT(*) FROM nutricao_historico p WHERE p.url = h.url AND p.id < h.id) AS versoes_anteriores "
+            "FROM nutricao_historico h WHERE h.data_coleta >= ?"
+            + (" AND h.marca = ?" if brand else "") + " ORDER BY h.data_coleta, h.url"
+        )
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(query, (since, brand) if brand else (since,))]
+
+    def summary(self):
+        """Contagens por tabela e por status das URLs"""
+        self.flush()
+        with self._lock:
+            counts = {table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                      for table in ('urls', 'paginas', 'nutricao', 'nutricao_historico')}
+            counts['status'] = {row['status']: row['n'] for row in
+                                self._conn.execute("SELECT status, COUNT(*) AS n FROM urls GROUP BY status")}
+        return counts
+
+def add_store_argument(parser, help="Também grava URLs, páginas e histórico nutricional em SQLite"):
+    """Opção --sqlite [ARQUIVO] (sem valor: o banco padrão), com o texto de ajuda da linha de comando"""
+    parser.add_argument("--sqlite", nargs="?", const=STORE_FILE, help=f"{help} (padrão: {STORE_FILE})")
+
+def main():
+    """Consultas rápidas ao banco"""
+    parser = argparse.ArgumentParser(description="Consulta o banco SQLite de produtos")
+    parser.add_argument("--banco", default=STORE_FILE, help="Arquivo do banco")
+    parser.add_argument("--marca", help="Filtra por marca")
+    parser.add_argument("--mudancas", type=float, metavar="DIAS",
+                        help="Lista os produtos novos ou alterados nos últimos N dias")
+    args = parser.parse_args()
+
+    store = ProductStore(args.banco)
+    summary = store.summary()
+    print(f"🗄️  {args.banco}: {summary['urls']} URLs {summary['status']}, {summary['nutricao']} produtos, "
+          f"{summary['nutricao_historico']} versões no histórico, {summary['paginas']} páginas")
+
+    if args.mudancas is not None:
+        since = (datetime.now() - timedelta(days=args.mudancas)).isoformat(timespec='seconds')
+        changes = store.changes_since(since, brand=args.marca)
+        print(f"\n🔄 {len(changes)} mudanças desde {since}:")
+        for change in changes:
+            kind = "novo" if change['versoes_anteriores'] == 0 else "alterado"
+            print(f"  {change['data_coleta']}  [{kind:8s}] {change['nome_produto']}  {change['url']}")
+    store.close()
+
+if __name__ == "__main__":
+    main()
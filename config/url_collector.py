@@ -1,26 +1,72 @@
 import requests
-from bs4 import BeautifulSoup
+import argparse
 import json
-import time
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from urllib.parse import urljoin
 
-class VitaoUrlCollector:
-    def __init__(self):
-        self.base_url = "https://www.fatsecret.com.br"
-        self.search_url = "https://www.fatsecret.com.br/calorias-nutri%C3%A7%C3%A3o/search?q=Vitao"
+# Permite executar como script (python config/url_collector.py) ou importar como módulo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.brands import FATSECRET_URL, brand_file_prefix, brand_product_prefix, brand_search_url
+from config.discovery import DISCOVERY_SOURCES, SearchSource, build_sources
+from config.frontier import UrlFrontier, canonicalize_url
+from config.http_cache import get_shared_cache
+from config.http_session import get_shared_session
+from config.parsing import parse_search_page
+from config.rate_limiter import AdaptiveRateLimiter
+from config.store import ProductStore, add_store_argument
+
+class BrandUrlCollector:
+    """Coletor de URLs dos produtos de uma marca no FatSecret"""
+    
+    def __init__(self, brand, session=None, cache=None, use_cache=True, prefetch_window=1,
+                 rate_limiter=None, requests_per_second=0.5, metrics=None, store=None, frontier=None,
+                 sources=None):
+        self.brand = brand
+        self.base_url = FATSECRET_URL
+        self.search_url = brand_search_url(brand)
+        # Só os links de produtos da própria marca são coletados
+        self.product_prefix = brand_product_prefix(brand)
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        self.output_file = "dados/vitao_urls.json"
-        self.collected_urls = []
+        self.output_file = f"dados/{brand_file_prefix(brand)}_urls.json"
+        # Quantas URLs da marca a coleta entregou (as URLs em si ficam só na fronteira)
+        self.urls_found = 0
+        # Sessão com pool de conexões (keep-alive) compartilhada com o scraper
+        self.session = session or get_shared_session()
+        # Cache em disco das páginas de busca (revalidado com ETag/Last-Modified)
+        self.cache = (cache or get_shared_cache()) if use_cache else None
+        # Quantas páginas de busca são baixadas em paralelo (especulativamente) por vez
+        self.prefetch_window = max(1, prefetch_window)
+        # Orçamento de requisições (compartilhado com o scraper quando encadeados); começa em
+        # uma página a cada 2s e acelera enquanto o site responde bem
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter(requests_per_second)
+        # Registro opcional dos tempos de cada requisição (ver config/metrics.py)
+        self.metrics = metrics
+        # Banco SQLite opcional: cada URL encontrada é registrada (primeira/última vez vista)
+        self.store = store
+        # Fronteira de URLs: canonicaliza e descarta repetidas já na descoberta; com arquivo,
+        # permite retomar a coleta (ver config/frontier.py)
+        self.frontier = frontier if frontier is not None else UrlFrontier()
+        # Fontes de descoberta, consultadas em ordem; todas desembocam na mesma fronteira
+        # (ver config/discovery.py). Padrão: só a paginação da busca
+        self.sources = sources or [SearchSource()]
+        # Por fonte: (páginas com produtos, URLs novas)
+        self.source_stats = {}
+        # Páginas de descoberta que falharam: com alguma, a lista não está completa e o que não
+        # apareceu nela não pode ser dado como removido
+        self.failed_pages = []
+        self.complete = False
         
     def get_page_content(self, url):
         """Faz a requisição HTTP e retorna o conteúdo da página"""
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            return response.text
+            return self.session.get_text(url, headers=self.headers, cache=self.cache,
+                                         rate_limiter=self.rate_limiter, metrics=self.metrics)
         except requests.RequestException as e:
             print(f"Erro ao acessar {url}: {e}")
             return None
@@ -34,9 +80,11 @@ class VitaoUrlCollector:
         
         for link in product_links:
             href = link.get('href')
-            if href and '/calorias-nutri%C3%A7%C3%A3o/vitao/' in href:
-                # Constrói a URL completa
-                full_url = urljoin(self.base_url, href)
+            if not href:
+                continue
+            # Constrói a URL completa, já canônica ("ç" e "%C3%A7" viram a mesma URL)
+            full_url = canonicalize_url(urljoin(self.base_url, href))
+            if self.product_prefix in full_url:
                 urls.append(full_url)
                 print(f"  ✓ Encontrada: {link.get_text(strip=True)}")
         
@@ -47,100 +95,250 @@ class VitaoUrlCollector:
         no_results = soup.find('div', class_='searchNoResult')
         return no_results is not None
     
-    def collect_all_urls(self):
-        """Coleta todas as URLs dos produtos da Vitao"""
-        print("🔍 Iniciando coleta de URLs dos produtos da Vitao...")
+    def get_page_url(self, page):
+        """Constrói a URL da página de busca"""
+        if page == 0:
+            return self.search_url
+        return f"{self.search_url}&pg={page}"
+    
+    def process_search_page(self, page, content):
+        """Extrai as URLs de uma página de busca já baixada; retorna None quando a coleta deve parar"""
+        print(f"\n📄 Processando página {page + 1}...")
+        print(f"URL: {self.get_page_url(page)}")
+        
+        if not content:
+            print("❌ Erro ao acessar a página")
+            return None
+        
+        # Parse do HTML (somente os elementos usados na extração)
+        soup = parse_search_page(content)
+        
+        # Verifica se não há resultados
+        if self.check_no_results(soup):
+            print("🏁 Nenhum resultado encontrado. Coleta finalizada.")
+            return None
+        
+        # Extrai URLs da página atual
+        page_urls = self.extract_urls_from_page(soup)
         
+        if not page_urls:
+            print("⚠️  Nenhuma URL encontrada nesta página")
+            return None
+        
+        return page_urls
+    
+    def iter_paginated(self, page_url, process_page):
+        """Gera (página, URLs) de páginas numeradas, baixadas em janelas paralelas, até process_page devolver None"""
         page = 0
-        total_urls = 0
-        
-        while True:
-            # Constrói a URL da página
-            if page == 0:
-                page_url = self.search_url
-            else:
-                page_url = f"{self.search_url}&pg={page}"
-            
-            print(f"\n📄 Processando página {page + 1}...")
-            print(f"URL: {page_url}")
-            
-            # Obtém o conteúdo da página
-            content = self.get_page_content(page_url)
-            if not content:
-                print("❌ Erro ao acessar a página")
-                break
-            
-            # Parse do HTML
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            # Verifica se não há resultados
-            if self.check_no_results(soup):
-                print("🏁 Nenhum resultado encontrado. Coleta finalizada.")
-                break
-            
-            # Extrai URLs da página atual
-            page_urls = self.extract_urls_from_page(soup)
-            
-            if not page_urls:
-                print("⚠️  Nenhuma URL encontrada nesta página")
-                break
-            
-            # Adiciona URLs à lista
-            self.collected_urls.extend(page_urls)
-            total_urls += len(page_urls)
-            
-            print(f"✅ {len(page_urls)} URLs coletadas da página {page + 1}")
-            print(f"📊 Total acumulado: {total_urls} URLs")
-            
-            # Pausa entre requisições
-            time.sleep(2)
+        
+        # Baixa janelas de páginas k..k+W-1 em paralelo e as processa em ordem
+        with ThreadPoolExecutor(max_workers=self.prefetch_window) as executor:
+            while True:
+                pages = list(range(page, page + self.prefetch_window))
+                if len(pages) > 1:
+                    print(f"\n⚡ Baixando páginas {pages[0] + 1}-{pages[-1] + 1} em paralelo...")
+                contents = executor.map(lambda p: self.get_page_content(page_url(p)), pages)
+                
+                for page, content in zip(pages, contents):
+                    if not content:
+                        # Falha ao baixar não é o fim da paginação: as páginas seguintes não foram vistas
+                        self.discovery_failed(page_url(page))
+                    page_urls = process_page(page, content) if content else None
+                    if page_urls is None:
+                        # Páginas além do fim baixadas especulativamente são descartadas
+                        discarded = pages[-1] - page
+                        if discarded:
+                            print(f"🗑️  {discarded} páginas especulativas descartadas")
+                        return
+                    yield page, page_urls
+                
+                # Avança para a próxima página (o ritmo é controlado pelo rate_limiter)
+                page += 1
+    
+    def discovery_failed(self, url):
+        """Registra uma página de descoberta que não pôde ser baixada (a lista de URLs fica incompleta)"""
+        self.failed_pages.append(url)
+        print(f"❌ Falha ao baixar {url}: a lista de URLs desta execução está incompleta")
+    
+    def iter_urls(self):
+        """Gera as URLs dos produtos da marca à medida que as páginas de cada fonte são processadas"""
+        self.urls_found = 0
+        self.failed_pages = []
+        self.complete = False
+        
+        # Retomada: as URLs da execução anterior são entregues antes de voltar a paginar
+        # (o scraper pula as que já foram baixadas)
+        if self.frontier.resumed:
+            print(f"♻️  Retomando {self.frontier.resumed} URLs da fronteira: {self.frontier.path}")
+        for url in islice(self.frontier, self.frontier.resumed):
+            if self.product_prefix in url:
+                self.urls_found += 1
+                yield url
+        
+        for source in self.sources:
+            print(f"\n🔎 Fonte de URLs: {source.name}")
+            pages = found = 0
+            for page, page_urls in source.iter_pages(self):
+                # Só as URLs novas seguem adiante (repetidas, inclusive as de outras fontes, não chegam a ser baixadas)
+                new_urls = self.frontier.add_many(page_urls)
+                repeated = len(page_urls) - len(new_urls)
+                if self.store is not None:
+                    # Todas as URLs da página, inclusive as já vistas (nesta ou em execuções anteriores):
+                    # ultima_vez registra que o produto continua no site
+                    self.store.add_urls(list(dict.fromkeys(page_urls)), self.brand)
+                pages += 1
+                found += len(new_urls)
+                self.urls_found += len(new_urls)
+                
+                print(f"✅ {len(new_urls)} URLs coletadas da página {page + 1}"
+                      + (f" ({repeated} repetidas ignoradas)" if repeated else ""))
+                print(f"📊 Total acumulado: {self.urls_found} URLs")
+                yield from new_urls
             
-            # Avança para a próxima página
-            page += 1
+            self.source_stats[source.name] = (pages, found)
+            print(f"📌 Fonte {source.name}: {found} URLs novas em {pages} páginas")
         
-        print(f"\n🎉 Coleta finalizada! Total de {len(self.collected_urls)} URLs coletadas.")
-        return self.collected_urls
+        # Só chega aqui quem consumiu todas as fontes até o fim
+        self.complete = not self.failed_pages
+        if self.failed_pages:
+            print(f"⚠️  Descoberta incompleta: {len(self.failed_pages)} páginas falharam")
+    
+    def collect_all_urls(self):
+        """Coleta todas as URLs dos produtos da marca"""
+        print(f"🔍 Iniciando coleta de URLs dos produtos da {self.brand}...")
+        
+        for _ in self.iter_urls():
+            pass
+        
+        if self.store is not None:
+            self.store.flush()
+        print(f"\n🎉 Coleta finalizada! Total de {self.urls_found} URLs coletadas.")
+        self.session.print_stats()
+        self.rate_limiter.print_stats()
+        if self.cache:
+            self.cache.print_stats()
+        return self.urls_found
+    
+    def iter_collected_urls(self):
+        """URLs da marca na fronteira, na ordem de descoberta (lidas do disco quando ela é persistida)"""
+        return (url for url in self.frontier if self.product_prefix in url)
     
     def save_urls_to_json(self):
         """Salva as URLs coletadas em um arquivo JSON"""
         # Cria o diretório se não existir
         os.makedirs(os.path.dirname(self.output_file), exist_ok=True)
         
-        # Remove URLs duplicadas
-        unique_urls = list(set(self.collected_urls))
-        
-        # Salva no arquivo JSON
+        # A fronteira já descartou as repetidas; grava na ordem de descoberta, uma URL por vez
+        # (mesmo formato de json.dump com indent=2)
+        unique_urls = 0
         with open(self.output_file, 'w', encoding='utf-8') as jsonfile:
-            json.dump(unique_urls, jsonfile, indent=2, ensure_ascii=False)
+            jsonfile.write('[')
+            for url in self.iter_collected_urls():
+                jsonfile.write((',' if unique_urls else '') + '\n  ' + json.dumps(url, ensure_ascii=False))
+                unique_urls += 1
+            jsonfile.write('\n]' if unique_urls else ']')
+        
+        # Ao lado da lista, se a descoberta terminou sem falhas (o scraper só calcula remoções nesse caso)
+        with open(urls_status_file(self.output_file), 'w', encoding='utf-8') as statusfile:
+            json.dump({'completa': self.complete, 'paginas_com_falha': self.failed_pages},
+                      statusfile, indent=2, ensure_ascii=False)
         
         print(f"💾 URLs salvas em: {self.output_file}")
-        print(f"📝 {len(unique_urls)} URLs únicas salvas")
+        print(f"📝 {unique_urls} URLs únicas salvas")
         
         return unique_urls
     
     def run(self):
-        """Executa o processo completo de coleta"""
+        """Executa o processo completo de coleta; devolve quantas URLs foram salvas"""
         # Coleta todas as URLs
         self.collect_all_urls()
         
-        if self.collected_urls:
+        if self.urls_found:
             # Salva no arquivo JSON
             unique_urls = self.save_urls_to_json()
             
             # Mostra algumas URLs como exemplo
             print("\n📋 Exemplos de URLs coletadas:")
-            for i, url in enumerate(unique_urls[:5], 1):
+            for i, url in enumerate(islice(self.iter_collected_urls(), 5), 1):
                 print(f"  {i}. {url}")
             
-            if len(unique_urls) > 5:
-                print(f"  ... e mais {len(unique_urls) - 5} URLs")
-        else:
-            print("❌ Nenhuma URL foi coletada")
+            if unique_urls > 5:
+                print(f"  ... e mais {unique_urls - 5} URLs")
+            return unique_urls
+        
+        print("❌ Nenhuma URL foi coletada")
+        return 0
+
+class VitaoUrlCollector(BrandUrlCollector):
+    """Coletor de URLs dos produtos da Vitao"""
+    
+    def __init__(self, **kwargs):
+        super().__init__("Vitao", **kwargs)
+
+def urls_status_file(urls_file):
+    """Arquivo que indica se a lista de URLs salva está completa (ex: dados/vitao_urls.status.json)"""
+    return f"{os.path.splitext(urls_file)[0]}.status.json"
+
+def load_urls_complete(urls_file):
+    """Se a lista de URLs salva veio de uma descoberta sem falhas (sem o arquivo de status: não se sabe, False)"""
+    try:
+        with open(urls_status_file(urls_file), 'r', encoding='utf-8') as statusfile:
+            return bool(json.load(statusfile).get('completa'))
+    except (OSError, ValueError):
+        return False
+
+def frontier_file(brand):
+    """Arquivo padrão da fronteira persistida da marca"""
+    return f"dados/{brand_file_prefix(brand)}_fronteira.txt"
+
+def add_discovery_arguments(parser):
+    """Opções de linha de comando da descoberta de URLs: fontes e fronteira (compartilhadas com o pipeline)"""
+    parser.add_argument("--fontes", default=SearchSource.name,
+                        help=f"Fontes de URLs em ordem, separadas por vírgula ({', '.join(DISCOVERY_SOURCES)}; "
+                             f"padrão: {SearchSource.name})")
+    parser.add_argument("--sitemap", help="URL do sitemap usado pela fonte sitemap (padrão: <site>/sitemap.xml)")
+    parser.add_argument("--fronteira", nargs="?", const="",
+                        help="Persiste a fronteira de URLs para retomar a coleta (padrão: dados/<marca>_fronteira.txt)")
+    parser.add_argument("--bloom", type=int, default=0, metavar="N",
+                        help="Deduplica com um filtro de Bloom dimensionado para N URLs (memória fixa)")
+
+def frontier_from_args(args):
+    """Fronteira configurada pelas opções --fronteira/--bloom"""
+    path = None
+    if args.fronteira is not None:
+        path = args.fronteira or frontier_file(args.marca)
+    return UrlFrontier(path, bloom_capacity=args.bloom)
+
+def sources_from_args(parser, args):
+    """Fontes de descoberta escolhidas em --fontes (erro de uso se alguma não existe)"""
+    try:
+        return build_sources([name.strip() for name in args.fontes.split(',') if name.strip()], args.sitemap)
+    except ValueError as e:
+        parser.error(str(e))
 
 def main():
     """Função principal"""
-    collector = VitaoUrlCollector()
-    collector.run()
+    parser = argparse.ArgumentParser(description="Coletor de URLs dos produtos de uma marca")
+    parser.add_argument("--marca", default="Vitao", help="Marca a coletar (padrão: Vitao)")
+    parser.add_argument("--janela", type=int, default=1,
+                        help="Páginas de busca baixadas em paralelo por vez (especulativo)")
+    parser.add_argument("--rps", type=float, default=0.5,
+                        help="Requisições por segundo iniciais (ajustada conforme as respostas)")
+    add_store_argument(parser, help="Também registra as URLs no banco SQLite")
+    add_discovery_arguments(parser)
+    args = parser.parse_args()
+    
+    sources = sources_from_args(parser, args)
+    store = ProductStore(args.sqlite) if args.sqlite else None
+    frontier = frontier_from_args(args)
+    collector = BrandUrlCollector(args.marca, prefetch_window=args.janela, requests_per_second=args.rps,
+                                  store=store, frontier=frontier, sources=sources)
+    try:
+        collector.run()
+    finally:
+        frontier.close()
+        if store is not None:
+            store.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,59 @@
+from urllib.parse import unquote, urljoin, urlsplit
+
+from config.nutrients import NUTRIENT_TABLE, parse_int
+from config.parsing import page_links
+from config.servings import parse_serving, parse_serving_slug
+
+def _product_path(url):
+    """Caminho do produto sem o slug da porção (/calorias-nutrição/marca/produto)"""
+    return unquote(urlsplit(url).path).rstrip('/').rsplit('/', 1)[0]
+
+def serving_links(content, url, root=None):
+    """[(texto da porção, URL)] das outras porções do mesmo produto listadas na página (root: árvore lxml já montada)"""
+    # A tabela "Tamanhos de Porções Comuns" aponta para as outras porções
+    base_path = _product_path(url)
+    found, seen = [], {url}
+    for text, href in page_links(content, root):
+        if not href:
+            continue
+        variant_url = urljoin(url, href)
+        # Mesmo produto, outro slug de porção
+        if variant_url in seen or _product_path(variant_url) != base_path:
+            continue
+        seen.add(variant_url)
+        found.append((text, variant_url))
+    return found
+
+def variant_serving(text, url):
+    """Porção da variante: texto do link e, se ele não traz o equivalente em g/ml, o slug da URL"""
+    serving = parse_serving(text)
+    if serving.equivalente is None or not serving.unidade:
+        from_slug = parse_serving_slug(urlsplit(url).path.rsplit('/', 1)[-1])
+        if from_slug is not None and from_slug.equivalente is not None and from_slug.unidade:
+            return from_slug
+    return serving
+
+def derive_variant(base_row, serving, url):
+    """Linha da variante calculada a partir da porção base, ou None se a proporção não é conhecida"""
+    try:
+        base_amount = float(base_row.get('porcao') or 0)
+    except (TypeError, ValueError):
+        return None
+    unit = base_row.get('unidade_porcao')
+    # Só escala entre porções com equivalente na mesma unidade (g com g, ml com ml)
+    if not unit or base_amount <= 0 or serving.equivalente is None or serving.unidade != unit:
+        return None
+
+    ratio = serving.equivalente / base_amount
+    # A impressão digital da base foi calculada de outra página: não vale para a variante
+    row = dict(base_row, url=url, porcao=serving.equivalente, unidade_porcao=unit, impressao_digital='')
+    for spec in NUTRIENT_TABLE.values():
+        try:
+            value = float(base_row.get(spec.field) or 0) * ratio
+        except (TypeError, ValueError):
+            continue
+        # Mesma precisão da tabela do FatSecret (inteiros para kcal/mg, uma casa para gramas)
+        row[spec.field] = round(value) if spec.parser is parse_int else round(value, 1)
+    amount = round(serving.equivalente, 3)
+    row['porcao'] = int(amount) if amount.is_integer() else amount
+    return row
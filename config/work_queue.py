@@ -0,0 +1,316 @@
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+
+# Permite executar como script (python config/work_queue.py) ou importar como módulo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.async_scraper import AsyncBrandScraper
+from config.scraper import BrandFatSecretScraper
+from config.store import ProductStore, add_store_argument
+from config.url_collector import BrandUrlCollector
+
+QUEUE_FILE = "dados/fila.db"
+# Segundos que uma URL fica reservada para um worker antes de voltar para a fila
+VISIBILITY_TIMEOUT = 300
+MAX_ATTEMPTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tarefas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL UNIQUE,
+    marca TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pendente',
+    tentativas INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    reservada_ate REAL,
+    resultado TEXT,
+    atualizado_em REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tarefas_fila ON tarefas (status, reservada_ate);
+CREATE INDEX IF NOT EXISTS idx_tarefas_marca ON tarefas (marca, status);
+"""
+
+def default_worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+class WorkQueue:
+    """Fila de URLs em SQLite com reservas temporárias (visibility timeout), compartilhada por vários workers"""
+
+    def __init__(self, db_file=QUEUE_FILE, visibility_timeout=VISIBILITY_TIMEOUT, max_attempts=MAX_ATTEMPTS):
+        self.db_file = db_file
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+        # Autocommit: as transações são abertas explicitamente (BEGIN IMMEDIATE) para reservar sem corrida
+        self._conn = sqlite3.connect(db_file, timeout=60, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        # O modo asyncio reserva URLs a partir da thread que alimenta o event loop
+        self._lock = threading.RLock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def _transaction(self):
+        return _ImmediateTransaction(self._conn, self._lock)
+
+    def enqueue(self, urls, brand):
+        """Acrescenta URLs à fila (URLs já presentes, concluídas ou não, são ignoradas); devolve quantas entraram"""
+        now = time.time()
+        with self._transaction():
+            before = self._conn.total_changes
+            self._conn.executemany("INSERT OR IGNORE INTO tarefas (url, marca, atualizado_em) VALUES (?, ?, ?)",
+                                   [(url, brand, now) for url in urls])
+            return self._conn.total_changes - before
+
+    def lease(self, worker, limit=32, brand=None):
+        """Reserva até limit URLs pendentes ou com reserva vencida (worker que morreu) para o worker"""
+        now = time.time()
+        # Reserva vencida só volta a ser reservada enquanto restam tentativas (o worker pode ter morrido
+        # justamente por causa da URL)
+        query = ("SELECT url FROM tarefas WHERE (status = 'pendente' OR "
+                 "(status = 'em_andamento' AND reservada_ate < ? AND tentativas < ?))"
+                 + (" AND marca = ?" if brand else "") + " ORDER BY id LIMIT ?")
+        params = (now, self.max_attempts, brand, limit) if brand else (now, self.max_attempts, limit)
+        with self._transaction():
+            self._give_up_expired(now)
+            urls = [row['url'] for row in self._conn.execute(query, params)]
+            self._conn.executemany(
+                "UPDATE tarefas SET status = 'em_andamento', worker = ?, reservada_ate = ?, "
+                "tentativas = tentativas + 1, atualizado_em = ? WHERE url = ?",
+                [(worker, now + self.visibility_timeout, now, url) for url in urls])
+        return urls
+
+    def extend(self, worker, urls):
+        """Renova a reserva das URLs que o worker ainda está processando (heartbeat)"""
+        now = time.time()
+        with self._transaction():
+            self._conn.executemany(
+                "UPDATE tarefas SET reservada_ate = ? WHERE url = ? AND worker = ? AND status = 'em_andamento'",
+                [(now + self.visibility_timeout, url, worker) for url in urls])
+
+    def complete(self, worker, results):
+        """Grava os resultados [(url, linha ou None)] de uma vez; falhas voltam para a fila até max_attempts"""
+        now = time.time()
+        done = [(json.dumps(row, ensure_ascii=False), now, url, worker) for url, row in results if row]
+        failed = [url for url, row in results if not row]
+        with self._transaction():
+            # Só quem ainda detém a reserva grava: um worker atrasado não sobrescreve outro
+            self._conn.executemany(
+                "UPDATE tarefas SET status = 'concluida', resultado = ?, reservada_ate = NULL, atualizado_em = ? "
+                "WHERE url = ? AND worker = ? AND status = 'em_andamento'", done)
+            self._conn.executemany(
+                "UPDATE tarefas SET status = CASE WHEN tentativas >= ? THEN 'falha' ELSE 'pendente' END, "
+                "reservada_ate = NULL, atualizado_em = ? WHERE url = ? AND worker = ? AND status = 'em_andamento'",
+                [(self.max_attempts, now, url, worker) for url in failed])
+
+    def give_up_expired(self):
+        """Reservas vencidas que já esgotaram as tentativas passam a 'falha'"""
+        with self._transaction():
+            self._give_up_expired(time.time())
+
+    def _give_up_expired(self, now):
+        self._conn.execute(
+            "UPDATE tarefas SET status = 'falha', reservada_ate = NULL, atualizado_em = ? "
+            "WHERE status = 'em_andamento' AND reservada_ate < ? AND tentativas >= ?",
+            (now, now, self.max_attempts))
+
+    def counts(self, brand=None):
+        """Quantidade de URLs por status"""
+        query = "SELECT status, COUNT(*) AS n FROM tarefas" + (" WHERE marca = ?" if brand else "") + " GROUP BY status"
+        with self._lock:
+            return {row['status']: row['n'] for row in self._conn.execute(query, (brand,) if brand else ())}
+
+    def results(self, brand):
+        """Linhas concluídas da marca, na ordem em que as URLs entraram na fila"""
+        with self._lock:
+            rows = self._conn.execute("SELECT resultado FROM tarefas WHERE marca = ? AND status = 'concluida' "
+                                      "ORDER BY id", (brand,)).fetchall()
+        return [json.loads(row['resultado']) for row in rows]
+
+    def failed_urls(self, brand):
+        with self._lock:
+            return [row['url'] for row in
+                    self._conn.execute("SELECT url FROM tarefas WHERE marca = ? AND status = 'falha' ORDER BY id",
+                                       (brand,))]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class _ImmediateTransaction:
+    """BEGIN IMMEDIATE ... COMMIT/ROLLBACK: trava a escrita no início, evitando que dois workers reservem a mesma URL"""
+
+    def __init__(self, conn, lock):
+        self.conn = conn
+        self.lock = lock
+
+    def __enter__(self):
+        self.lock.acquire()
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self.lock.release()
+            raise
+        return self.conn
+
+    def __exit__(self, exc_type, *exc):
+        try:
+            self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.lock.release()
+
+class QueueWorker:
+    """Worker: reserva lotes de URLs, faz o scraping com o scraper informado e devolve os resultados à fila"""
+
+    def __init__(self, work_queue, scraper, worker_id=None, batch_size=32, idle_wait=5.0):
+        self.queue = work_queue
+        self.scraper = scraper
+        self.worker_id = worker_id or default_worker_id()
+        self.batch_size = max(1, batch_size)
+        self.idle_wait = idle_wait
+        self.processed = 0
+        self.failed = 0
+        # URLs reservadas ainda sem resultado e resultados ainda não gravados na fila
+        self.outstanding = set()
+        self.results = []
+
+    def leased_urls(self):
+        """URLs reservadas sob demanda: o scraper puxa um novo lote quando precisa de mais trabalho"""
+        while True:
+            urls = self.queue.lease(self.worker_id, self.batch_size, brand=self.scraper.brand)
+            if not urls:
+                return
+            self.outstanding.update(urls)
+            yield from urls
+
+    def flush(self):
+        """Devolve à fila os resultados acumulados"""
+        if self.results:
+            self.queue.complete(self.worker_id, self.results)
+            self.results = []
+
+    def process(self):
+        """Processa URLs enquanto houver reservas disponíveis; devolve quantas foram processadas"""
+        self.outstanding = set()
+        self.results = []
+        last_beat = time.monotonic()
+        count = 0
+        try:
+            for url, product_data in self.scraper.iter_results(self.leased_urls()):
+                count += 1
+                self.outstanding.discard(url)
+                self.results.append((url, product_data))
+                if product_data:
+                    self.processed += 1
+                    print(f"✅ {product_data['nome_produto']}")
+                else:
+                    self.failed += 1
+                    print(f"❌ Falha ao extrair dados da URL: {url}")
+                if len(self.results) >= self.batch_size:
+                    self.flush()
+                # Heartbeat: URLs ainda em voo não perdem a reserva para outro worker
+                if self.outstanding and time.monotonic() - last_beat > self.queue.visibility_timeout / 3:
+                    self.queue.extend(self.worker_id, self.outstanding)
+                    last_beat = time.monotonic()
+        finally:
+            # Inclusive na interrupção: o que já foi extraído não precisa ser refeito
+            self.flush()
+        return count
+
+    def run(self, wait=True):
+        """Consome a fila até ela esvaziar (com wait, espera reservas de outros workers vencerem ou terminarem)"""
+        print(f"👷 Worker {self.worker_id} consumindo {self.queue.db_file} ({self.scraper.brand})")
+        while True:
+            if self.process():
+                continue
+            self.queue.give_up_expired()
+            counts = self.queue.counts(self.scraper.brand)
+            if not wait or not counts.get('em_andamento'):
+                break
+            # Outros workers ainda têm URLs reservadas: se um deles morrer, a reserva vence e volta para cá
+            time.sleep(self.idle_wait)
+
+        print(f"\n🎉 Worker {self.worker_id}: {self.processed} produtos, {self.failed} falhas")
+        self.scraper.print_stats()
+        return self.processed
+
+def enqueue_brand(work_queue, brand, collector=None):
+    """Coordenador: coleta as URLs da marca e as coloca na fila"""
+    collector = collector or BrandUrlCollector(brand)
+    total = collector.run()
+    added = work_queue.enqueue(collector.iter_collected_urls(), brand) if total else 0
+    print(f"📥 {added} URLs novas na fila ({total - added} já estavam nela)")
+    return added
+
+def merge_results(work_queue, brand, output_file=None, store=None):
+    """Etapa única de mesclagem: grava o CSV da marca (e o banco SQLite) com os resultados de todos os workers"""
+    scraper = BrandFatSecretScraper(brand, use_cache=False, use_archive=False)
+    if output_file:
+        scraper.output_file = output_file
+    rows = work_queue.results(brand)
+    counts = work_queue.counts(brand)
+    if counts.get('pendente') or counts.get('em_andamento'):
+        print(f"⚠️  A fila ainda tem URLs não concluídas: {counts}")
+    scraper.save_to_csv(rows)
+    failed = work_queue.failed_urls(brand)
+    if failed:
+        print(f"❌ {len(failed)} URLs falharam em todas as tentativas")
+    if store is not None:
+        store.add_urls([row['url'] for row in rows] + failed, brand)
+        for row in rows:
+            store.upsert_nutrition(row)
+        for url in failed:
+            store.mark_failed(url)
+        store.flush()
+    return len(rows)
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Fila de trabalho para scraping distribuído em vários workers")
+    parser.add_argument("modo", choices=["coordenador", "worker", "mesclar", "status"],
+                        help="coordenador: coleta as URLs e enfileira; worker: processa a fila; "
+                             "mesclar: grava o CSV com os resultados; status: contagens da fila")
+    parser.add_argument("--marca", default="Vitao", help="Marca (padrão: Vitao)")
+    parser.add_argument("--fila", default=QUEUE_FILE, help="Arquivo SQLite da fila (compartilhado entre os workers)")
+    parser.add_argument("--reserva", type=float, default=VISIBILITY_TIMEOUT,
+                        help="Segundos de reserva de cada lote antes de voltar para a fila")
+    parser.add_argument("--tentativas", type=int, default=MAX_ATTEMPTS, help="Tentativas por URL antes de desistir")
+    parser.add_argument("--lote", type=int, default=32, help="URLs reservadas por vez (worker)")
+    parser.add_argument("--workers", type=int, default=8, help="Downloads simultâneos (worker)")
+    parser.add_argument("--rps", type=float, default=4.0, help="Requisições por segundo iniciais deste worker")
+    parser.add_argument("--assincrono", type=int, nargs="?", const=100, default=0, metavar="CONCORRENCIA",
+                        help="Worker com downloads em asyncio (requer aiohttp)")
+    parser.add_argument("--sem-cache", action="store_true", help="Ignora o cache em disco das páginas")
+    parser.add_argument("--saida", help="CSV de saída da mesclagem (padrão: dados/<marca>_nutricional.csv)")
+    add_store_argument(parser, help="Na mesclagem, também grava os produtos em SQLite")
+    args = parser.parse_args()
+
+    work_queue = WorkQueue(args.fila, visibility_timeout=args.reserva, max_attempts=args.tentativas)
+    try:
+        if args.modo == "coordenador":
+            enqueue_brand(work_queue, args.marca)
+        elif args.modo == "worker":
+            options = dict(max_workers=args.workers, requests_per_second=args.rps, use_cache=not args.sem_cache)
+            if args.assincrono:
+                scraper = AsyncBrandScraper(args.marca, max_concurrency=args.assincrono, **options)
+            else:
+                scraper = BrandFatSecretScraper(args.marca, **options)
+            QueueWorker(work_queue, scraper, batch_size=args.lote).run()
+        elif args.modo == "mesclar":
+            store = ProductStore(args.sqlite) if args.sqlite else None
+            try:
+                merge_results(work_queue, args.marca, args.saida, store)
+            finally:
+                if store is not None:
+                    store.close()
+        print(f"📊 Fila {args.fila} ({args.marca}): {work_queue.counts(args.marca)}")
+    finally:
+        work_queue.close()
+
+if __name__ == "__main__":
+    main()
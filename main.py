@@ -18,10 +18,11 @@ import os
 import sys
 import time
 import glob
-import subprocess
 from datetime import datetime
 from typing import List, Dict, Optional
 
+from config.pipeline import CollectionPipeline
+
 # ============================================================================
 # 🎨 SISTEMA DE CORES ANSI PARA TERMINAL
 # ============================================================================
@@ -103,7 +104,7 @@ def obter_escolha() -> str:
         sys.exit(0)
 
 # ============================================================================
-# 🎯 FUNÇÕES ESPECÍFICAS DO SCRAPER BELIVE
+# 🎯 FUNÇÕES ESPECÍFICAS DO SCRAPER VITAO
 # ============================================================================
 
 def executar_coleta_urls():
@@ -122,16 +123,14 @@ def executar_coleta_urls():
         try:
             mostrar_barra_progresso("Iniciando coleta de URLs", 1.5)
             
-            # Executa o coletor de URLs
-            resultado = subprocess.run([
-                sys.executable, "config/url_collector.py"
-            ], capture_output=True, text=True)
+            # Executa o coletor de URLs no próprio processo
+            urls = CollectionPipeline().collect_urls()
             
-            if resultado.returncode == 0:
+            if urls:
                 print(f"{Cores.VERDE}✅ URLs coletadas com sucesso!{Cores.RESET}")
                 print(f"{Cores.CIANO}📁 Arquivo salvo em: dados/vitao_urls.json{Cores.RESET}")
             else:
-                print(f"{Cores.VERMELHO}❌ Erro durante a coleta: {resultado.stderr}{Cores.RESET}")
+                print(f"{Cores.VERMELHO}❌ Nenhuma URL foi coletada{Cores.RESET}")
             
         except Exception as e:
             print(f"\n{Cores.VERMELHO}❌ Erro durante execução: {e}{Cores.RESET}")
@@ -160,16 +159,14 @@ def executar_coleta_dados():
         try:
             mostrar_barra_progresso("Iniciando coleta de dados nutricionais", 1.5)
             
-            # Executa o scraper
-            resultado = subprocess.run([
-                sys.executable, "config/scraper.py"
-            ], capture_output=True, text=True)
+            # Executa o scraper no próprio processo
+            produtos = CollectionPipeline().scrape()
             
-            if resultado.returncode == 0:
+            if produtos:
                 print(f"{Cores.VERDE}✅ Dados nutricionais coletados com sucesso!{Cores.RESET}")
                 print(f"{Cores.CIANO}📁 Arquivo salvo em: dados/vitao_nutricional.csv{Cores.RESET}")
             else:
-                print(f"{Cores.VERMELHO}❌ Erro durante a coleta: {resultado.stderr}{Cores.RESET}")
+                print(f"{Cores.VERMELHO}❌ Nenhum dado nutricional foi extraído{Cores.RESET}")
             
         except Exception as e:
             print(f"\n{Cores.VERMELHO}❌ Erro durante execução: {e}{Cores.RESET}")
@@ -183,43 +180,27 @@ def executar_coleta_completa():
     
     print(f"\n{Cores.AMARELO}⚠️  ATENÇÃO:{Cores.RESET}")
     print(f"   • Esta operação pode demorar {Cores.VERMELHO}5-10 minutos{Cores.RESET}")
-    print(f"   • Serão executadas duas etapas automaticamente")
-    print(f"   • 1ª: Coleta de URLs dos produtos")
-    print(f"   • 2ª: Coleta de dados nutricionais")
+    print(f"   • A coleta de URLs e a de dados nutricionais rodam juntas")
+    print(f"   • Os produtos são baixados assim que suas URLs são encontradas")
     
     confirmar = input(f"\n{Cores.MAGENTA}🤔 Continuar? (s/N): {Cores.RESET}").lower()
     
     if confirmar in ['s', 'sim', 'y', 'yes']:
         try:
-            # Etapa 1: Coleta de URLs
-            print(f"\n{Cores.VERDE}🔄 ETAPA 1: Coletando URLs...{Cores.RESET}")
-            mostrar_barra_progresso("Coletando URLs dos produtos", 2.0)
-            
-            resultado_urls = subprocess.run([
-                sys.executable, "config/url_collector.py"
-            ], capture_output=True, text=True)
-            
-            if resultado_urls.returncode != 0:
-                print(f"{Cores.VERMELHO}❌ Erro na coleta de URLs: {resultado_urls.stderr}{Cores.RESET}")
-                return
-            
-            print(f"{Cores.VERDE}✅ URLs coletadas com sucesso!{Cores.RESET}")
-            
-            # Etapa 2: Coleta de dados
-            print(f"\n{Cores.VERDE}🔄 ETAPA 2: Coletando dados nutricionais...{Cores.RESET}")
-            mostrar_barra_progresso("Coletando dados nutricionais", 2.0)
+            # URLs seguem direto para o scraper: os produtos começam a ser baixados
+            # enquanto as páginas de busca ainda estão sendo percorridas
+            print(f"\n{Cores.VERDE}🔄 Coletando URLs e dados nutricionais em paralelo...{Cores.RESET}")
+            mostrar_barra_progresso("Iniciando coleta completa", 1.5)
             
-            resultado_dados = subprocess.run([
-                sys.executable, "config/scraper.py"
-            ], capture_output=True, text=True)
+            produtos = CollectionPipeline().run()
             
-            if resultado_dados.returncode == 0:
+            if produtos:
                 print(f"{Cores.VERDE}✅ Coleta completa finalizada com sucesso!{Cores.RESET}")
                 print(f"{Cores.CIANO}📁 Arquivos gerados:{Cores.RESET}")
                 print(f"   • dados/vitao_urls.json")
                 print(f"   • dados/vitao_nutricional.csv")
             else:
-                print(f"{Cores.VERMELHO}❌ Erro na coleta de dados: {resultado_dados.stderr}{Cores.RESET}")
+                print(f"{Cores.VERMELHO}❌ Nenhum dado nutricional foi extraído{Cores.RESET}")
             
         except Exception as e:
             print(f"\n{Cores.VERMELHO}❌ Erro: {e}{Cores.RESET}")
@@ -262,8 +243,8 @@ def listar_arquivos_gerados():
     
     # Mostra arquivos esperados
     print(f"{Cores.VERDE}📋 Arquivos esperados do sistema:{Cores.RESET}")
-    print(f"   • dados/belive_urls.json")
-    print(f"   • dados/belive_nutricional.csv")
+    print(f"   • dados/vitao_urls.json")
+    print(f"   • dados/vitao_nutricional.csv")
 
 def limpar_dados_antigos():
     """Remove arquivos antigos"""
@@ -303,22 +284,22 @@ def limpar_dados_antigos():
 
 def mostrar_sobre():
     """Exibe informações sobre o programa"""
-    print(f"\n{Cores.CIANO}{Cores.BOLD}📖 SOBRE O SCRAPER BELIVE{Cores.RESET}")
+    print(f"\n{Cores.CIANO}{Cores.BOLD}📖 SOBRE O SCRAPER VITAO{Cores.RESET}")
     print(f"{Cores.AZUL}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Cores.RESET}")
     
     print(f"\n{Cores.VERDE}🎯 OBJETIVO:{Cores.RESET}")
-    print(f"Coletar dados nutricionais completos dos produtos da Belive")
+    print(f"Coletar dados nutricionais completos dos produtos da Vitao")
     print(f"disponíveis no site FatSecret Brasil.")
     
     print(f"\n{Cores.VERDE}🔧 FUNCIONALIDADES:{Cores.RESET}")
-    print(f"• 🔍 Coleta URLs dos produtos da Belive")
+    print(f"• 🔍 Coleta URLs dos produtos da Vitao")
     print(f"• 📊 Extrai dados nutricionais detalhados")
     print(f"• 💾 Gera relatórios em CSV e JSON")
     print(f"• 🎨 Interface interativa e amigável")
     
     print(f"\n{Cores.VERDE}📁 ARQUIVOS GERADOS:{Cores.RESET}")
-    print(f"• JSON: dados/belive_urls.json (URLs coletadas)")
-    print(f"• CSV: dados/belive_nutricional.csv (dados nutricionais)")
+    print(f"• JSON: dados/vitao_urls.json (URLs coletadas)")
+    print(f"• CSV: dados/vitao_nutricional.csv (dados nutricionais)")
     
     print(f"\n{Cores.VERDE}🛠️  TECNOLOGIAS:{Cores.RESET}")
     print(f"• Python 3.x")
@@ -327,7 +308,7 @@ def mostrar_sobre():
     print(f"• Pandas (manipulação de dados)")
     
     print(f"\n{Cores.VERDE}👥 DESENVOLVEDOR:{Cores.RESET}")
-    print(f"• Scraper Belive Team")
+    print(f"• Scraper Vitao Team")
     print(f"• Versão: 1.0")
     print(f"• Data: {datetime.now().strftime('%d/%m/%Y')}")
 
@@ -361,7 +342,7 @@ def main():
             elif escolha == '6':
                 mostrar_sobre()
             elif escolha == '7':
-                print(f"\n{Cores.VERDE}👋 Obrigado por usar o Scraper Belive!{Cores.RESET}")
+                print(f"\n{Cores.VERDE}👋 Obrigado por usar o Scraper Vitao!{Cores.RESET}")
                 break
             else:
                 print(f"\n{Cores.VERMELHO}❌ Opção inválida! Digite um número de 1 a 7.{Cores.RESET}")
@@ -0,0 +1,35 @@
+import csv
+
+from config.csv_stream import CsvRowIndex
+
+ROWS = [
+    {'url': "https://a", 'nome_produto': "Granola", 'impressao_digital': "h1"},
+    # Campo entre aspas com quebra de linha e aspas escapadas ocupa várias linhas do arquivo
+    {'url': "https://b", 'nome_produto': 'Mix "tradicional"\nde castanhas', 'impressao_digital': "h2"},
+    {'url': "https://c", 'nome_produto': "", 'impressao_digital': "h3"},
+]
+
+def write_csv(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+def test_index_reads_rows_on_demand(tmp_path):
+    path = str(tmp_path / "produtos.csv")
+    write_csv(path, ROWS + [dict(ROWS[0], impressao_digital="h4")])
+    index = CsvRowIndex(path, value=lambda row: row['impressao_digital'] if row['nome_produto'] else '')
+
+    # URL repetida: vale a última linha
+    assert list(index) == ["https://a", "https://b", "https://c"]
+    assert [index.value(url) for url in index] == ["h4", "h2", ""]
+    assert index.get("https://b") == ROWS[1]
+    assert index.get("https://a")['impressao_digital'] == "h4"
+    assert index.get("https://x") is None and index.value("https://x") is None
+
+    index.close()
+    assert len(index) == 0 and index.get("https://b") is None
+
+def test_missing_file_is_an_empty_index(tmp_path):
+    index = CsvRowIndex(str(tmp_path / "nao_existe.csv"))
+    assert len(index) == 0 and "https://a" not in index
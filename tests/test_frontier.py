@@ -0,0 +1,49 @@
+import pytest
+
+from config.frontier import BloomFilter, UrlFrontier, canonicalize_url
+
+CANONICAL = "https://www.fatsecret.com.br/calorias-nutri%C3%A7%C3%A3o/vitao/granola/1-por%C3%A7%C3%A3o"
+
+@pytest.mark.parametrize("url", [
+    CANONICAL,
+    "https://www.fatsecret.com.br/calorias-nutrição/vitao/granola/1-porção",
+    "https://www.fatsecret.com.br/calorias-nutri%c3%a7%c3%a3o/vitao/granola/1-por%C3%A7%C3%A3o",
+    "HTTPS://WWW.FatSecret.com.br:443/calorias-nutrição/vitao/granola/1-porção/#tabela",
+    " https://www.fatsecret.com.br/calorias-nutrição/vitao/granola/1-porção/ ",
+])
+def test_canonicalize_url_variants_and_idempotence(url):
+    canonical = canonicalize_url(url)
+    assert canonical == CANONICAL
+    assert canonicalize_url(canonical) == canonical
+
+def test_canonicalize_url_keeps_query_and_other_ports():
+    url = "http://127.0.0.1:8765/calorias-nutrição/search?q=Vitao&pg=2"
+    assert canonicalize_url(url) == "http://127.0.0.1:8765/calorias-nutri%C3%A7%C3%A3o/search?q=Vitao&pg=2"
+    assert canonicalize_url(canonicalize_url(url)) == canonicalize_url(url)
+
+@pytest.mark.parametrize("bloom_capacity", [0, 1000])
+def test_frontier_drops_repeated_urls(bloom_capacity):
+    frontier = UrlFrontier(bloom_capacity=bloom_capacity)
+    raw = "https://www.fatsecret.com.br/calorias-nutrição/vitao/granola/1-porção"
+    assert frontier.add_many([raw, CANONICAL, CANONICAL + "/"]) == [CANONICAL]
+    assert len(frontier) == 1 and frontier.duplicates == 2
+    assert raw in frontier
+
+def test_frontier_resumes_from_its_file(tmp_path):
+    path = str(tmp_path / "fronteira.txt")
+    frontier = UrlFrontier(path)
+    frontier.add_many(["https://a/1", "https://a/2"])
+    frontier.close()
+
+    resumed = UrlFrontier(path)
+    assert resumed.resumed == 2 and len(resumed) == 2
+    assert resumed.add_many(["https://a/2", "https://a/3"]) == ["https://a/3"]
+    assert list(resumed) == ["https://a/1", "https://a/2", "https://a/3"]
+    resumed.close()
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, error_rate=0.01)
+    urls = [f"https://a/{i}" for i in range(1000)]
+    for url in urls:
+        bloom.add(url)
+    assert all(url in bloom for url in urls)
@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+from config.normalize import NUTRIENT_FIELDS, load_rows, normalize
+
+BASE_URL = "https://www.fatsecret.com.br/calorias-nutri%C3%A7%C3%A3o/vitao/granola/"
+
+def legacy_frame(servings):
+    # CSV anterior à coluna unidade_porcao: "porcao" é o número lido do texto da porção
+    frame = pd.DataFrame({'url': [BASE_URL + slug for slug, _ in servings],
+                          'porcao': [portion for _, portion in servings]})
+    for name in NUTRIENT_FIELDS:
+        frame[name] = 10.0
+    return frame
+
+def test_legacy_rows_infer_ml_only_from_the_serving():
+    frame = normalize(legacy_frame([("1-2-xicara", 45), ("200-ml", 200), ("1-xicara", 1), ("1-colher-de-sopa", 1)]))
+
+    # "1/2 xícara (45 g)": o valor gravado é em g, a xícara não torna a porção líquida
+    assert list(frame['unidade_base']) == ['g', 'ml', 'ml', 'g']
+    assert list(frame['porcao_base']) == [45.0, 200.0, 240.0, 15.0]
+    assert list(frame['calorias_100']) == pytest.approx([10.0 * 100 / 45, 5.0, 10.0 * 100 / 240, 10.0 * 100 / 15])
+
+def test_load_rows_keeps_the_latest_collection_of_each_url(tmp_path):
+    older, newer = tmp_path / "a_nutricional.csv", tmp_path / "b_nutricional.csv"
+    pd.DataFrame({'url': [BASE_URL + "100-g", BASE_URL + "1-xicara"], 'porcao': [100, 1],
+                  'calorias': [400, 500], 'data_coleta': ["2026-01-02T10:00:00", "2026-01-01T10:00:00"]}
+                 ).to_csv(newer, index=False)
+    pd.DataFrame({'url': [BASE_URL + "100-g"], 'porcao': [100], 'calorias': [390],
+                  'data_coleta': ["2026-01-01T10:00:00"]}).to_csv(older, index=False)
+
+    frame = load_rows([str(newer), str(older)])
+    assert dict(zip(frame['url'], frame['calorias'])) == {BASE_URL + "100-g": 400, BASE_URL + "1-xicara": 500}
@@ -0,0 +1,52 @@
+import csv
+import json
+import re
+from collections import Counter
+
+import pytest
+
+from benchmarks.sample_pages import PRODUCT_PATH, product_page
+from config.scraper import BrandFatSecretScraper
+
+URLS = ["https://www.fatsecret.com.br" + PRODUCT_PATH.format(brand="vitao", index=i) for i in range(10)]
+
+class LocalScraper(BrandFatSecretScraper):
+    """Scraper que lê as páginas de produto geradas localmente em vez de acessar o site"""
+
+    def get_page_content(self, url):
+        return product_page(int(re.search(r'produto-(\d+)', url).group(1)))
+
+@pytest.fixture
+def scrape(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    def scrape(urls, incremental=False, urls_complete=True):
+        scraper = LocalScraper("Vitao", use_cache=False, use_archive=False, max_workers=2)
+        scraper.run(incremental=incremental, urls=list(urls), urls_complete=urls_complete)
+        return scraper
+
+    return scrape
+
+def feed(scraper):
+    with open(scraper.changes_file, encoding='utf-8') as changes:
+        return [json.loads(line) for line in changes]
+
+def csv_urls(scraper):
+    with open(scraper.output_file, newline='', encoding='utf-8') as csvfile:
+        return [row['url'] for row in csv.DictReader(csvfile)]
+
+def test_each_removal_is_reported_once_without_the_store(scrape):
+    scrape(URLS)
+    for incremental in (True, True, False, False):
+        scraper = scrape(URLS[:7], incremental=incremental)
+
+    removed = Counter(change['url'] for change in feed(scraper) if change['tipo'] == 'removido')
+    assert removed == {url: 1 for url in URLS[7:]}
+    assert csv_urls(scraper) == URLS[:7]
+
+def test_incomplete_list_keeps_products_and_reports_no_removal(scrape):
+    scrape(URLS)
+    scraper = scrape(URLS[:7], incremental=True, urls_complete=False)
+
+    assert not [change for change in feed(scraper) if change['tipo'] == 'removido']
+    assert sorted(csv_urls(scraper)) == sorted(URLS)
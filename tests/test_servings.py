@@ -0,0 +1,33 @@
+import pytest
+
+from config.servings import Serving, parse_serving, parse_serving_slug, portion_value
+
+@pytest.mark.parametrize("text, expected", [
+    # Exemplos do pedido: decimais, unidades e equivalente entre parênteses
+    ("1,5 xícara", Serving(1.5, 'xícara', None, '')),
+    ("1 porção (700 ml)", Serving(1.0, 'porção', 700.0, 'ml')),
+    ("1 1/2 colher de sopa (22,5 g)", Serving(1.5, 'colher de sopa', 22.5, 'g')),
+    ("½ xícara", Serving(0.5, 'xícara', None, '')),
+    ("100 g", Serving(100.0, 'g', 100.0, 'g')),
+    ("1 l", Serving(1.0, 'l', 1000.0, 'ml')),
+    # Equivalente sem unidade de massa/volume: mantém o número, unidade desconhecida
+    ("1 porção (30 unidades)", Serving(1.0, 'porção', 30.0, '')),
+])
+def test_parse_serving(text, expected):
+    assert parse_serving(text) == expected
+
+def test_text_outside_the_grammar_falls_back_to_the_last_number():
+    assert parse_serving("abc 12 de 45") == Serving(None, 'abc 12 de 45', 45.0, '')
+    assert parse_serving("") == Serving(None, '', None, '')
+
+def test_parse_serving_slug():
+    assert parse_serving_slug("1-1-2-colher-de-sopa") == Serving(1.5, 'colher de sopa', None, '')
+    assert parse_serving_slug("1-por%C3%A7%C3%A3o") == Serving(1.0, 'porção', None, '')
+    assert parse_serving_slug("100-g") == Serving(100.0, 'g', 100.0, 'g')
+    assert parse_serving_slug("sem-numero") is None
+
+def test_portion_value_prefers_the_equivalent():
+    assert portion_value(parse_serving("1 porção (700 ml)")) == 700
+    assert portion_value(parse_serving("1 1/2 colher de sopa (22,5 g)")) == 22.5
+    assert portion_value(parse_serving("1,5 xícara")) == 1.5
+    assert portion_value(parse_serving("")) == 0
@@ -0,0 +1,57 @@
+from config.store import ProductStore
+
+URL = "https://www.fatsecret.com.br/calorias-nutri%C3%A7%C3%A3o/vitao/granola/1-por%C3%A7%C3%A3o"
+
+def product_row(calories, collected_at, **changes):
+    row = {'nome_produto': "Granola", 'url': URL, 'categoria': "Cereais", 'marca': "Vitao",
+           'porcao': 40, 'unidade_porcao': 'g', 'calorias': calories, 'proteinas': 4.5,
+           'data_coleta': collected_at}
+    row.update(changes)
+    return row
+
+def history(store):
+    store.flush()
+    return [dict(row) for row in store._conn.execute(
+        "SELECT calorias, data_coleta FROM nutricao_historico WHERE url = ? ORDER BY id", (URL,))]
+
+def test_history_records_only_changed_versions(tmp_path):
+    store = ProductStore(str(tmp_path / "loja.db"))
+    store.upsert_nutrition(product_row(160, "2026-01-01T10:00:00"))
+    # Mesmos valores (como vêm do CSV: texto) não geram uma nova versão
+    store.upsert_nutrition(product_row("160", "2026-01-02T10:00:00", porcao="40"))
+    store.upsert_nutrition(product_row(170, "2026-01-03T10:00:00"))
+
+    assert history(store) == [
+        {'calorias': 160, 'data_coleta': "2026-01-01T10:00:00"},
+        {'calorias': 170, 'data_coleta': "2026-01-03T10:00:00"},
+    ]
+    current = store.get_nutrition(URL)
+    assert current['calorias'] == 170
+    assert current['data_coleta'] == "2026-01-03T10:00:00"
+    assert current['alterado_em'] == "2026-01-03T10:00:00"
+    store.close()
+
+def test_unchanged_collection_keeps_alterado_em(tmp_path):
+    store = ProductStore(str(tmp_path / "loja.db"))
+    store.upsert_nutrition(product_row(160, "2026-01-01T10:00:00"))
+    store.flush()
+    store.upsert_nutrition(product_row(160, "2026-01-05T10:00:00"))
+
+    # Com o lote gravado, a consulta lê a versão do banco (e não a linha pendente)
+    store.flush()
+    current = store.get_nutrition(URL)
+    assert current['data_coleta'] == "2026-01-05T10:00:00"
+    assert current['alterado_em'] == "2026-01-01T10:00:00"
+    assert len(history(store)) == 1
+    store.close()
+
+def test_changes_since_marks_new_and_changed_products(tmp_path):
+    store = ProductStore(str(tmp_path / "loja.db"))
+    store.upsert_nutrition(product_row(160, "2026-01-01T10:00:00"))
+    store.upsert_nutrition(product_row(170, "2026-01-03T10:00:00"))
+
+    changes = store.changes_since("2026-01-01T00:00:00")
+    assert [(change['calorias'], change['versoes_anteriores']) for change in changes] == [(160, 0), (170, 1)]
+    assert [change['calorias'] for change in store.changes_since("2026-01-02T00:00:00")] == [170]
+    assert store.brand_urls("Vitao", status='coletada') == [URL]
+    store.close()
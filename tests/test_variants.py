@@ -0,0 +1,25 @@
+from config.servings import parse_serving
+from config.variants import derive_variant, serving_links
+
+BASE_URL = "https://www.fatsecret.com.br/calorias-nutri%C3%A7%C3%A3o/vitao/granola/1-por%C3%A7%C3%A3o"
+BASE_ROW = {'url': BASE_URL, 'nome_produto': "Granola", 'porcao': 40, 'unidade_porcao': 'g',
+            'calorias': 160, 'proteinas': 4.5, 'sodio': 25, 'impressao_digital': "abc123"}
+
+def test_derived_variant_scales_values_and_drops_the_base_fingerprint():
+    url = BASE_URL.rsplit('/', 1)[0] + "/100-g"
+    row = derive_variant(BASE_ROW, parse_serving("100 g"), url)
+
+    assert row['url'] == url and row['porcao'] == 100
+    assert (row['calorias'], row['proteinas'], row['sodio']) == (400, 11.2, 62)
+    # A impressão digital era da página base, não da página da variante
+    assert row['impressao_digital'] == ''
+
+def test_variant_needs_an_equivalent_in_the_same_unit():
+    assert derive_variant(BASE_ROW, parse_serving("1 unidade"), BASE_URL + "-x") is None
+    assert derive_variant(BASE_ROW, parse_serving("200 ml"), BASE_URL + "-x") is None
+
+def test_serving_links_keep_only_other_servings_of_the_same_product():
+    page = ('<a href="/calorias-nutri%C3%A7%C3%A3o/vitao/granola/100-g">100 g</a>'
+            '<a href="/calorias-nutri%C3%A7%C3%A3o/vitao/granola/1-por%C3%A7%C3%A3o">1 porção</a>'
+            '<a href="/calorias-nutri%C3%A7%C3%A3o/vitao/aveia/100-g">Aveia</a>')
+    assert serving_links(page, BASE_URL) == [("100 g", BASE_URL.rsplit('/', 1)[0] + "/100-g")]
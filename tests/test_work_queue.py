@@ -0,0 +1,43 @@
+from config.work_queue import WorkQueue
+
+URLS = ["https://a/1", "https://a/2"]
+
+def make_queue(tmp_path, **options):
+    queue = WorkQueue(str(tmp_path / "fila.db"), **options)
+    queue.enqueue(URLS, "Vitao")
+    return queue
+
+def test_lease_is_exclusive_until_it_expires(tmp_path):
+    queue = make_queue(tmp_path)
+    assert queue.lease("w1", limit=1) == URLS[:1]
+    assert queue.lease("w2") == URLS[1:]
+    assert queue.lease("w3") == []
+
+    # Visibility timeout negativo: as próximas reservas já nascem vencidas
+    queue.visibility_timeout = -1
+    queue.extend("w1", URLS[:1])
+    assert queue.lease("w3", limit=1) == URLS[:1]
+
+    # O worker que perdeu a reserva não sobrescreve o resultado de quem a detém
+    queue.complete("w1", [(URLS[0], {'url': URLS[0], 'nome_produto': "atrasado"})])
+    queue.complete("w3", [(URLS[0], {'url': URLS[0], 'nome_produto': "Granola"})])
+    assert queue.results("Vitao") == [{'url': URLS[0], 'nome_produto': "Granola"}]
+
+def test_expired_leases_stop_at_max_attempts(tmp_path):
+    # Worker que morre sempre na mesma URL: a reserva vence a cada vez
+    queue = make_queue(tmp_path, visibility_timeout=-1, max_attempts=2)
+    assert queue.lease("w1", limit=1) == URLS[:1]
+    assert queue.lease("w2", limit=1) == URLS[:1]
+    assert queue.lease("w3", limit=1) == URLS[1:]
+
+    assert queue.counts("Vitao") == {'falha': 1, 'em_andamento': 1}
+    assert queue.failed_urls("Vitao") == URLS[:1]
+
+def test_failed_results_retry_until_max_attempts(tmp_path):
+    queue = make_queue(tmp_path, max_attempts=2)
+    for _ in range(2):
+        assert queue.lease("w1", limit=1) == URLS[:1]
+        queue.complete("w1", [(URLS[0], None)])
+
+    assert queue.lease("w1", limit=1) == URLS[1:]
+    assert queue.failed_urls("Vitao") == URLS[:1]